@@ -1,17 +1,15 @@
-import openai
+import baslangic_profili as profil
 import streamlit as st
 import time
 import os
 from datetime import datetime
-import transcriptor, painter
 import sys
+from importlib import metadata
 
-# Ses kaydedici modülünü import et
-try:
-    from recorder import SesKaydedici, SesAyarlari, get_files
-except ImportError:
-    st.error("❌ recorder.py dosyası bulunamadı! Lütfen aynı klasörde olduğundan emin olun.")
-    st.stop()
+# openai, requests, PIL, pyaudio ve numpy çeken modüller (recorder, transcriptor,
+# painter, ...) yalnızca onları kullanan sayfada profil.yukle ile içe aktarılır;
+# Ana Sayfa ve Hakkında bunları hiç yüklemez. Yükleme süreleri Hakkında sayfasında.
+betik_baslangici = time.perf_counter()
 
 # Sayfa yapılandırması
 st.set_page_config(
@@ -20,15 +18,63 @@ st.set_page_config(
     layout="wide"
 )
 
+@st.cache_resource
+def gorsel_pipeline(api_key):
+    """Aynı API anahtarını kullanan tüm oturumlar tek bir asenkron pipeline'ı paylaşır"""
+    transcriptor = profil.yukle("transcriptor")
+    return profil.yukle("pipeline").GorselPipeline(api_key=api_key, max_eszamanli=4,
+                                                   max_segment_s=transcriptor.MAX_SEGMENT_S)
+
+
+@st.cache_resource
+def is_kuyrugu(api_key):
+    """Görsel üretim işleri sayfa yeniden çalışmalarından bağımsız olarak arka planda yürür"""
+    return profil.yukle("is_kuyrugu").IsKuyrugu(gorsel_pipeline(api_key), api_key)
+
+
+@st.cache_resource
+def metrik_sunucusu(port):
+    """Aşama metriklerini Prometheus biçiminde /metrics adresinde sunar (süreç başına bir kez)"""
+    return profil.yukle("metrikler").sunucu_baslat(port, adres=os.environ.get("VOCASSO_METRIK_ADRES", "127.0.0.1"))
+
+
+if os.environ.get("VOCASSO_METRIK_PORT"):
+    metrik_sunucusu(int(os.environ["VOCASSO_METRIK_PORT"]))
+
+
+@st.cache_resource
+def gorsel_deposu():
+    """Küçük resimler için depo; painter'ı (ve openai'yi) yüklemeden açılır"""
+    return profil.yukle("gorsel_deposu").GorselDeposu()
+
+
+@st.cache_resource
+def indirme_onbellegi():
+    """Hazırlanan indirmelerin baytları; yeniden çalışmalarda kopyalanmadan paylaşılır, toplam boyutu sınırlı"""
+    return profil.yukle("cache").BaytOnbellegi(max_bayt=64 * 1024 * 1024)
+
+
+def indirme_verisi(yol):
+    """Kaydın baytları (yol, mtime) anahtarıyla; dosya değişmedikçe diskten yeniden okunmaz"""
+    def oku():
+        with open(yol, 'rb') as dosya:
+            return dosya.read()
+    return indirme_onbellegi().al((yol, os.path.getmtime(yol)), oku)
+
+
 # Session state ile sayfa durumunu takip et
 if 'secili_sayfa' not in st.session_state:
     st.session_state.secili_sayfa = "ana_sayfa"
 
-if 'kaydedici' not in st.session_state:
-    st.session_state.kaydedici = SesKaydedici()
+# Kaydedici (ve ses motoru) ilk kez Ses Kayıt sayfasında oluşturulur
+if 'kayit_aktif' not in st.session_state:
     st.session_state.kayit_aktif = False
     st.session_state.son_kayit_dosyasi = None
 
+if 'canli_transkriptler' not in st.session_state:
+    st.session_state.canli_transkriptci = None
+    st.session_state.canli_transkriptler = {}  # kayıt yolu -> CanliTranskriptci
+
 # Ana başlık
 
 # Sidebar - Butonlar dikey sıralama
@@ -72,6 +118,19 @@ if st.session_state.secili_sayfa == "ana_sayfa":
         "💡 İpucu: Sol taraftaki 'Ses kayıt' butonuna tıklayarak sesinizi kaydedin. Ardından Görsel üretmek için 'Görsel Üret' sayfasından ses kaydını seçerek ilerleyin!'")
 
 elif st.session_state.secili_sayfa == "Ses Kayıt":
+    # Ses kaydedici modülünü import et
+    try:
+        recorder = profil.yukle("recorder")
+        audio_source = profil.yukle("audio_source")
+    except ImportError:
+        st.error("❌ recorder.py dosyası bulunamadı! Lütfen aynı klasörde olduğundan emin olun.")
+        st.stop()
+    kayit_indeksi = profil.yukle("kayit_indeksi").indeks
+    dalga_formu = profil.yukle("dalga_formu")
+
+    if 'kaydedici' not in st.session_state:
+        st.session_state.kaydedici = recorder.SesKaydedici()
+
     col1, col2 = st.columns([3, 2])
 
     with col1:
@@ -124,6 +183,29 @@ elif st.session_state.secili_sayfa == "Ses Kayıt":
                 else:
                     st.warning("⚠️ Önce kaydı durdurun!")
 
+        with st.expander("🎤 Ses Cihazları"):
+            # Cihaz listesi süreç boyunca önbellekte; yalnızca istendiğinde yeniden taranır
+            try:
+                if st.button("🔄 Cihazları yenile", disabled=st.session_state.kayit_aktif):
+                    audio_source.ses_motoru().yenile()
+                cihazlar = audio_source.ses_motoru().cihazlar()
+                if cihazlar:
+                    for cihaz in cihazlar:
+                        st.write(f"🎙️ **{cihaz.ad}** ({cihaz.host_api}, {cihaz.max_kanal} kanal, "
+                                 f"{cihaz.varsayilan_hz} Hz)")
+                else:
+                    st.warning("Giriş cihazı bulunamadı.")
+            except RuntimeError as e:
+                st.warning(str(e))
+
+        canli_transkript = st.checkbox(
+            "📝 Kayıt sırasında canlı transkript",
+            value=False,
+            disabled=st.session_state.kayit_aktif or 'transcriptor_client' not in st.session_state,
+            help="Konuşma duraklamalarında ses bölümleri kayıt sürerken transkript edilir. "
+                 "Önce 'Görsel Üret' sayfasında API anahtarını kaydedin."
+        )
+
         # Kayıt butonları
         col_basla, col_dur = st.columns(2)
 
@@ -133,6 +215,14 @@ elif st.session_state.secili_sayfa == "Ses Kayıt":
                          type="primary",
                          use_container_width=True):
 
+                if canli_transkript and 'transcriptor_client' in st.session_state:
+                    CanliTranskriptci = profil.yukle("live_transcription").CanliTranskriptci
+                    st.session_state.canli_transkriptci = CanliTranskriptci(st.session_state.transcriptor_client)
+                    st.session_state.kaydedici.segment_dinleyici = st.session_state.canli_transkriptci.segment_ekle
+                else:
+                    st.session_state.canli_transkriptci = None
+                    st.session_state.kaydedici.segment_dinleyici = None
+
                 if st.session_state.kaydedici.kayit_baslat():
                     st.session_state.kayit_aktif = True
                     st.success("✅ Kayıt başlatıldı!")
@@ -156,28 +246,78 @@ elif st.session_state.secili_sayfa == "Ses Kayıt":
 
         # Kayıt durumu gösterimi
         st.markdown("### 📊 Anlık Durum")
-        durum = st.session_state.kaydedici.get_durum()
-
-        if durum.aktif:
-            st.success("🔴 **KAYIT DEVAM EDİYOR**")
-
-            # Metrikleri yan yana göster
-            metric_col1, metric_col2 = st.columns(2)
-            with metric_col1:
-                st.metric("⏰ Süre", f"{durum.sure:.1f} saniye")
-            with metric_col2:
-                st.metric("📊 Frame", durum.frame_sayisi)
-
-            # İlerleme çubuğu (sanal)
-            progress_value = min(durum.sure / 60.0, 1.0)  # 60 saniye max için
-            st.progress(progress_value)
+        yenileme_araligi = st.select_slider(
+            "🔄 Yenileme aralığı (saniye)",
+            options=[0.25, 0.5, 1.0, 2.0, 5.0],
+            value=1.0,
+            key="yenileme_araligi",
+            help="Kayıt sırasında yalnızca bu bölüm yenilenir, sayfanın geri kalanı yeniden çalışmaz"
+        )
 
-        else:
-            st.info("⚫ Kayıt bekleniyor...")
+        canli = st.session_state.canli_transkriptci
+        canli_guncelleme = st.session_state.kayit_aktif or (canli is not None and canli.bekleyen > 0)
+
+        @st.fragment(run_every=yenileme_araligi if canli_guncelleme else None)
+        def anlik_durum():
+            """Kayıt durumu, metrikler ve canlı transkript; kayıt sürerken kendi başına yenilenir"""
+            durum = st.session_state.kaydedici.get_durum()
+            canli = st.session_state.canli_transkriptci
+
+            # Kayıt kendiliğinden bittiyse (ör. kaynak sona erdi) ya da bekleyen
+            # transkript kalmadıysa sayfa bir kez yenilenir ve periyodik güncelleme durur
+            if st.session_state.kayit_aktif and not durum.aktif:
+                st.session_state.kaydedici.kayit_durdur()
+                st.session_state.kayit_aktif = False
+                st.rerun()
+            if (canli_guncelleme and not st.session_state.kayit_aktif and
+                    (canli is None or canli.bekleyen == 0)):
+                st.rerun()
+
+            if durum.aktif:
+                st.success("🔴 **KAYIT DEVAM EDİYOR**")
+
+                # Metrikleri yan yana göster
+                metric_col1, metric_col2, metric_col3 = st.columns(3)
+                with metric_col1:
+                    st.metric("⏰ Süre", f"{durum.sure:.1f} saniye")
+                with metric_col2:
+                    st.metric("📊 Frame", durum.frame_sayisi)
+                with metric_col3:
+                    st.metric("⚠️ Kayıp Chunk", durum.kayip_chunk)
+
+                # İlerleme çubuğu (sanal)
+                progress_value = min(durum.sure / 60.0, 1.0)  # 60 saniye max için
+                st.progress(progress_value)
 
-        # Durum mesajı
-        if durum.mesaj:
-            st.write(f"**📝 Durum:** {durum.mesaj}")
+            else:
+                st.info("⚫ Kayıt bekleniyor...")
+
+            # Seviye göstergesi ve dalga formu (kayıt thread'inin tuttuğu özetten, ses verisi okunmaz)
+            seviye = st.session_state.kaydedici.get_seviye()
+            if seviye is not None:
+                if durum.aktif:
+                    st.progress(min(seviye.tepe, 1.0),
+                                text=f"🎚️ Seviye: RMS {seviye.dbfs(seviye.rms):.1f} dBFS, "
+                                     f"tepe {seviye.dbfs(seviye.tepe):.1f} dBFS")
+                if seviye.kirpilan_ornek:
+                    st.warning(f"⚠️ Kırpılma: {seviye.kirpilan_ornek} örnek tam ölçeğe ulaştı. "
+                               "Mikrofondan uzaklaşın veya kazancı azaltın.")
+                elif durum.sure > 2.0 and seviye.en_yuksek_tepe < 0.001:
+                    st.warning("🔇 Sinyal yok: mikrofon kapalı veya sessiz olabilir.")
+                if len(seviye.zarf_max):
+                    st.area_chart({"max": seviye.zarf_max, "min": seviye.zarf_min}, height=120)
+
+            # Canlı transkript (kayıt sürerken tamamlanan bölümler)
+            if canli is not None:
+                bekleyen = canli.bekleyen
+                st.markdown("#### 📝 Canlı Transkript" + (f" ⏳ ({bekleyen} bölüm bekliyor)" if bekleyen else ""))
+                st.write(canli.metin() or "_Henüz transkript yok..._")
+
+            # Durum mesajı
+            if durum.mesaj:
+                st.write(f"**📝 Durum:** {durum.mesaj}")
+
+        anlik_durum()
 
     with col2:
         st.header("💾 Kaydet & Yönet")
@@ -233,6 +373,8 @@ elif st.session_state.secili_sayfa == "Ses Kayıt":
 
                     if basarili:
                         st.session_state.son_kayit_dosyasi = dosya_yolu
+                        if st.session_state.canli_transkriptci is not None:
+                            st.session_state.canli_transkriptler[dosya_yolu] = st.session_state.canli_transkriptci
                         st.success(f"✅ Başarıyla kaydedildi!")
                         st.success(f"📁 **Konum:** `{dosya_yolu}`")
 
@@ -256,11 +398,26 @@ elif st.session_state.secili_sayfa == "Ses Kayıt":
     st.markdown("---")
     st.header("📁 Kayıtlar Arşivi")
 
-    # Kayıtları listele
-    kayitlar = st.session_state.kaydedici.get_kayit_listesi()
-
-    if kayitlar:
-        st.write(f"📊 **Toplam {len(kayitlar)} kayıt bulundu**")
+    # Ses verisi yalnızca dinlenen / indirilmek üzere hazırlanan kayıtlar için okunur
+    sunulan_bayt = 0
+    if 'indirilecekler' not in st.session_state:
+        st.session_state.indirilecekler = set()
+    kayit_indeksi.senkronize()
+    toplam_kayit = kayit_indeksi.sayi()
+
+    if toplam_kayit:
+        sayfa_col1, sayfa_col2, sayfa_col3 = st.columns([2, 2, 3])
+        with sayfa_col1:
+            sayfa_boyutu = st.selectbox("Sayfa başına kayıt", [10, 25, 50], key="arsiv_sayfa_boyutu")
+        sayfa_sayisi = max(1, -(-toplam_kayit // sayfa_boyutu))
+        with sayfa_col2:
+            sayfa = st.number_input("Sayfa", min_value=1, max_value=sayfa_sayisi, value=1, step=1,
+                                    key="arsiv_sayfa")
+        with sayfa_col3:
+            st.write(f"📊 **Toplam {toplam_kayit} kayıt** (sayfa {sayfa}/{sayfa_sayisi})")
+
+        kayitlar = st.session_state.kaydedici.get_kayit_listesi(limit=sayfa_boyutu,
+                                                                 offset=(sayfa - 1) * sayfa_boyutu)
 
         # Kayıtları tablo şeklinde göster
         for i, kayit in enumerate(kayitlar):
@@ -276,34 +433,68 @@ elif st.session_state.secili_sayfa == "Ses Kayıt":
                     else:
                         st.markdown(f"🎵 **{kayit.ad}**")
 
+                    # Dalga formu küçük resmi: sesin kendisi değil, birkaç KB'lık peaks dosyası okunur
+                    try:
+                        dalga = dalga_formu.ac(kayit.yol)
+                    except (OSError, ValueError):
+                        dalga = None
+                    if dalga is not None:
+                        st.markdown(dalga.svg(), unsafe_allow_html=True)
+
                 with kayit_col2:
                     st.write(f"📅 {kayit.tarih.strftime('%d/%m/%Y %H:%M')}")
+                    # Kayıttan üretilen son görselin küçük resmi
+                    gorseller = [g for g in kayit.gorseller if os.path.exists(g)]
+                    if gorseller:
+                        st.image(gorsel_deposu().varyant(gorseller[0], "kucuk"), width=96)
 
                 with kayit_col3:
                     st.write(f"📊 {kayit.boyut_kb():.1f} KB")
+                    if kayit.sure is not None:
+                        st.write(f"⏱️ {kayit.sure:.1f} sn")
 
                 with kayit_col5:
-                    # İndirme butonu
-                    if os.path.exists(kayit.yol):
-                        with open(kayit.yol, 'rb') as dosya:
-                            st.download_button(
-                                label="⬇️ İndir",
-                                data=dosya.read(),
-                                file_name=kayit.ad,
-                                mime="audio/wav",
-                                key=f"indir_{i}",
-                                use_container_width=True
-                            )
-                    else:
+                    # İndirme: dosya yalnızca "Hazırla"ya basıldıktan sonra okunur
+                    if not os.path.exists(kayit.yol):
                         st.error("❌ Dosya bulunamadı")
+                    elif kayit.ad in st.session_state.indirilecekler:
+                        veri = indirme_verisi(kayit.yol)
+                        sunulan_bayt += len(veri)
+                        # İndirildikten sonra kayıt listeden çıkar, sonraki yenilemelerde sunulmaz
+                        st.download_button(
+                            label="⬇️ İndir",
+                            data=veri,
+                            file_name=kayit.ad,
+                            mime="audio/wav",
+                            key=f"indir_{kayit.ad}",
+                            on_click=st.session_state.indirilecekler.discard,
+                            args=(kayit.ad,),
+                            use_container_width=True
+                        )
+                    else:
+                        st.button("⬇️ İndirmeye hazırla", key=f"indir_hazir_{kayit.ad}",
+                                  on_click=st.session_state.indirilecekler.add, args=(kayit.ad,),
+                                  use_container_width=True)
 
                 with kayit_col4:
-                    st.audio(data=kayit.yol)
+                    # Oynatıcı yalnızca açıldığında dosyayı tarayıcıya gönderir
+                    if st.toggle("▶️ Dinle", key=f"dinle_{kayit.ad}") and os.path.exists(kayit.yol):
+                        baslangic = 0
+                        if dalga is not None and dalga.sure >= 2:
+                            baslangic = st.slider("Başlangıç (sn)", 0, int(dalga.sure), 0,
+                                                  key=f"konum_{kayit.ad}")
+                            # Seçilen konumun çevresini yakınlaştırılmış göster
+                            st.markdown(dalga.svg(baslangic_s=max(0, baslangic - 5), bitis_s=baslangic + 5,
+                                                  renk="#1f77b4"), unsafe_allow_html=True)
+                        st.audio(data=kayit.yol, start_time=baslangic)
+                        sunulan_bayt += kayit.boyut
 
             # Ayırıcı (son kayıt hariç)
             if i < len(kayitlar) - 1:
                 st.divider()
 
+        st.caption(f"📤 Bu yenilemede sunulan ses verisi: {sunulan_bayt / 1024:.1f} KB")
+
     else:
         st.info("📂 Henüz hiç kayıt yapılmamış. İlk kaydınızı oluşturun!")
 
@@ -331,9 +522,10 @@ elif st.session_state.secili_sayfa == "gorsel_uret":
                 if openai_key != None:
                     if openai_key.strip():
                         st.session_state.saved_openai = openai_key
-                        st.session_state.transcriptor_client = transcriptor.set_OpenAI_api_key(
+                        st.session_state.transcriptor_client = profil.yukle("transcriptor").set_OpenAI_api_key(
+                            st.session_state.saved_openai)
+                        st.session_state.painter_client = profil.yukle("painter").set_OpenAI_api_key(
                             st.session_state.saved_openai)
-                        st.session_state.painter_client = painter.set_OpenAI_api_key(st.session_state.saved_openai)
 
                     st.success("✅ API Anahtarları kaydedildi!")
                 else:
@@ -341,7 +533,10 @@ elif st.session_state.secili_sayfa == "gorsel_uret":
 
     st.write("---")
 
-    file_names = get_files()
+    # Dosya listesi kayıt indeksinden okunur; recorder (ve pyaudio) yüklenmez
+    kayit_indeksi = profil.yukle("kayit_indeksi").indeks
+    kayit_indeksi.senkronize()
+    file_names = [satir["ad"] for satir in kayit_indeksi.listele()]
 
     col1, col2, col3 = st.columns([1, 1, 2])
     with col1:
@@ -405,21 +600,75 @@ elif st.session_state.secili_sayfa == "gorsel_uret":
 
     if check_available():
         st.info("Görsel Üretmek için API Anahtarınızı girdiğinizden ve ses kaydını seçtiğinizden emin olun!", )
+    onbellegi_atla = st.checkbox("♻️ Önbelleği atla (aynı ses/prompt için yeniden üret)", value=False)
+    on_isleme = st.checkbox("🗜️ Yüklemeden önce sesi 16 kHz mono'ya dönüştür", value=True,
+                            help="Yükleme boyutunu ve transkripsiyon süresini azaltır")
+    sessizlik_kirp = st.checkbox("✂️ Sessizlikleri kırp", value=True,
+                                 help="Baştaki ve sondaki sessizliği atar, uzun duraklamaları kısaltır")
     gorsel_uret = st.button("Görsel Üret", disabled=check_available())
 
-    if gorsel_uret:
-        try:
-            with st.spinner("Ses transkript ediliyor..", show_time=True):
-                st.session_state.voice_prompt = transcriptor.transcribe(st.session_state.file_path, languages="tr",
-                                                                        client=st.session_state.transcriptor_client)
+    if gorsel_uret and not st.session_state.saved_openai:
+        # Yazılıp "Kaydet"e basılmamış anahtar kullanılmaz; kuyruk anahtarsız oluşturulmamalı
+        st.warning("⚠️ Görsel üretmeden önce API anahtarınızı girip **Kaydet**'e basın.")
+    elif gorsel_uret:
+        # Kayıt sırasında canlı transkript çıkarıldıysa çalışan yalnızca son bölümleri bekler
+        # ve metni, pipeline'ın bu kayıt için bakacağı önbellek anahtarına yazar
+        dosya_yolu = st.session_state.file_path
+        canli = st.session_state.canli_transkriptler.get(dosya_yolu)
+        onbellek_secenekleri = gorsel_pipeline(st.session_state.saved_openai).transkript_secenekleri(
+            preprocess=on_isleme, trim_silence=sessizlik_kirp)
+        st.session_state.aktif_is = is_kuyrugu(st.session_state.saved_openai).ekle(
+            st.session_state.file_path,
+            transkript_kaynagi=(lambda: canli.bitir(timeout=60, dosya_yolu=dosya_yolu, **onbellek_secenekleri))
+            if canli is not None and not onbellegi_atla else None,
+            use_cache=not onbellegi_atla,
+            preprocess=on_isleme,
+            trim_silence=sessizlik_kirp
+        )
 
-            with st.spinner("Görsel Üretiliyor..", show_time=True):
-                st.session_state.image_path = painter.generate_image(st.session_state.voice_prompt,
-                                                                     client=st.session_state.painter_client)
-                st.image(st.session_state.image_path)
-            st.write(st.session_state.voice_prompt)
-        except openai.AuthenticationError:
-            st.error("❗OpenAI Key Hatalı!")
+    if st.session_state.get('aktif_is') is not None and st.session_state.saved_openai:
+        kuyruk = is_kuyrugu(st.session_state.saved_openai)
+        is_modulu = profil.yukle("is_kuyrugu")
+        TAMAM, HATA = is_modulu.TAMAM, is_modulu.HATA
+        aktif = kuyruk.durum(st.session_state.aktif_is)
+
+        @st.fragment(run_every=1.0 if aktif is not None and not aktif.bitti else None)
+        def is_durumu():
+            """Aktif işin durumunu kuyruktan okur; iş sürerken kendi başına yenilenir"""
+            is_ = kuyruk.durum(st.session_state.aktif_is)
+            if is_ is None:
+                return
+            if is_.bitti and not aktif.bitti:
+                st.rerun()  # Periyodik yenilemeyi durdurmak için sayfayı bir kez yenile
+
+            if is_.durum == HATA:
+                if is_.hata and is_.hata.startswith("AuthenticationError"):
+                    st.error("❗OpenAI Key Hatalı!")
+                else:
+                    st.error(f"❌ Görsel üretilemedi: {is_.hata}")
+            elif is_.durum == TAMAM:
+                st.session_state.voice_prompt = is_.transkript
+                st.session_state.image_path = is_.gorsel
+                # Tam boyutlu PNG yerine sıkıştırılmış varyant gösterilir
+                if is_.gorsel and os.path.exists(is_.gorsel):
+                    st.image(gorsel_deposu().varyant(is_.gorsel, "web"))
+                else:
+                    st.info("🗑️ Görsel, depo boyut sınırı nedeniyle silinmiş; yeniden üretebilirsiniz.")
+                st.write(is_.transkript)
+            else:
+                gecen = time.time() - is_.olusturma
+                st.info({"sirada": "⏳ Sırada bekliyor..",
+                         "transkript": "🎧 Ses transkript ediliyor..",
+                         "gorsel": "🎨 Görsel üretiliyor.."}[is_.durum] + f" ({gecen:.0f} sn)")
+                if is_.transkript:
+                    st.write(is_.transkript)
+
+        is_durumu()
+
+        with st.expander("🗂️ Son işler"):
+            for is_ in kuyruk.listele(limit=10):
+                st.write(f"#{is_.id} · {os.path.basename(is_.ses_yolu)} · **{is_.durum}**"
+                         + (f" · {is_.hata}" if is_.hata else ""))
 
     st.write("---")
 
@@ -463,11 +712,43 @@ elif st.session_state.secili_sayfa == "hakkinda":
 
         st.metric("Streamlit Sürümü", f"{st.__version__}")
         st.metric("Python Sürümü", f"{sys.version_info.major}.{sys.version_info.minor}")
-        st.metric("OpenAI Sürümü", f"{openai.__version__}")
+        # Sürüm paket bilgisinden okunur; openai yalnızca bunun için içe aktarılmaz
+        st.metric("OpenAI Sürümü", f"{metadata.version('openai')}")
         st.metric("Toplam Sayfa", "4")
 
         st.write("---")
 
+        st.subheader("⏱️ Açılış Profili")
+        st.write(f"Süreç başlangıcından beri: {time.perf_counter() - profil.SUREC_BASLANGICI:.1f} sn  \n"
+                 f"Bu sayfanın çalışması: {(time.perf_counter() - betik_baslangici) * 1000:.0f} ms")
+        yuklenenler = profil.sureler()
+        if yuklenenler:
+            st.caption("Bu süreçte sayfalar açıldıkça yüklenen modüller (ilk yükleme, ms):")
+            st.table({"Modül": list(yuklenenler), "ms": [f"{ms:.0f}" for ms in yuklenenler.values()]})
+        else:
+            st.caption("Henüz ağır modül yüklenmedi.")
+        st.caption("Soğuk başlangıç ölçümü için: `python baslangic_profili.py`")
+
+        st.write("---")
+
+        st.subheader("📈 Aşama Süreleri")
+        asamalar = profil.yukle("metrikler").ozet()
+        if asamalar:
+            st.table({
+                "Aşama": list(asamalar),
+                "Adet": [o["adet"] for o in asamalar.values()],
+                "Hata": [o["hata"] for o in asamalar.values()],
+                "p50 ms": [f"{o['p50_s'] * 1000:.0f}" for o in asamalar.values()],
+                "p95 ms": [f"{o['p95_s'] * 1000:.0f}" for o in asamalar.values()],
+                "Ort. KB": [f"{o['ort_bayt'] / 1024:.1f}" if o["ort_bayt"] is not None else "-"
+                            for o in asamalar.values()],
+            })
+        else:
+            st.caption("Bu süreçte henüz ölçülen aşama yok.")
+        st.caption("Prometheus için `VOCASSO_METRIK_PORT`, JSON lines için `VOCASSO_METRIK_JSONL` ortam değişkeni.")
+
+        st.write("---")
+
         st.subheader("🔗 Faydalı Linkler")
         st.write("""
         - [Streamlit Dokümantasyonu](https://docs.streamlit.io)
@@ -483,8 +764,6 @@ if st.session_state.kayit_aktif:
         🔴 Canlı yayın - Otomatik yenilenme aktif</div>',
         unsafe_allow_html=True
     )
-    time.sleep(1)
-    st.rerun()
 
 # Footer
 st.write("---")
@@ -0,0 +1,346 @@
+"""
+Transkripsiyon öncesi ses ön işleme.
+
+Kayıtlar 44.1 / 48 / 96 kHz ve stereo olabilir; konuşma tanıma için 16 kHz
+mono yeterlidir. Bu modül kaydı NumPy ile mono'ya indirger, kenar yumuşatma
+(anti-aliasing) filtreli çok fazlı (polyphase) yeniden örnekleme ile 16 kHz'e
+çevirir ve isteğe bağlı olarak sıkıştırılmış biçimde yazar. 16 kHz'in altında
+kaydedilmiş sesler yukarı örneklenmez.
+
+Kayıt memmap ile açılır ve bloklar halinde işlenir; bellek kullanımı kaydın
+süresinden bağımsızdır.
+"""
+import os
+import struct
+import tempfile
+import time
+import wave
+from dataclasses import dataclass
+from functools import lru_cache
+from math import gcd
+from typing import Callable, Iterator, Optional, Tuple
+
+import numpy as np
+
+try:
+    import soundfile  # FLAC / OGG yazımı için (isteğe bağlı)
+except ImportError:
+    soundfile = None
+
+HEDEF_HZ = 16000
+
+# Yeniden örnekleme filtresinin faz başına yarım genişliği (giriş örneği)
+# ve geçirme bandının Nyquist'e oranı
+YARI_GENISLIK = 16
+GECIRME_ORANI = 0.9
+
+# Tek seferde hesaplanan çıkış örneği sayısı (bellek kullanımını sınırlar)
+BLOK = 1 << 15
+# Yeniden örneklemede matris satırı başına en az çıkış örneği
+_MIN_SATIR_CIKISI = 64
+
+# 8 bit WAV işaretsizdir
+_VERI_TIPLERI = {1: np.uint8, 2: np.int16, 4: np.int32}
+
+
+@dataclass
+class OnIslemeSonucu:
+    """Ön işleme çıktısı ve yükleme boyutu karşılaştırması"""
+    yol: str
+    bicim: str
+    onceki_bayt: int
+    sonraki_bayt: int
+    onceki_hz: int
+    sonraki_hz: int
+    onceki_kanal: int
+    sure_s: float
+    islem_s: float
+
+    @property
+    def kucultme_orani(self) -> float:
+        return self.onceki_bayt / self.sonraki_bayt if self.sonraki_bayt else 0.0
+
+
+@dataclass
+class WavBilgisi:
+    """WAV dosyasının biçimi ve PCM verisinin dosyadaki konumu"""
+    channels: int
+    ornek_genisligi: int
+    sample_rate: int
+    veri_konumu: int
+    veri_boyutu: int
+
+    @property
+    def frame_sayisi(self) -> int:
+        return self.veri_boyutu // (self.channels * self.ornek_genisligi)
+
+    @property
+    def sure(self) -> float:
+        return self.frame_sayisi / self.sample_rate
+
+
+def wav_bilgisi(yol: str) -> WavBilgisi:
+    """RIFF başlığını okuyarak fmt bilgisini ve data bloğunun konumunu bulur"""
+    with open(yol, 'rb') as f:
+        riff, _, wave_id = struct.unpack('<4sI4s', f.read(12))
+        if riff != b'RIFF' or wave_id != b'WAVE':
+            raise ValueError(f"WAV dosyası değil: {yol}")
+
+        fmt = None
+        while True:
+            baslik = f.read(8)
+            if len(baslik) < 8:
+                raise ValueError(f"data bloğu bulunamadı: {yol}")
+            ad, boyut = struct.unpack('<4sI', baslik)
+            if ad == b'fmt ':
+                fmt = struct.unpack('<HHIIHH', f.read(16))
+                f.seek(boyut - 16 + (boyut & 1), os.SEEK_CUR)
+            elif ad == b'data':
+                if fmt is None:
+                    raise ValueError(f"fmt bloğu data bloğundan önce gelmeli: {yol}")
+                konum = f.tell()
+                # Yarıda kalmış kayıtlarda başlıktaki boyut dosyayı aşabilir
+                boyut = min(boyut, os.fstat(f.fileno()).st_size - konum)
+                _, kanal, sample_rate, _, _, bit = fmt
+                return WavBilgisi(kanal, bit // 8, sample_rate, konum, boyut)
+            else:
+                f.seek(boyut + (boyut & 1), os.SEEK_CUR)
+
+
+def wav_memmap(yol: str) -> Tuple[np.ndarray, WavBilgisi]:
+    """PCM verisini kopyalamadan (örnek, kanal) biçiminde salt okunur memmap olarak açar"""
+    bilgi = wav_bilgisi(yol)
+    if bilgi.ornek_genisligi not in _VERI_TIPLERI:
+        raise ValueError(f"Desteklenmeyen örnek genişliği: {bilgi.ornek_genisligi}")
+    if bilgi.frame_sayisi == 0:
+        return np.zeros((0, bilgi.channels), _VERI_TIPLERI[bilgi.ornek_genisligi]), bilgi
+    ornekler = np.memmap(yol, dtype=np.dtype(_VERI_TIPLERI[bilgi.ornek_genisligi]).newbyteorder('<'),
+                         mode='r', offset=bilgi.veri_konumu,
+                         shape=(bilgi.frame_sayisi, bilgi.channels))
+    return ornekler, bilgi
+
+
+def float_yap(ornekler: np.ndarray, genislik: int) -> np.ndarray:
+    """Tam sayı PCM örneklerini -1.0 ile 1.0 arası float32'ye çevirir"""
+    if genislik == 1:
+        return (ornekler.astype(np.float32) - 128.0) / 128.0
+    return ornekler.astype(np.float32) / float(1 << (8 * genislik - 1))
+
+
+def cikis_hizi(kaynak_hz: int, hedef_hz: int = HEDEF_HZ) -> int:
+    """Ön işleme çıktısının örnekleme hızı; hedefin altındaki kayıtlar yukarı örneklenmez"""
+    return min(kaynak_hz, hedef_hz)
+
+
+def mono_yap(ornekler: np.ndarray) -> np.ndarray:
+    """Kanalların ortalamasını alarak tek kanala indirger"""
+    if ornekler.ndim == 1:
+        return ornekler
+    if ornekler.shape[1] == 1:
+        return ornekler[:, 0]
+    return ornekler.mean(axis=1, dtype=np.float32)
+
+
+@lru_cache(maxsize=16)
+def _polyphase_filtre(yukari: int, asagi: int, yari_genislik: int) -> np.ndarray:
+    """
+    Kaiser pencereli sinc alçak geçiren filtreyi faz başına katsayılara ayırır.
+
+    Dönüş şekli (yukari, faz_uzunlugu); satır p, yukarı örneklenmiş akışta
+    p fazına düşen katsayılardır.
+    """
+    faz_uzunlugu = 2 * yari_genislik * max(1, asagi // yukari + 1)
+    uzunluk = faz_uzunlugu * yukari
+    kesim = GECIRME_ORANI / (2.0 * max(yukari, asagi))  # yukarı örneklenmiş hıza göre
+    # Merkez tam sayı örnekte olmalı, aksi halde tam sayı oranlarda yarım örnek kayar
+    n = np.arange(uzunluk) - (uzunluk - 1) // 2
+    h = 2 * kesim * np.sinc(2 * kesim * n) * np.kaiser(uzunluk, 8.6)
+    h *= yukari / h.sum()  # DC kazancı 1 olacak şekilde (yukarı örnekleme kaybı telafisi)
+    return h.reshape(faz_uzunlugu, yukari).T.astype(np.float32).copy()
+
+
+def _dilimleyici(ornekler: np.ndarray,
+                 donustur: Callable[[np.ndarray], np.ndarray]) -> Callable[[int, int], np.ndarray]:
+    """[bas, son) aralığını ``donustur`` ile tek kanallı float32'ye çeviren, aralık dışını sıfırla dolduran fonksiyon"""
+    def dilim(bas: int, son: int) -> np.ndarray:
+        cikis = np.zeros(son - bas, dtype=np.float32)
+        a, b = max(bas, 0), min(son, len(ornekler))
+        if a < b:
+            cikis[a - bas:b - bas] = donustur(ornekler[a:b])
+        return cikis
+    return dilim
+
+
+@lru_cache(maxsize=16)
+def _satir_matrisi(yukari: int, asagi: int, yari_genislik: int) -> Tuple[np.ndarray, int, int, int]:
+    """
+    Polyphase filtreyi tek matris çarpımına uygun bantlı matrise yerleştirir.
+
+    Giriş, her satırı ``adim`` örnek ilerleyen ``genislik`` örneklik
+    (örtüşen) pencerelere bölündüğünde her satır ``matris`` ile çarpılarak
+    ardışık ``G * yukari`` çıkış örneği verir. G, satır başına çıkış en az
+    ``_MIN_SATIR_CIKISI`` olacak şekilde seçilir (tam sayı oranlı küçültmede
+    yukari = 1'dir). Dönüş: (matris, adim, genislik, ilk örneğin kayması).
+    """
+    fazlar = _polyphase_filtre(yukari, asagi, yari_genislik)
+    faz_uzunlugu = fazlar.shape[1]
+    gecikme = (faz_uzunlugu * yukari - 1) // 2
+    grup = -(-_MIN_SATIR_CIKISI // yukari)
+
+    u = np.arange(grup * yukari, dtype=np.int64) * asagi + gecikme
+    taban = u // yukari
+    kayma = int(taban[0]) - faz_uzunlugu + 1
+    sutun = (taban - kayma)[:, None] - np.arange(faz_uzunlugu)[None, :]
+    matris = np.zeros((int(sutun.max()) + 1, len(u)), dtype=np.float32)
+    matris[sutun, np.arange(len(u))[:, None]] = fazlar[u % yukari]
+    return matris, grup * asagi, matris.shape[0], kayma
+
+
+def yeniden_ornekle_bloklar(dilim: Callable[[int, int], np.ndarray], uzunluk: int, kaynak_hz: int,
+                            hedef_hz: int = HEDEF_HZ, yari_genislik: int = YARI_GENISLIK) -> Iterator[np.ndarray]:
+    """
+    ``uzunluk`` örneklik tek kanallı sinyali rasyonel oranlı polyphase FIR ile
+    yeniden örnekler, çıkışı yaklaşık ``BLOK`` örneklik parçalar halinde üretir.
+
+    Her çıkış örneği, kendi fazının katsayılarıyla girişteki komşu örneklerin
+    ağırlıklı toplamıdır. Oran periyodik olduğundan bir bloktaki tüm çıkışlar
+    örtüşen giriş pencereleri ile ``_satir_matrisi`` arasındaki tek bir matris
+    çarpımıyla (BLAS) hesaplanır; her blok için girişten yalnızca gereken
+    aralık ``dilim(bas, son)`` ile okunur (aralık dışı sıfır kabul edilir).
+    """
+    ortak = gcd(kaynak_hz, hedef_hz)
+    yukari, asagi = hedef_hz // ortak, kaynak_hz // ortak
+    matris, adim, genislik, kayma = _satir_matrisi(yukari, asagi, yari_genislik)
+    satir_cikisi = matris.shape[1]
+    satir_sayisi = max(1, BLOK // satir_cikisi)
+
+    cikis_sayisi = -(-uzunluk * yukari // asagi)
+    toplam_satir = -(-cikis_sayisi // satir_cikisi)
+
+    for ilk_satir in range(0, toplam_satir, satir_sayisi):
+        satir = min(satir_sayisi, toplam_satir - ilk_satir)
+        bas = ilk_satir * adim + kayma
+        x = dilim(bas, bas + (satir - 1) * adim + genislik)
+        pencereler = np.lib.stride_tricks.sliding_window_view(x, genislik)[::adim]
+        # Örtüşen görünüm BLAS'a verilemez; kopya girişin yalnızca genislik / adim katıdır
+        cikis = (np.ascontiguousarray(pencereler) @ matris).ravel()
+        yield cikis[:cikis_sayisi - ilk_satir * satir_cikisi]
+
+
+def yeniden_ornekle(ornekler: np.ndarray, kaynak_hz: int, hedef_hz: int = HEDEF_HZ,
+                    yari_genislik: int = YARI_GENISLIK) -> np.ndarray:
+    """Bellekteki tek kanallı sinyali yeniden örnekler (bkz. ``yeniden_ornekle_bloklar``)"""
+    if kaynak_hz == hedef_hz:
+        return ornekler.astype(np.float32, copy=False)
+    dilim = _dilimleyici(ornekler, lambda x: x)
+    bloklar = list(yeniden_ornekle_bloklar(dilim, len(ornekler), kaynak_hz, hedef_hz, yari_genislik))
+    return np.concatenate(bloklar) if bloklar else np.zeros(0, dtype=np.float32)
+
+
+def mono_bloklar(yol: str, hedef_hz: int = HEDEF_HZ) -> Tuple[Iterator[np.ndarray], int, WavBilgisi]:
+    """
+    Kaydı memmap üzerinden okuyup mono ve ``cikis_hizi``'na çevrilmiş float32
+    bloklar halinde döndürür: (bloklar, çıkış hızı, kaynak bilgisi).
+    """
+    ornekler, bilgi = wav_memmap(yol)
+    cikis_hz = cikis_hizi(bilgi.sample_rate, hedef_hz)
+
+    def donustur(blok: np.ndarray) -> np.ndarray:
+        return mono_yap(float_yap(blok, bilgi.ornek_genisligi))
+
+    if cikis_hz == bilgi.sample_rate:
+        bloklar = (donustur(ornekler[bas:bas + BLOK]) for bas in range(0, len(ornekler), BLOK))
+    else:
+        bloklar = yeniden_ornekle_bloklar(_dilimleyici(ornekler, donustur), len(ornekler),
+                                          bilgi.sample_rate, cikis_hz)
+    return bloklar, cikis_hz, bilgi
+
+
+def pcm16(ornekler: np.ndarray) -> bytes:
+    """float32 örnekleri kırparak 16 bit PCM'e çevirir"""
+    return (np.clip(ornekler, -1.0, 1.0) * 32767.0).astype('<i2').tobytes()
+
+
+def wav_yaz(yol: str, bloklar, sample_rate: int) -> int:
+    """Tek kanallı float32 sinyali (dizi veya bloklar) 16 bit WAV olarak yazar, örnek sayısını döndürür"""
+    if isinstance(bloklar, np.ndarray):
+        bloklar = [bloklar]
+    sayi = 0
+    with wave.open(yol, 'wb') as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(sample_rate)
+        for blok in bloklar:
+            wf.writeframes(pcm16(blok))
+            sayi += len(blok)
+    return sayi
+
+
+def _sf_yaz(yol: str, bloklar, sample_rate: int, kanal: int, bicim: str) -> int:
+    """float32 blokları soundfile ile sıkıştırılmış biçimde yazar, frame sayısını döndürür"""
+    sayi = 0
+    with soundfile.SoundFile(yol, 'w', samplerate=sample_rate, channels=kanal, format=bicim.upper()) as sf:
+        for blok in bloklar:
+            sf.write(blok)
+            sayi += len(blok)
+    return sayi
+
+
+def _gecici_dosya(bicim: str, klasor: Optional[str]) -> str:
+    fd, yol = tempfile.mkstemp(suffix=f".{bicim}", prefix="on_isleme_", dir=klasor)
+    os.close(fd)
+    return yol
+
+
+def kodla(yol: str, bicim: str, cikis_klasoru: Optional[str] = None) -> Optional[str]:
+    """WAV dosyasını sıkıştırılmış biçimde yeni bir geçici dosyaya yazar; soundfile yoksa None"""
+    if soundfile is None:
+        return None
+    ornekler, bilgi = wav_memmap(yol)
+    bloklar = (float_yap(ornekler[bas:bas + BLOK], bilgi.ornek_genisligi) for bas in range(0, len(ornekler), BLOK))
+    cikis = _gecici_dosya(bicim, cikis_klasoru)
+    try:
+        _sf_yaz(cikis, bloklar, bilgi.sample_rate, bilgi.channels, bicim)
+    except BaseException:
+        os.remove(cikis)
+        raise
+    return cikis
+
+
+def on_isle(yol: str,
+            hedef_hz: int = HEDEF_HZ,
+            sikistir: Optional[str] = None,
+            cikis_klasoru: Optional[str] = None) -> OnIslemeSonucu:
+    """
+    Kaydı mono / hedef_hz'e (kaynak daha düşükse kaynak hızında) çevirip
+    bloklar halinde geçici bir dosyaya yazar.
+
+    ``sikistir`` "flac" veya "ogg" olabilir; soundfile kurulu değilse 16 bit
+    WAV yazılır (sonuçtaki ``bicim`` alanı gerçekte yazılan biçimi gösterir).
+    Çıktı dosyasını silmek çağıranın sorumluluğundadır.
+    """
+    baslangic = time.perf_counter()
+    bloklar, cikis_hz, bilgi = mono_bloklar(yol, hedef_hz)
+
+    bicim = sikistir if sikistir and soundfile is not None else "wav"
+    cikis = _gecici_dosya(bicim, cikis_klasoru)
+    try:
+        if bicim == "wav":
+            ornek_sayisi = wav_yaz(cikis, bloklar, cikis_hz)
+        else:
+            ornek_sayisi = _sf_yaz(cikis, bloklar, cikis_hz, 1, bicim)
+    except BaseException:
+        os.remove(cikis)
+        raise
+
+    return OnIslemeSonucu(
+        yol=cikis,
+        bicim=bicim,
+        onceki_bayt=os.path.getsize(yol),
+        sonraki_bayt=os.path.getsize(cikis),
+        onceki_hz=bilgi.sample_rate,
+        sonraki_hz=cikis_hz,
+        onceki_kanal=bilgi.channels,
+        sure_s=ornek_sayisi / cikis_hz,
+        islem_s=time.perf_counter() - baslangic
+    )
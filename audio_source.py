@@ -0,0 +1,423 @@
+import atexit
+import threading
+import time
+import wave
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    import pyaudio
+except ImportError:  # Mikrofonsuz sunucularda PyAudio kurulu olmayabilir
+    pyaudio = None
+
+# PortAudio örnek formatları (pyaudio.paInt16 vb. ile aynı değerler)
+paFloat32 = 1
+paInt32 = 2
+paInt24 = 4
+paInt16 = 8
+paInt8 = 16
+paUInt8 = 32
+
+ORNEK_GENISLIKLERI = {
+    paFloat32: 4,
+    paInt32: 4,
+    paInt24: 3,
+    paInt16: 2,
+    paInt8: 1,
+    paUInt8: 1,
+}
+
+# callback(veri, tasma) -> Kaynağın her chunk için çağırdığı fonksiyon.
+# tasma=True, sürücünün bu chunk'tan önce veri kaybettiğini bildirir.
+VeriCallback = Callable[[bytes, bool], None]
+
+# İstenen hız cihazda açılamazsa sırayla (isteğe en yakından başlayarak) denenen hızlar
+YEDEK_HIZLAR = (8000, 16000, 22050, 44100, 48000, 96000)
+
+
+class AudioSource(ABC):
+    """
+    SesKaydedici'nin ses aldığı kaynak arayüzü.
+
+    Kaynak ``baslat`` ile açılır ve her chunk için callback'i kendi
+    thread'inden çağırır. ``durdur`` döndükten sonra callback bir daha
+    çağrılmaz; ``kapat`` kaynakları serbest bırakır.
+    """
+
+    def ornek_genisligi(self, format: int) -> int:
+        """Verilen formatın bayt cinsinden örnek genişliği"""
+        return ORNEK_GENISLIKLERI[format]
+
+    def desteklenen_hiz(self, ayarlar) -> int:
+        """Kaynağın ayarlardaki kanal / formatla açabileceği örnekleme hızı"""
+        return ayarlar.sample_rate
+
+    @abstractmethod
+    def baslat(self, ayarlar, callback: VeriCallback) -> None:
+        """Kaynağı ayarlara göre açar ve veri göndermeye başlar"""
+
+    @abstractmethod
+    def durdur(self) -> None:
+        """Veri gönderimini durdurur (callback'in son çağrısını bekler)"""
+
+    @abstractmethod
+    def kapat(self) -> None:
+        """Kaynakları serbest bırakır"""
+
+
+@dataclass
+class GirisCihazi:
+    """Kayıt yapılabilen bir ses cihazı"""
+    index: int
+    ad: str
+    max_kanal: int
+    varsayilan_hz: int
+    host_api: str
+
+
+class SesMotoru:
+    """
+    Süreç boyunca yaşayan tek PortAudio örneği.
+
+    PyAudio bir kez başlatılır; giriş cihazları ve desteklenen biçimler ilk
+    sorguda önbelleğe alınır ve yalnızca ``yenile`` ile yeniden taranır.
+    Kayıtlar akışlarını buradan açar, kapatırken PortAudio sonlandırılmaz.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._audio = None
+        self._cihazlar: Optional[List[GirisCihazi]] = None
+        self._varsayilan: Optional[int] = None
+        self._bicimler: Dict[Tuple[Optional[int], int, int, int], bool] = {}
+        self._acik_akis = 0
+
+    def _pyaudio(self):
+        """Lock içinde çağrılmalı"""
+        if pyaudio is None:
+            raise RuntimeError("PyAudio kurulu değil!")
+        if self._audio is None:
+            self._audio = pyaudio.PyAudio()
+        return self._audio
+
+    def cihazlar(self) -> List[GirisCihazi]:
+        """Giriş kanalı olan cihazlar (önbellekten)"""
+        with self._lock:
+            if self._cihazlar is None:
+                audio = self._pyaudio()
+                cihazlar = []
+                for i in range(audio.get_device_count()):
+                    bilgi = audio.get_device_info_by_index(i)
+                    if bilgi.get('maxInputChannels', 0) > 0:
+                        cihazlar.append(GirisCihazi(
+                            index=i,
+                            ad=bilgi.get('name', str(i)),
+                            max_kanal=int(bilgi['maxInputChannels']),
+                            varsayilan_hz=int(bilgi.get('defaultSampleRate', 0)),
+                            host_api=audio.get_host_api_info_by_index(bilgi.get('hostApi', 0)).get('name', '')
+                        ))
+                try:
+                    self._varsayilan = audio.get_default_input_device_info()['index']
+                except OSError:
+                    self._varsayilan = None
+                self._cihazlar = cihazlar
+            return list(self._cihazlar)
+
+    def varsayilan_cihaz(self) -> Optional[GirisCihazi]:
+        cihazlar = self.cihazlar()
+        return next((c for c in cihazlar if c.index == self._varsayilan), cihazlar[0] if cihazlar else None)
+
+    def bicim_destekleniyor(self, cihaz_index: Optional[int], sample_rate: int, channels: int, format: int) -> bool:
+        """Cihazın bu hız / kanal / biçimle açılıp açılamayacağı (sonuç önbelleğe alınır)"""
+        anahtar = (cihaz_index, sample_rate, channels, format)
+        with self._lock:
+            if anahtar not in self._bicimler:
+                if cihaz_index is None:
+                    varsayilan = self.varsayilan_cihaz()
+                    cihaz_index = varsayilan.index if varsayilan else None
+                try:
+                    self._bicimler[anahtar] = cihaz_index is not None and bool(self._pyaudio().is_format_supported(
+                        sample_rate, input_device=cihaz_index, input_channels=channels, input_format=format))
+                except ValueError:
+                    self._bicimler[anahtar] = False
+            return self._bicimler[anahtar]
+
+    def ornek_genisligi(self, format: int) -> int:
+        with self._lock:
+            return self._pyaudio().get_sample_size(format)
+
+    def yenile(self) -> List[GirisCihazi]:
+        """
+        Cihaz listesini yeniden tarar.
+
+        PortAudio cihazları yalnızca başlatılırken listelediği için açık akış
+        yoksa motor yeniden başlatılır; akış varsa yalnızca önbellek temizlenir.
+        """
+        with self._lock:
+            if self._audio is not None and self._acik_akis == 0:
+                self._audio.terminate()
+                self._audio = None
+            self._cihazlar = None
+            self._bicimler.clear()
+        return self.cihazlar()
+
+    def akis_ac(self, **kwargs):
+        """pyaudio.PyAudio.open ile aynı parametrelerle akış açar"""
+        with self._lock:
+            akis = self._pyaudio().open(**kwargs)
+            self._acik_akis += 1
+            return akis
+
+    def akis_kapat(self, akis) -> None:
+        with self._lock:
+            try:
+                akis.stop_stream()
+                akis.close()
+            finally:
+                self._acik_akis -= 1
+
+    def kapat(self) -> None:
+        """Süreç sonunda PortAudio'yu sonlandırır"""
+        with self._lock:
+            if self._audio is not None:
+                self._audio.terminate()
+                self._audio = None
+
+
+_motor: Optional[SesMotoru] = None
+_motor_lock = threading.Lock()
+
+
+def ses_motoru() -> SesMotoru:
+    """Süreç genelinde paylaşılan ses motoru"""
+    global _motor
+    with _motor_lock:
+        if _motor is None:
+            _motor = SesMotoru()
+            atexit.register(_motor.kapat)
+        return _motor
+
+
+class PyAudioSource(AudioSource):
+    """Varsayılan (veya seçilen) mikrofondan callback modunda kayıt alan kaynak"""
+
+    def __init__(self, input_device_index: Optional[int] = None, motor: Optional[SesMotoru] = None):
+        self.input_device_index = input_device_index
+        self._motor = motor
+        self._stream = None
+        self._callback: Optional[VeriCallback] = None
+
+    @property
+    def motor(self) -> SesMotoru:
+        if self._motor is None:
+            self._motor = ses_motoru()
+        return self._motor
+
+    def ornek_genisligi(self, format: int) -> int:
+        if pyaudio is not None:
+            return self.motor.ornek_genisligi(format)
+        return super().ornek_genisligi(format)
+
+    def desteklenen_hiz(self, ayarlar) -> int:
+        """İstenen hız cihazda açılamıyorsa ona en yakın desteklenen yedek hız"""
+        if pyaudio is None:
+            return ayarlar.sample_rate
+        adaylar = sorted(YEDEK_HIZLAR, key=lambda hz: abs(hz - ayarlar.sample_rate))
+        for hz in [ayarlar.sample_rate, *adaylar]:
+            if self.motor.bicim_destekleniyor(self.input_device_index, hz, ayarlar.channels, ayarlar.format):
+                return hz
+        # Hiçbiri desteklenmiyorsa akış açılırken PortAudio hatası gösterilir
+        return ayarlar.sample_rate
+
+    def baslat(self, ayarlar, callback: VeriCallback) -> None:
+        if pyaudio is None:
+            raise RuntimeError("PyAudio kurulu değil!")
+
+        self._callback = callback
+
+        # Mikrofon var mı kontrol et (önbellekteki cihaz listesinden)
+        if not self.motor.cihazlar():
+            raise RuntimeError("Mikrofon bulunamadı!")
+
+        self._stream = self.motor.akis_ac(
+            format=ayarlar.format,
+            channels=ayarlar.channels,
+            rate=ayarlar.sample_rate,
+            input=True,
+            frames_per_buffer=ayarlar.chunk,
+            input_device_index=self.input_device_index,
+            stream_callback=self._pyaudio_callback
+        )
+
+    def _pyaudio_callback(self, in_data, frame_count, time_info, status):
+        self._callback(in_data, bool(status & pyaudio.paInputOverflow))
+        return None, pyaudio.paContinue
+
+    def durdur(self) -> None:
+        if self._stream:
+            self._stream.stop_stream()
+
+    def kapat(self) -> None:
+        # Akış kapatılır; PortAudio motoru sonraki kayıtlar için açık kalır
+        try:
+            if self._stream:
+                stream, self._stream = self._stream, None
+                self.motor.akis_kapat(stream)
+        except Exception:
+            pass
+
+
+class _ThreadKaynak(AudioSource):
+    """
+    Chunk'ları kendi thread'inde üretip gerçek zamanlı hızda gönderen temel sınıf.
+
+    ``hiz`` 1.0 ise chunk'lar ses süresine göre zamanlanır, 0 ise beklemeden
+    olabildiğince hızlı gönderilir. Zamanlama mutlak hedef zamanlara göre
+    yapıldığı için gecikmeler birikmez.
+    """
+
+    def __init__(self, hiz: float = 1.0):
+        self.hiz = hiz
+        self.bitti = threading.Event()
+        self._callback: Optional[VeriCallback] = None
+        self._thread: Optional[threading.Thread] = None
+        self._calisiyor = False
+        self._ayarlar = None
+
+    def baslat(self, ayarlar, callback: VeriCallback) -> None:
+        self._ayarlar = ayarlar
+        self._callback = callback
+        self._hazirla(ayarlar)
+        self.bitti.clear()
+        self._calisiyor = True
+        self._thread = threading.Thread(target=self._dongu, daemon=True)
+        self._thread.start()
+
+    def _dongu(self) -> None:
+        chunk_suresi = self._ayarlar.chunk / self._ayarlar.sample_rate
+        hedef = time.perf_counter()
+        try:
+            while self._calisiyor:
+                sonuc = self._chunk_uret()
+                if sonuc is None:
+                    break
+                veri, tasma = sonuc
+                self._callback(veri, tasma)
+
+                if self.hiz > 0:
+                    hedef += chunk_suresi / self.hiz
+                    bekleme = hedef - time.perf_counter() + self._gecikme()
+                    if bekleme > 0:
+                        time.sleep(bekleme)
+        finally:
+            self.bitti.set()
+
+    def _hazirla(self, ayarlar) -> None:
+        """Kaynağa özel hazırlık (thread başlamadan önce çağrılır)"""
+
+    def _gecikme(self) -> float:
+        """Bir sonraki chunk'a eklenecek zamanlama sapması (saniye)"""
+        return 0.0
+
+    @abstractmethod
+    def _chunk_uret(self):
+        """Sıradaki (veri, tasma) çiftini döndürür; kaynak bittiyse None"""
+
+    def durdur(self) -> None:
+        self._calisiyor = False
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join()
+
+    def kapat(self) -> None:
+        self.durdur()
+
+
+class WavFileSource(_ThreadKaynak):
+    """Bir WAV dosyasını chunk chunk yeniden oynatan kaynak"""
+
+    def __init__(self, yol: str, hiz: float = 1.0, dongu: bool = False):
+        super().__init__(hiz)
+        self.yol = yol
+        self.dongu = dongu
+        self._wf: Optional[wave.Wave_read] = None
+
+    def _hazirla(self, ayarlar) -> None:
+        self._wf = wave.open(self.yol, 'rb')
+        if (self._wf.getframerate() != ayarlar.sample_rate or
+                self._wf.getnchannels() != ayarlar.channels or
+                self._wf.getsampwidth() != self.ornek_genisligi(ayarlar.format)):
+            self._wf.close()
+            self._wf = None
+            raise ValueError(f"WAV dosyası kayıt ayarlarıyla uyuşmuyor: {self.yol}")
+
+    def _chunk_uret(self):
+        veri = self._wf.readframes(self._ayarlar.chunk)
+        if not veri and self.dongu:
+            self._wf.rewind()
+            veri = self._wf.readframes(self._ayarlar.chunk)
+        if not veri:
+            return None
+        return veri, False
+
+    def kapat(self) -> None:
+        super().kapat()
+        if self._wf:
+            self._wf.close()
+            self._wf = None
+
+
+class SyntheticSource(_ThreadKaynak):
+    """
+    Sinüs dalgası üreten, gecikme sapması ve taşma enjekte edilebilen kaynak.
+
+    ``jitter`` her chunk'ın zamanlamasına eklenen en fazla sapmadır (saniye),
+    ``tasma_olasiligi`` bir chunk'ın taşma bayrağıyla gönderilme olasılığıdır.
+    ``sure`` verilirse o kadar saniyelik ses üretildikten sonra kaynak biter.
+    """
+
+    def __init__(self,
+                 frekans: float = 440.0,
+                 genlik: float = 0.3,
+                 hiz: float = 1.0,
+                 jitter: float = 0.0,
+                 tasma_olasiligi: float = 0.0,
+                 sure: Optional[float] = None,
+                 tohum: Optional[int] = None):
+        super().__init__(hiz)
+        self.frekans = frekans
+        self.genlik = genlik
+        self.jitter = jitter
+        self.tasma_olasiligi = tasma_olasiligi
+        self.sure = sure
+        self._rng = np.random.default_rng(tohum)
+        self._uretilen = 0
+        self._toplam: Optional[int] = None
+
+    def _hazirla(self, ayarlar) -> None:
+        if ayarlar.format != paInt16:
+            raise ValueError("Sentetik kaynak yalnızca paInt16 formatını destekler")
+        self._uretilen = 0
+        self._toplam = int(self.sure * ayarlar.sample_rate) if self.sure is not None else None
+
+    def _chunk_uret(self):
+        n = self._ayarlar.chunk
+        if self._toplam is not None:
+            n = min(n, self._toplam - self._uretilen)
+            if n <= 0:
+                return None
+
+        t = (self._uretilen + np.arange(n)) / self._ayarlar.sample_rate
+        dalga = np.sin(2 * np.pi * self.frekans * t) * (self.genlik * 32767)
+        ornekler = np.repeat(dalga.astype(np.int16), self._ayarlar.channels)
+        self._uretilen += n
+
+        tasma = self.tasma_olasiligi > 0 and self._rng.random() < self.tasma_olasiligi
+        return ornekler.tobytes(), bool(tasma)
+
+    def _gecikme(self) -> float:
+        if self.jitter <= 0:
+            return 0.0
+        return float(self._rng.uniform(0, self.jitter))
@@ -0,0 +1,110 @@
+"""
+Uygulama açılışı için içe aktarma (import) profili.
+
+app.py ağır modülleri yalnızca ilgili sayfa açıldığında ``yukle`` ile içe
+aktarır; her modülün bu süreçteki ilk yüklenme süresi kaydedilir ve
+``sureler`` ile okunabilir.
+
+Komut satırından çalıştırıldığında her modülü ayrı, temiz bir Python
+sürecinde ``-X importtime`` ile içe aktarır ve soğuk başlangıç maliyetini
+(alt bağımlılıkları dahil) raporlar:
+
+    python baslangic_profili.py
+    python baslangic_profili.py recorder painter --detay 5
+"""
+import argparse
+import importlib
+import re
+import subprocess
+import sys
+import threading
+import time
+from typing import Dict, List, Tuple
+
+# Süreç başlangıcına yakın bir referans (app.py bu modülü ilk iş olarak içe aktarır)
+SUREC_BASLANGICI = time.perf_counter()
+
+# app.py'nin sayfa bazında yüklediği modüller
+VARSAYILAN_MODULLER = [
+    "streamlit", "numpy", "openai", "requests", "PIL.Image", "pyaudio",
+    "audio_source", "recorder", "kayit_indeksi", "dalga_formu", "live_transcription",
+    "transcriptor", "painter", "pipeline", "is_kuyrugu",
+]
+
+_sureler: Dict[str, float] = {}
+_lock = threading.Lock()
+
+
+def yukle(ad: str):
+    """Modülü içe aktarır; bu süreçte ilk kez yükleniyorsa süresini (ms) kaydeder"""
+    modul = sys.modules.get(ad)
+    if modul is not None:
+        return modul
+    baslangic = time.perf_counter()
+    modul = importlib.import_module(ad)
+    with _lock:
+        _sureler.setdefault(ad, (time.perf_counter() - baslangic) * 1000.0)
+    return modul
+
+
+def sureler() -> Dict[str, float]:
+    """``yukle`` ile yüklenen modüllerin ilk yüklenme süreleri (ms), yükleme sırasıyla"""
+    with _lock:
+        return dict(_sureler)
+
+
+_IMPORTTIME = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def soguk_olcum(ad: str) -> Tuple[float, List[Tuple[str, float]]]:
+    """
+    Modülü yeni bir süreçte içe aktarır.
+
+    (toplam ms, en pahalı doğrudan alt modüller [(ad, kümülatif ms)]) döndürür;
+    modül yüklenemezse toplam -1'dir.
+    """
+    sonuc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {ad}"],
+                           capture_output=True, text=True)
+    if sonuc.returncode != 0:
+        return -1.0, []
+
+    # Çıktıda alt modüller üst modüllerinden önce, iki boşluk daha girintili yazılır.
+    # Yorumlayıcının kendi açılış import'ları da listelendiği için yalnızca hedef
+    # modülün (ve "a.b" ise üst paketinin) satırları ile onların alt modülleri alınır.
+    paketler = {".".join(ad.split(".")[:i]) for i in range(1, ad.count(".") + 2)}
+    toplam, alt, bekleyen = 0.0, [], []
+    for satir in sonuc.stderr.splitlines():
+        eslesme = _IMPORTTIME.match(satir)
+        if not eslesme:
+            continue
+        _, kumulatif, girinti, modul = eslesme.groups()
+        ms = int(kumulatif) / 1000.0
+        if len(girinti) == 1:
+            if modul in paketler:
+                toplam += ms
+                alt += bekleyen
+            bekleyen = []
+        elif len(girinti) == 3:
+            bekleyen.append((modul, ms))
+    return toplam, sorted(alt, key=lambda x: -x[1])
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Modüllerin soğuk içe aktarma sürelerini ölçer")
+    parser.add_argument("moduller", nargs="*", default=VARSAYILAN_MODULLER)
+    parser.add_argument("--detay", type=int, default=3, help="Modül başına gösterilecek en pahalı alt modül sayısı")
+    args = parser.parse_args(argv)
+
+    print(f"{'modül':<22}{'ms':>10}   en pahalı bağımlılıklar")
+    for ad in args.moduller:
+        toplam, alt = soguk_olcum(ad)
+        if toplam < 0:
+            print(f"{ad:<22}{'yüklenemedi':>10}")
+            continue
+        detay = ", ".join(f"{m} {ms:.0f}" for m, ms in alt[:args.detay])
+        print(f"{ad:<22}{toplam:>10.1f}   {detay}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
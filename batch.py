@@ -0,0 +1,163 @@
+"""
+kayitlar/ arşivindeki tüm kayıtları arayüz olmadan görsele dönüştürür.
+
+İşler GorselPipeline ile en fazla --is-sayisi kadar eşzamanlı yürütülür.
+Her tamamlanan iş manifest dosyasına hemen yazılır; yarıda kesilen bir
+çalıştırma aynı manifestle yeniden başlatıldığında yalnızca tamamlanmamış
+(veya o tarihten sonra değişmiş) kayıtları işler.
+
+Kullanım:
+    python batch.py --api-key sk-... --is-sayisi 4
+    python batch.py --base-url http://127.0.0.1:8765/v1 --api-key test   # mock_openai.py ile
+    python batch.py --api-key sk-... --metrik-jsonl .cache/metrikler.jsonl --metrik-port 9108
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+from concurrent.futures import as_completed
+from datetime import datetime
+from typing import Dict, List
+
+import metrikler
+import painter
+from kayit_indeksi import KayitIndeksi
+from pipeline import GorselPipeline
+
+# --manifest verilmezse kayıt klasörünün içinde tutulur
+MANIFEST_ADI = ".batch_manifest.json"
+
+
+class Manifest:
+    """Kayıt başına iş durumunu tutan, her güncellemede atomik yazılan JSON dosyası"""
+
+    def __init__(self, yol: str):
+        self.yol = yol
+        self._lock = threading.Lock()
+        self.kayitlar: Dict[str, dict] = {}
+        if os.path.exists(yol):
+            with open(yol, encoding="utf-8") as f:
+                self.kayitlar = json.load(f).get("kayitlar", {})
+
+    def tamamlandi(self, ad: str, boyut: int, mtime: float) -> bool:
+        """Kayıt daha önce başarıyla işlendi ve o zamandan beri değişmedi mi"""
+        girdi = self.kayitlar.get(ad)
+        return (girdi is not None and girdi.get("durum") == "tamam" and
+                girdi.get("boyut") == boyut and girdi.get("mtime") == mtime)
+
+    def guncelle(self, ad: str, **alanlar) -> None:
+        with self._lock:
+            girdi = self.kayitlar.setdefault(ad, {})
+            girdi.update(alanlar, zaman=datetime.now().isoformat(timespec="seconds"))
+            self._yaz()
+
+    def _yaz(self) -> None:
+        klasor = os.path.dirname(self.yol) or "."
+        os.makedirs(klasor, exist_ok=True)
+        fd, gecici = tempfile.mkstemp(dir=klasor, prefix=".manifest_")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"kayitlar": self.kayitlar}, f, ensure_ascii=False, indent=2)
+        os.replace(gecici, self.yol)
+
+
+def kayitlari_bul(klasor: str) -> List[os.DirEntry]:
+    """Klasördeki kaydedilmiş .wav dosyaları (geçici / gizli dosyalar hariç)"""
+    if not os.path.isdir(klasor):
+        return []
+    return sorted((e for e in os.scandir(klasor)
+                   if e.is_file() and e.name.endswith(".wav") and not e.name.startswith(".")),
+                  key=lambda e: e.name)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="kayitlar/ arşivini toplu olarak görsele dönüştürür")
+    parser.add_argument("--klasor", default="kayitlar", help="Kayıtların bulunduğu klasör")
+    parser.add_argument("--manifest", default=None,
+                        help=f"İlerleme manifest dosyası (varsayılan: <klasor>/{MANIFEST_ADI})")
+    parser.add_argument("--is-sayisi", type=int, default=4, help="Eşzamanlı iş sayısı")
+    parser.add_argument("--api-key", default=os.environ.get("OPENAI_API_KEY"))
+    parser.add_argument("--base-url", default=os.environ.get("OPENAI_BASE_URL"),
+                        help="OpenAI uyumlu API adresi (ör. mock_openai.py)")
+    parser.add_argument("--dil", default="tr")
+    parser.add_argument("--onbellegi-atla", action="store_true")
+    parser.add_argument("--on-isleme", action="store_true",
+                        help="Yüklemeden önce 16 kHz mono'ya dönüştür")
+    parser.add_argument("--sessizlik-kirp", action="store_true",
+                        help="Baştaki / sondaki sessizliği at, uzun duraklamaları kısalt")
+    parser.add_argument("--bolum-suresi", type=float, default=None,
+                        help="Uzun kayıtları bu süreden (saniye) kısa bölümlere ayırıp eşzamanlı transkript et")
+    parser.add_argument("--yeniden", action="store_true", help="Tamamlanmış kayıtları da yeniden işle")
+    parser.add_argument("--metrik-jsonl", help="Aşama ölçümlerinin eklenecek JSON lines dosyası")
+    parser.add_argument("--metrik-port", type=int, help="Prometheus /metrics adresinin sunulacağı port")
+    args = parser.parse_args(argv)
+
+    if not args.api_key:
+        parser.error("OpenAI API anahtarı gerekli (--api-key veya OPENAI_API_KEY)")
+
+    if args.metrik_jsonl:
+        metrikler.jsonl_ac(args.metrik_jsonl)
+    if args.metrik_port is not None:
+        metrikler.sunucu_baslat(args.metrik_port)
+
+    manifest = Manifest(args.manifest or os.path.join(args.klasor, MANIFEST_ADI))
+    indeks = KayitIndeksi(args.klasor)
+    bekleyenler = []
+    for e in kayitlari_bul(args.klasor):
+        st = e.stat()
+        if not args.yeniden and manifest.tamamlandi(e.name, st.st_size, st.st_mtime):
+            continue
+        bekleyenler.append((e, st))
+
+    toplam = len(bekleyenler)
+    print(f"{toplam} kayıt işlenecek ({args.is_sayisi} eşzamanlı iş)")
+    if toplam == 0:
+        return 0
+
+    pipeline = GorselPipeline(api_key=args.api_key, base_url=args.base_url,
+                              max_eszamanli=args.is_sayisi, languages=args.dil,
+                              use_cache=not args.onbellegi_atla, preprocess=args.on_isleme,
+                              trim_silence=args.sessizlik_kirp, max_segment_s=args.bolum_suresi)
+    isler = {}
+    for e, st in bekleyenler:
+        manifest.guncelle(e.name, durum="isleniyor", boyut=st.st_size, mtime=st.st_mtime)
+        is_ = pipeline.gonder(e.path)
+        isler[is_.gorsel] = (e.name, is_)
+
+    hata_sayisi = 0
+    try:
+        for i, future in enumerate(as_completed(isler), 1):
+            ad, is_ = isler[future]
+            try:
+                transkript, gorsel = is_.sonuc()
+                manifest.guncelle(ad, durum="tamam", transkript=transkript, gorsel=gorsel, hata=None)
+                painter.sabitle(gorsel, "kayit:" + ad)
+                indeks.sonuc_yaz(is_.ses_yolu, transkript=transkript, gorsel=gorsel)
+                print(f"[{i}/{toplam}] ✅ {ad} -> {gorsel}")
+            except Exception as e:
+                hata_sayisi += 1
+                manifest.guncelle(ad, durum="hata", hata=str(e))
+                print(f"[{i}/{toplam}] ❌ {ad}: {e}", file=sys.stderr)
+    except KeyboardInterrupt:
+        print("Durduruldu; tamamlanan işler manifestte, kalanlar sonraki çalıştırmada işlenecek.")
+        return 130
+    finally:
+        pipeline.kapat()
+        asama_ozeti_yaz()
+
+    return 1 if hata_sayisi else 0
+
+
+def asama_ozeti_yaz() -> None:
+    """Aşama başına adet ve p50 / p95 süreleri (histogram kovalarından tahmini)"""
+    ozet = metrikler.ozet()
+    if not ozet:
+        return
+    print(f"{'aşama':<30}{'adet':>7}{'hata':>6}{'p50 ms':>10}{'p95 ms':>10}")
+    for asama, o in ozet.items():
+        print(f"{asama:<30}{o['adet']:>7}{o['hata']:>6}{o['p50_s'] * 1000:>10.1f}{o['p95_s'] * 1000:>10.1f}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
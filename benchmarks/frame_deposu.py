@@ -0,0 +1,91 @@
+"""
+Liste tabanlı frame saklama ile OrnekDeposu karşılaştırması.
+
+Aynı miktarda sentetik chunk iki yöntemle biriktirilir ve WAV olarak
+kaydedilir; ayrılan bellek (tracemalloc) ve kaydetme süresi raporlanır.
+
+Kullanım:
+    python -m benchmarks.frame_deposu --sure 600 --sample-rate 44100 --chunk 1024
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+import wave
+
+from recorder import OrnekDeposu
+
+
+def _chunklar(sure: float, sample_rate: int, channels: int, chunk: int):
+    """Kayıt süresince gelecek chunk'ları üretir (her biri ayrı bytes nesnesi)"""
+    chunk_bayt = chunk * channels * 2
+    adet = int(sure * sample_rate / chunk)
+    ornek = bytearray(os.urandom(chunk_bayt))
+    for _ in range(adet):
+        yield bytes(ornek)
+
+
+def _wav_ac(yol: str, sample_rate: int, channels: int) -> wave.Wave_write:
+    wf = wave.open(yol, 'wb')
+    wf.setnchannels(channels)
+    wf.setsampwidth(2)
+    wf.setframerate(sample_rate)
+    return wf
+
+
+def liste_olc(args, yol: str) -> dict:
+    tracemalloc.start()
+    frames = []
+    for data in _chunklar(args.sure, args.sample_rate, args.channels, args.chunk):
+        frames.append(data)
+    biriktirme = tracemalloc.get_traced_memory()[0]
+
+    baslangic = time.perf_counter()
+    with _wav_ac(yol, args.sample_rate, args.channels) as wf:
+        wf.writeframes(b''.join(frames))
+    kaydetme = time.perf_counter() - baslangic
+    tepe = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {'yontem': 'liste', 'bellek_bayt': biriktirme, 'tepe_bellek_bayt': tepe,
+            'kaydetme_s': kaydetme}
+
+
+def depo_olc(args, yol: str) -> dict:
+    tracemalloc.start()
+    depo = OrnekDeposu(2, args.channels, int(args.sample_rate * args.channels * 2 * 30))
+    for data in _chunklar(args.sure, args.sample_rate, args.channels, args.chunk):
+        depo.ekle(data)
+    biriktirme = tracemalloc.get_traced_memory()[0]
+
+    baslangic = time.perf_counter()
+    with _wav_ac(yol, args.sample_rate, args.channels) as wf:
+        depo.wav_yaz(wf)
+    kaydetme = time.perf_counter() - baslangic
+    tepe = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {'yontem': 'depo', 'bellek_bayt': biriktirme, 'tepe_bellek_bayt': tepe,
+            'kaydetme_s': kaydetme}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Frame saklama yöntemlerini karşılaştırır")
+    parser.add_argument('--sure', type=float, default=300.0, help="Kayıt süresi (saniye)")
+    parser.add_argument('--sample-rate', type=int, default=44100)
+    parser.add_argument('--channels', type=int, default=1)
+    parser.add_argument('--chunk', type=int, default=1024)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as klasor:
+        for olc in (liste_olc, depo_olc):
+            sonuc = olc(args, os.path.join(klasor, 'kayit.wav'))
+            sonuc.update(sure=args.sure, sample_rate=args.sample_rate,
+                         channels=args.channels, chunk=args.chunk)
+            print(json.dumps(sonuc))
+
+
+if __name__ == "__main__":
+    main()
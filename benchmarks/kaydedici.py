@@ -0,0 +1,149 @@
+"""
+SesKaydedici yük testi: ayar kombinasyonlarına göre verim, kayıp ve gecikme.
+
+Her sample rate / kanal / chunk kombinasyonu için sentetik kaynakla bir
+kayıt alınır; her kombinasyon kendi (spawn ile açılan) sürecinde ölçülür,
+böylece bellek ve CPU değerleri önceki kombinasyonlardan etkilenmez. Kayıt sürerken ayrı thread'ler get_durum()'u sürekli çağırır.
+Her kombinasyon için bir JSON satırı yazılır:
+
+- frame_per_s: saniyede alınan örnek frame sayısı
+- kayip_chunk: taşma / tampon dolması nedeniyle düşen chunk sayısı
+- durum_p50_us / durum_p99_us: get_durum() gecikmesi (mikrosaniye)
+- cpu_yuzde: kayıt boyunca süreç CPU kullanımı
+- tepe_rss_kb: kombinasyonun sürecindeki en yüksek RSS değeri
+- kaydet_ms: kaydet() süresi
+
+Kullanım:
+    python -m benchmarks.kaydedici --sure 2 --cikti sonuclar.jsonl
+    python -m benchmarks.kaydedici --chunk 256 512 --sample-rate 44100 --hiz 0
+"""
+import argparse
+import itertools
+import multiprocessing
+import json
+import os
+import resource
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import List
+
+from audio_source import SyntheticSource
+from recorder import SesAyarlari, SesKaydedici
+
+SAMPLE_RATES = [8000, 16000, 22050, 44100, 48000, 96000]
+CHANNELS = [1, 2]
+CHUNKS = [256, 512, 1024, 2048, 4096]
+
+
+def _yuzdelik(degerler: List[float], oran: float) -> float:
+    if not degerler:
+        return 0.0
+    sirali = sorted(degerler)
+    return sirali[min(len(sirali) - 1, int(oran * len(sirali)))]
+
+
+def _sorgula(kaydedici: SesKaydedici, dur: threading.Event, gecikmeler: List[float]) -> None:
+    """get_durum()'u durdurulana kadar art arda çağırıp gecikmeleri toplar"""
+    while not dur.is_set():
+        baslangic = time.perf_counter()
+        kaydedici.get_durum()
+        gecikmeler.append(time.perf_counter() - baslangic)
+        time.sleep(0.0005)
+
+
+def olc(args, sample_rate: int, channels: int, chunk: int) -> dict:
+    kaynak = SyntheticSource(hiz=args.hiz, jitter=args.jitter,
+                             tasma_olasiligi=args.tasma, tohum=args.tohum)
+    ayarlar = SesAyarlari(sample_rate=sample_rate, channels=channels, chunk=chunk,
+                          diske_akit=not args.bellek)
+    kaydedici = SesKaydedici(ayarlar=ayarlar, kaynak=kaynak)
+
+    gecikmeler: List[List[float]] = [[] for _ in range(args.sorgulayici)]
+    dur = threading.Event()
+    sorgulayicilar = [threading.Thread(target=_sorgula, args=(kaydedici, dur, g), daemon=True)
+                      for g in gecikmeler]
+
+    cpu_baslangic = time.process_time()
+    duvar_baslangic = time.perf_counter()
+    if not kaydedici.kayit_baslat():
+        raise RuntimeError(kaydedici.get_durum().mesaj)
+    for t in sorgulayicilar:
+        t.start()
+
+    time.sleep(args.sure)
+
+    dur.set()
+    for t in sorgulayicilar:
+        t.join()
+    kaydedici.kayit_durdur()
+    duvar = time.perf_counter() - duvar_baslangic
+    cpu = time.process_time() - cpu_baslangic
+
+    kaydet_baslangic = time.perf_counter()
+    basarili, dosya_yolu = kaydedici.kaydet(f"bench_{sample_rate}_{channels}_{chunk}")
+    kaydet_suresi = time.perf_counter() - kaydet_baslangic
+    if basarili:
+        os.remove(dosya_yolu)
+
+    tum_gecikmeler = [g for liste in gecikmeler for g in liste]
+    return {
+        'sample_rate': sample_rate,
+        'channels': channels,
+        'chunk': chunk,
+        'diske_akit': ayarlar.diske_akit,
+        'sure_s': duvar,
+        'chunk_sayisi': kaydedici.frame_sayisi,
+        'frame_per_s': kaydedici.frame_sayisi * chunk / duvar,
+        'kayip_chunk': kaydedici.kayip_chunk,
+        'durum_cagri': len(tum_gecikmeler),
+        'durum_p50_us': _yuzdelik(tum_gecikmeler, 0.50) * 1e6,
+        'durum_p99_us': _yuzdelik(tum_gecikmeler, 0.99) * 1e6,
+        'cpu_yuzde': 100.0 * cpu / duvar,
+        'tepe_rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        'kaydet_ms': kaydet_suresi * 1e3,
+        'kaydet_basarili': basarili,
+    }
+
+
+def _ayri_surecte_olc(args, klasor: str, sample_rate: int, channels: int, chunk: int) -> dict:
+    """Yeni süreçte çalışır; kaydet() göreli kayitlar/ klasörüne yazdığı için önce klasöre geçer"""
+    os.chdir(klasor)
+    return olc(args, sample_rate, channels, chunk)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SesKaydedici ayar kombinasyonlarını ölçer")
+    parser.add_argument('--sample-rate', type=int, nargs='+', default=SAMPLE_RATES)
+    parser.add_argument('--channels', type=int, nargs='+', default=CHANNELS)
+    parser.add_argument('--chunk', type=int, nargs='+', default=CHUNKS)
+    parser.add_argument('--sure', type=float, default=2.0, help="Kombinasyon başına kayıt süresi (saniye)")
+    parser.add_argument('--hiz', type=float, default=1.0,
+                        help="Kaynak hızı (1 = gerçek zamanlı, 0 = olabildiğince hızlı)")
+    parser.add_argument('--jitter', type=float, default=0.0, help="Chunk başına en fazla zamanlama sapması (s)")
+    parser.add_argument('--tasma', type=float, default=0.0, help="Chunk başına taşma olasılığı")
+    parser.add_argument('--sorgulayici', type=int, default=2, help="get_durum() çağıran thread sayısı")
+    parser.add_argument('--bellek', action='store_true', help="Diske akıtmak yerine bellekte kaydet")
+    parser.add_argument('--tohum', type=int, default=0)
+    parser.add_argument('--cikti', help="Sonuçların yazılacağı JSON lines dosyası (varsayılan stdout)")
+    args = parser.parse_args()
+
+    cikti = open(args.cikti, 'a') if args.cikti else sys.stdout
+    try:
+        with tempfile.TemporaryDirectory() as klasor:
+            # ru_maxrss süreç ömrü boyunca yalnızca artar; her kombinasyon için yeni süreç
+            with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn"),
+                                     max_tasks_per_child=1) as havuz:
+                for sample_rate, channels, chunk in itertools.product(args.sample_rate, args.channels, args.chunk):
+                    sonuc = havuz.submit(_ayri_surecte_olc, args, klasor, sample_rate, channels, chunk).result()
+                    cikti.write(json.dumps(sonuc) + "\n")
+                    cikti.flush()
+    finally:
+        if cikti is not sys.stdout:
+            cikti.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+import hashlib
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Hashable, List, Optional, Tuple
+
+# Dosya özetinde tek seferde okunan blok boyutu
+OKUMA_BLOGU = 1 << 20
+
+
+def dosya_ozeti(yol: str, algoritma: str = "sha256") -> str:
+    """Dosyanın içerik özetini, dosyayı belleğe tamamen almadan bloklar halinde hesaplar"""
+    ozet = hashlib.new(algoritma)
+    with open(yol, 'rb') as f:
+        for blok in iter(lambda: f.read(OKUMA_BLOGU), b''):
+            ozet.update(blok)
+    return ozet.hexdigest()
+
+
+def anahtar_olustur(*parcalar: str) -> str:
+    """Birden fazla parçadan sabit uzunlukta önbellek anahtarı üretir"""
+    return hashlib.sha256("\x1f".join(parcalar).encode("utf-8")).hexdigest()
+
+
+class DiskCache:
+    """
+    Her girdisi ayrı bir dosya olan, LRU temizlemeli disk önbelleği.
+
+    Son erişim zamanı dosyanın mtime değerinde tutulur: isabetlerde mtime
+    güncellenir, sınır aşıldığında en eski girdiler silinir. ``max_yas``
+    saniyeden eski girdiler süresi dolmuş sayılır. ``silme_dinleyici``
+    verilirse temizlikte düşen her girdi için (anahtar, yol) ile çağrılır:
+    girdi önce kilit altında gizli bir ada taşınır (aynı anahtara yeni yazım
+    etkilenmez), dinleyici kilit bırakıldıktan sonra çalışır, dosya ardından silinir.
+    """
+
+    def __init__(self,
+                 klasor: str,
+                 uzanti: str = "",
+                 max_girdi: Optional[int] = None,
+                 max_bayt: Optional[int] = None,
+                 max_yas: Optional[float] = None,
+                 silme_dinleyici: Optional[Callable[[str, str], None]] = None):
+        self.klasor = klasor
+        self.uzanti = uzanti
+        self.max_girdi = max_girdi
+        self.max_bayt = max_bayt
+        self.max_yas = max_yas
+        self.silme_dinleyici = silme_dinleyici
+        self._lock = threading.Lock()
+
+    def yol(self, anahtar: str) -> str:
+        """Anahtarın önbellekteki dosya yolu"""
+        return os.path.join(self.klasor, anahtar + self.uzanti)
+
+    def bul(self, anahtar: str) -> Optional[str]:
+        """Girdi varsa ve süresi dolmamışsa yolunu döndürür, erişim zamanını günceller"""
+        yol = self.yol(anahtar)
+        try:
+            mtime = os.path.getmtime(yol)
+        except OSError:
+            return None
+
+        if self.max_yas is not None and time.time() - mtime > self.max_yas:
+            self._bildir(self._ayir([yol]))
+            return None
+
+        try:
+            os.utime(yol)
+        except OSError:
+            return None
+        return yol
+
+    def oku(self, anahtar: str) -> Optional[bytes]:
+        """Girdinin içeriğini döndürür, yoksa None"""
+        yol = self.bul(anahtar)
+        if yol is None:
+            return None
+        try:
+            with open(yol, 'rb') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def yaz(self, anahtar: str, veri: bytes) -> str:
+        """Veriyi atomik olarak önbelleğe yazar"""
+        os.makedirs(self.klasor, exist_ok=True)
+        fd, gecici = tempfile.mkstemp(dir=self.klasor, prefix=".yaziliyor_")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(veri)
+        except BaseException:
+            self._sil(gecici)
+            raise
+        return self.tasi(anahtar, gecici)
+
+    def tasi(self, anahtar: str, kaynak_yol: str) -> str:
+        """Önceden yazılmış bir dosyayı önbelleğe taşır (aynı dosya sisteminde atomik)"""
+        os.makedirs(self.klasor, exist_ok=True)
+        yol = self.yol(anahtar)
+        os.replace(kaynak_yol, yol)
+        self.temizle()
+        return yol
+
+    def temizle(self) -> None:
+        """Süresi dolan girdileri ve sınırı aşan en eski girdileri siler"""
+        if self.max_girdi is None and self.max_bayt is None and self.max_yas is None:
+            return
+
+        with self._lock:
+            cikarilacaklar = self._temizlenecekler()
+            ayrilanlar = self._ayir(cikarilacaklar)
+        self._bildir(ayrilanlar)
+
+    def _temizlenecekler(self) -> List[str]:
+        """Süresi dolmuş veya sınırları aşan girdilerin yolları (kilit içinde çağrılır)"""
+        cikarilacaklar = []
+        girdiler = []
+        try:
+            for e in os.scandir(self.klasor):
+                if e.is_file() and e.name.endswith(self.uzanti) and not e.name.startswith('.'):
+                    st = e.stat()
+                    girdiler.append((st.st_mtime, st.st_size, e.path))
+        except OSError:
+            return cikarilacaklar
+
+        simdi = time.time()
+        if self.max_yas is not None:
+            for mtime, _, yol in girdiler:
+                if simdi - mtime > self.max_yas:
+                    cikarilacaklar.append(yol)
+            girdiler = [g for g in girdiler if simdi - g[0] <= self.max_yas]
+
+        # En yeni önce; sınırları aşan kuyruk silinir
+        girdiler.sort(reverse=True)
+        toplam = 0
+        for i, (_, boyut, yol) in enumerate(girdiler):
+            toplam += boyut
+            if ((self.max_girdi is not None and i >= self.max_girdi) or
+                    (self.max_bayt is not None and toplam > self.max_bayt)):
+                cikarilacaklar.append(yol)
+        return cikarilacaklar
+
+    def _ayir(self, yollar: List[str]) -> List[Tuple[str, str]]:
+        """
+        Düşen girdileri önbellekten çıkarır; dinleyici varsa dosyalar silinmek
+        yerine gizli adlara taşınır ve (anahtar, geçici yol) listesi döner.
+        """
+        ayrilanlar = []
+        for yol in yollar:
+            if self.silme_dinleyici is None:
+                self._sil(yol)
+                continue
+            ad = os.path.basename(yol)
+            gecici = os.path.join(self.klasor, f".siliniyor_{os.getpid()}_{threading.get_ident()}_{ad}")
+            try:
+                os.replace(yol, gecici)
+            except OSError:
+                continue  # Başka bir temizlik önce davrandı
+            ayrilanlar.append((ad[:len(ad) - len(self.uzanti)] if self.uzanti else ad, gecici))
+        return ayrilanlar
+
+    def _bildir(self, ayrilanlar: List[Tuple[str, str]]) -> None:
+        """Ayrılan girdileri (kilit dışında) dinleyiciye bildirip siler"""
+        for anahtar, yol in ayrilanlar:
+            try:
+                self.silme_dinleyici(anahtar, yol)
+            except Exception:
+                pass  # Dinleyici hatası önbellek temizliğini durdurmaz
+            self._sil(yol)
+
+    @staticmethod
+    def _sil(yol: str) -> None:
+        try:
+            os.remove(yol)
+        except OSError:
+            pass
+
+
+class BaytOnbellegi:
+    """
+    Toplam boyutu ``max_bayt`` ile sınırlı, bellekte tutulan LRU bayt önbelleği.
+
+    Değerler kopyalanmadan paylaşılır; ``max_bayt``'tan büyük veriler
+    önbelleğe alınmadan döndürülür.
+    """
+
+    def __init__(self, max_bayt: int):
+        self.max_bayt = max_bayt
+        self._girdiler: "OrderedDict[Hashable, bytes]" = OrderedDict()
+        self._toplam = 0
+        self._lock = threading.Lock()
+
+    def al(self, anahtar: Hashable, uret: Callable[[], bytes]) -> bytes:
+        """Anahtarın verisini döndürür; yoksa ``uret`` ile üretip saklar (kilit dışında)"""
+        with self._lock:
+            veri = self._girdiler.get(anahtar)
+            if veri is not None:
+                self._girdiler.move_to_end(anahtar)
+                return veri
+
+        veri = uret()
+        if len(veri) > self.max_bayt:
+            return veri
+        with self._lock:
+            if anahtar not in self._girdiler:
+                self._girdiler[anahtar] = veri
+                self._toplam += len(veri)
+            while self._toplam > self.max_bayt:
+                _, eski = self._girdiler.popitem(last=False)
+                self._toplam -= len(eski)
+        return veri
+
+    @property
+    def toplam_bayt(self) -> int:
+        with self._lock:
+            return self._toplam
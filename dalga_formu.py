@@ -0,0 +1,198 @@
+"""
+Kayıtlar için önceden hesaplanmış dalga formu (peaks) dosyaları.
+
+Her kayıt için ``kayitlar/.peaks/<ad>.peaks`` dosyasında çok çözünürlüklü bir
+min/max piramidi tutulur: 0. seviyede her kutu ``KUTU_FRAME`` frame'i özetler,
+sonraki her seviye bir öncekinin komşu kutularını birleştirir. Veri int16
+(min, max) çiftleri halinde, sabit boyutlu bir başlığın ardından düz olarak
+yazıldığı için memmap ile açılır; küçük resim veya yakınlaştırılmış önizleme
+çizmek tüm kaydı değil, yalnızca istenen seviyenin birkaç KB'ını okur.
+
+Dosya biçimi (little-endian):
+    "VPK1", kaynak boyutu (Q), kaynak mtime_ns (q), sample_rate (I),
+    channels (H), kutu_frame (I), seviye sayısı (H),
+    seviye başına kutu sayısı (I * seviye), ardından int16 [kutu, 2] bloklar
+"""
+import os
+import struct
+import tempfile
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from audio_preprocess import wav_memmap
+
+SIHIRLI = b"VPK1"
+KUTU_FRAME = 256
+# Bu sayıdan az kutusu olan seviye üretilmez (en kaba seviye)
+MIN_KUTU = 64
+# Kaynak WAV'dan tek seferde okunan frame sayısı (KUTU_FRAME'in katı)
+OKUMA_BLOGU = KUTU_FRAME * 4096
+
+_BASLIK = struct.Struct("<4sQqIHIH")
+
+
+def peaks_yolu(wav_yolu: str) -> str:
+    klasor, ad = os.path.split(wav_yolu)
+    return os.path.join(klasor, ".peaks", ad + ".peaks")
+
+
+def _int16(blok: np.ndarray, ornek_genisligi: int) -> np.ndarray:
+    """Farklı örnek genişliklerini int16 ölçeğine getirir"""
+    if ornek_genisligi == 1:
+        return (blok.astype(np.int16) - 128) << 8
+    if ornek_genisligi == 4:
+        return (blok >> 16).astype(np.int16)
+    return blok.astype(np.int16, copy=False)
+
+
+def _seviye0(wav_yolu: str) -> Tuple[np.ndarray, int, int]:
+    """Kaydı bloklar halinde okuyup KUTU_FRAME'lik min/max kutularını çıkarır"""
+    ornekler, bilgi = wav_memmap(wav_yolu)
+    kutu_sayisi = -(-bilgi.frame_sayisi // KUTU_FRAME)
+    seviye = np.empty((kutu_sayisi, 2), dtype=np.int16)
+    for bas in range(0, bilgi.frame_sayisi, OKUMA_BLOGU):
+        blok = _int16(np.asarray(ornekler[bas:bas + OKUMA_BLOGU]), bilgi.ornek_genisligi)
+        k = bas // KUTU_FRAME
+        tam = len(blok) // KUTU_FRAME
+        if tam:
+            # Kanallar iç içe olduğundan bir kutu tek satırdır: kanallar arası ve kutu içi min / max birlikte
+            kutular = blok[:tam * KUTU_FRAME].reshape(tam, -1)
+            seviye[k:k + tam, 0] = kutular.min(axis=1)
+            seviye[k:k + tam, 1] = kutular.max(axis=1)
+        if tam * KUTU_FRAME < len(blok):  # Yalnızca dosyanın son bloğunda olur
+            seviye[-1] = blok[tam * KUTU_FRAME:].min(), blok[tam * KUTU_FRAME:].max()
+    return seviye, bilgi.sample_rate, bilgi.channels
+
+
+def _piramit(seviye0: np.ndarray) -> List[np.ndarray]:
+    seviyeler = [seviye0]
+    while len(seviyeler[-1]) >= 2 * MIN_KUTU:
+        onceki = seviyeler[-1]
+        cift = len(onceki) // 2 * 2
+        sonraki = np.empty(((len(onceki) + 1) // 2, 2), dtype=np.int16)
+        sonraki[:cift // 2, 0] = onceki[:cift, 0].reshape(-1, 2).min(axis=1)
+        sonraki[:cift // 2, 1] = onceki[:cift, 1].reshape(-1, 2).max(axis=1)
+        if cift < len(onceki):
+            sonraki[-1] = onceki[-1]
+        seviyeler.append(sonraki)
+    return seviyeler
+
+
+def olustur(wav_yolu: str) -> str:
+    """Kayıt için peaks dosyasını (atomik olarak) yazar, yolunu döndürür"""
+    st = os.stat(wav_yolu)
+    seviye0, sample_rate, channels = _seviye0(wav_yolu)
+    seviyeler = _piramit(seviye0)
+
+    yol = peaks_yolu(wav_yolu)
+    os.makedirs(os.path.dirname(yol), exist_ok=True)
+    fd, gecici = tempfile.mkstemp(dir=os.path.dirname(yol), prefix=".peaks_")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(_BASLIK.pack(SIHIRLI, st.st_size, st.st_mtime_ns, sample_rate,
+                                 channels, KUTU_FRAME, len(seviyeler)))
+            f.write(struct.pack(f"<{len(seviyeler)}I", *(len(s) for s in seviyeler)))
+            for seviye in seviyeler:
+                f.write(seviye.astype("<i2", copy=False).tobytes())
+        os.replace(gecici, yol)
+    except BaseException:
+        if os.path.exists(gecici):
+            os.remove(gecici)
+        raise
+    return yol
+
+
+class DalgaFormu:
+    """Bir kaydın peaks dosyasına memmap ile erişim"""
+
+    def __init__(self, yol: str):
+        with open(yol, "rb") as f:
+            sihirli, self.kaynak_boyutu, self.kaynak_mtime_ns, self.sample_rate, self.channels, \
+                self.kutu_frame, seviye_sayisi = _BASLIK.unpack(f.read(_BASLIK.size))
+            if sihirli != SIHIRLI:
+                raise ValueError(f"peaks dosyası değil: {yol}")
+            uzunluklar = struct.unpack(f"<{seviye_sayisi}I", f.read(4 * seviye_sayisi))
+
+        konum = _BASLIK.size + 4 * seviye_sayisi
+        self._seviyeler = []
+        for uzunluk in uzunluklar:
+            if uzunluk:
+                self._seviyeler.append(np.memmap(yol, dtype="<i2", mode="r", offset=konum, shape=(uzunluk, 2)))
+            else:
+                self._seviyeler.append(np.zeros((0, 2), dtype=np.int16))
+            konum += uzunluk * 4
+
+    @property
+    def sure(self) -> float:
+        return len(self._seviyeler[0]) * self.kutu_frame / self.sample_rate if self._seviyeler else 0.0
+
+    def zarf(self, genislik: int, baslangic_s: float = 0.0,
+             bitis_s: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        [baslangic_s, bitis_s) aralığının en fazla ``genislik`` noktalık min/max
+        zarfını -1.0 ile 1.0 arası döndürür.
+
+        Aralıkta en az ``genislik`` kutu bulunan en kaba seviye seçilir, yalnızca
+        o seviyenin ilgili dilimi okunur.
+        """
+        if not self._seviyeler or not len(self._seviyeler[0]):
+            return np.zeros(0, np.float32), np.zeros(0, np.float32)
+        bitis_s = self.sure if bitis_s is None else min(bitis_s, self.sure)
+        kutu_s = self.kutu_frame / self.sample_rate
+
+        secilen, adim = 0, 1
+        for i in range(len(self._seviyeler) - 1, -1, -1):
+            if (bitis_s - baslangic_s) / (kutu_s * (1 << i)) >= genislik:
+                secilen, adim = i, 1 << i
+                break
+        seviye = self._seviyeler[secilen]
+        bas = max(0, int(baslangic_s / (kutu_s * adim)))
+        son = min(len(seviye), max(bas + 1, int(np.ceil(bitis_s / (kutu_s * adim)))))
+        dilim = np.asarray(seviye[bas:son], dtype=np.float32) / 32768.0
+
+        # Fazla kutuları genislik noktaya indir
+        if len(dilim) > genislik:
+            sinirlar = np.linspace(0, len(dilim), genislik + 1).astype(np.int64)
+            return (np.minimum.reduceat(dilim[:, 0], sinirlar[:-1]),
+                    np.maximum.reduceat(dilim[:, 1], sinirlar[:-1]))
+        return dilim[:, 0].copy(), dilim[:, 1].copy()
+
+    def svg(self, genislik: int = 240, yukseklik: int = 40, baslangic_s: float = 0.0,
+            bitis_s: Optional[float] = None, renk: str = "#ff4b4b") -> str:
+        """Zarfı küçük bir SVG resmi olarak çizer"""
+        mins, maxs = self.zarf(genislik, baslangic_s, bitis_s)
+        yari = yukseklik / 2.0
+        x = np.arange(len(maxs))
+        ust = " ".join(f"{i},{yari - m * yari:.1f}" for i, m in zip(x, maxs))
+        alt = " ".join(f"{i},{yari - m * yari:.1f}" for i, m in zip(x[::-1], mins[::-1]))
+        return (f'<svg xmlns="http://www.w3.org/2000/svg" width="{genislik}" height="{yukseklik}" '
+                f'viewBox="0 0 {max(1, len(maxs))} {yukseklik}" preserveAspectRatio="none">'
+                f'<polygon points="{ust} {alt}" fill="{renk}"/></svg>')
+
+
+def ac(wav_yolu: str, olusturulsun: bool = True) -> Optional[DalgaFormu]:
+    """
+    Kaydın peaks dosyasını açar.
+
+    Dosya yoksa veya kayıt o zamandan beri değiştiyse ``olusturulsun`` ise
+    yeniden üretilir, değilse None döner. Kayıt okunamayan bir WAV ise de
+    None döner.
+    """
+    yol = peaks_yolu(wav_yolu)
+    try:
+        st = os.stat(wav_yolu)
+    except FileNotFoundError:
+        return None
+    try:
+        dalga = DalgaFormu(yol)
+        if dalga.kaynak_boyutu == st.st_size and dalga.kaynak_mtime_ns == st.st_mtime_ns:
+            return dalga
+    except (OSError, ValueError, struct.error):
+        pass
+    if not olusturulsun:
+        return None
+    try:
+        return DalgaFormu(olustur(wav_yolu))
+    except (ValueError, struct.error):
+        return None  # Geçerli bir WAV değil
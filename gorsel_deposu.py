@@ -0,0 +1,254 @@
+"""
+Üretilen görseller için içerik adresli depo.
+
+Her görsel içeriğinin sha256 özetiyle ``<klasor>/<ilk 2 karakter>/<özet>.png``
+yoluna bir kez yazılır; aynı görsel ikinci kez gelirse yalnızca mevcut kopya
+döner. Arayüzün tam boyutlu PNG yerine yükleyebilmesi için küçük resim ve
+sıkıştırılmış (WebP / JPEG) varyantlar Pillow ile bir kez üretilip aynı
+klasörde tutulur. Tüm yazımlar geçici dosya + ``os.replace`` ile atomiktir.
+
+Görsele işaret eden her kayıt (önbellek girdisi, tamamlanan iş, arşiv
+kaydı) depodaki küçük bir SQLite tablosuna sahibiyle referans olarak yazılır.
+Son referansı bırakılan görsel varyantlarıyla silinir.
+
+``max_bayt`` verilirse depo (PNG'ler ve varyantları birlikte) bu boyutun
+altında tutulmaya çalışılır: yeni görsel eklendiğinde referansı olmayan
+görsellerden en uzun süredir erişilmeyenler silinir; referanslı görseller
+bayt sınırıyla silinmez. Son erişim zamanı PNG'nin mtime değerindedir ve
+``bul`` ile güncellenir.
+"""
+import os
+import re
+import sqlite3
+import tempfile
+import threading
+from typing import Dict, List, Optional, Set, Tuple
+
+import PIL.Image
+import PIL.features
+
+from cache import dosya_ozeti
+
+# Varyant adı -> (en uzun kenar (None: orijinal boyut), Pillow biçimi, kayıt ayarları)
+VARYANTLAR: Dict[str, Tuple[Optional[int], str, dict]] = {
+    "kucuk": (256, "WEBP", {"quality": 75, "method": 4}),
+    "web": (None, "WEBP", {"quality": 82, "method": 4}),
+    "jpeg": (None, "JPEG", {"quality": 85, "optimize": True, "progressive": True}),
+}
+
+_UZANTILAR = {"WEBP": ".webp", "JPEG": ".jpg"}
+_OZET = re.compile(r"^[0-9a-f]{64}$")
+
+REFERANS_DB = ".referanslar.db"
+
+_REFERANS_SEMA = """
+CREATE TABLE IF NOT EXISTS referanslar (
+    ozet TEXT NOT NULL,
+    sahip TEXT NOT NULL,
+    PRIMARY KEY (ozet, sahip)
+) WITHOUT ROWID;
+"""
+
+
+class GorselDeposu:
+    """Görselleri içerik özetine göre saklayan, varyantlarını üreten depo"""
+
+    def __init__(self, klasor: str = "./img/store", max_bayt: Optional[int] = None):
+        self.klasor = klasor
+        self.max_bayt = max_bayt
+        self._lock = threading.RLock()
+        self._baglanti: Optional[sqlite3.Connection] = None
+        # Pillow WebP desteği olmadan derlenmişse WebP varyantları JPEG'e düşer
+        self._webp = PIL.features.check("webp")
+
+    def _db(self) -> sqlite3.Connection:
+        """Referans tablosu; ilk kullanımda açılır (kilit içinde çağrılmalı)"""
+        if self._baglanti is None:
+            os.makedirs(self.klasor, exist_ok=True)
+            baglanti = sqlite3.connect(os.path.join(self.klasor, REFERANS_DB), check_same_thread=False, timeout=10)
+            # Uygulama ve batch.py aynı depoyu paylaşabilir
+            baglanti.execute("PRAGMA journal_mode=WAL")
+            baglanti.executescript(_REFERANS_SEMA)
+            self._baglanti = baglanti
+        return self._baglanti
+
+    def referans_ekle(self, ozet: str, sahip: str) -> None:
+        """``sahip``'in görsele işaret ettiğini kaydeder; referanslı görsel bayt sınırıyla silinmez"""
+        with self._lock, self._db() as db:
+            db.execute("INSERT OR IGNORE INTO referanslar (ozet, sahip) VALUES (?, ?)", (ozet, sahip))
+
+    def referans_birak(self, ozet: str, sahip: str) -> bool:
+        """Referansı kaldırır; görselin son referansıysa görseli siler ve True döndürür"""
+        with self._lock:
+            with self._db() as db:
+                db.execute("DELETE FROM referanslar WHERE ozet = ? AND sahip = ?", (ozet, sahip))
+                kalan = db.execute("SELECT COUNT(*) FROM referanslar WHERE ozet = ?", (ozet,)).fetchone()[0]
+            if kalan:
+                return False
+            self.sil(ozet)
+            return True
+
+    def referans_sayisi(self, ozet: str) -> int:
+        with self._lock:
+            return self._db().execute("SELECT COUNT(*) FROM referanslar WHERE ozet = ?", (ozet,)).fetchone()[0]
+
+    def _referanslilar(self) -> Set[str]:
+        with self._lock:
+            return {satir[0] for satir in self._db().execute("SELECT DISTINCT ozet FROM referanslar")}
+
+    def _bicim(self, varyant: str) -> Tuple[Optional[int], str, dict]:
+        kenar, bicim, ayarlar = VARYANTLAR[varyant]
+        if bicim == "WEBP" and not self._webp:
+            return kenar, "JPEG", VARYANTLAR["jpeg"][2]
+        return kenar, bicim, ayarlar
+
+    def yol(self, ozet: str, varyant: Optional[str] = None) -> str:
+        """Özetin (veya varyantının) depodaki yolu; dosyanın varlığını kontrol etmez"""
+        if not _OZET.match(ozet):
+            raise ValueError(f"Geçersiz görsel özeti: {ozet}")
+        klasor = os.path.join(self.klasor, ozet[:2])
+        if varyant is None:
+            return os.path.join(klasor, ozet + ".png")
+        return os.path.join(klasor, f"{ozet}.{varyant}{_UZANTILAR[self._bicim(varyant)[1]]}")
+
+    def var_mi(self, ozet: str) -> bool:
+        return os.path.exists(self.yol(ozet))
+
+    @staticmethod
+    def ozet_bul(yol: str) -> Optional[str]:
+        """Depodaki bir dosya yolundan (orijinal veya varyant) içerik özetini çıkarır"""
+        ozet = os.path.basename(yol).split(".", 1)[0]
+        return ozet if _OZET.match(ozet) else None
+
+    def gecici_dosya(self) -> Tuple[int, str]:
+        """Depoya eklenecek görselin yazılacağı geçici dosya (aynı dosya sisteminde)"""
+        os.makedirs(self.klasor, exist_ok=True)
+        return tempfile.mkstemp(dir=self.klasor, prefix=".yaziliyor_")
+
+    def ekle(self, gecici_yol: str) -> str:
+        """
+        Yazılmış bir görsel dosyasını depoya taşır, içerik özetini döndürür.
+
+        Aynı içerik zaten varsa geçici dosya silinir. Varyantlar eksikse üretilir.
+        """
+        ozet = dosya_ozeti(gecici_yol)
+        hedef = self.yol(ozet)
+        os.makedirs(os.path.dirname(hedef), exist_ok=True)
+        if os.path.exists(hedef):
+            os.remove(gecici_yol)
+        else:
+            os.replace(gecici_yol, hedef)
+        self.varyantlari_olustur(ozet)
+        self.temizle(koru=ozet)
+        return ozet
+
+    def varyantlari_olustur(self, ozet: str) -> None:
+        """Eksik varyantları tek bir görsel açılışıyla üretir"""
+        eksikler = [v for v in VARYANTLAR if not os.path.exists(self.yol(ozet, v))]
+        if not eksikler:
+            return
+        with self._lock, PIL.Image.open(self.yol(ozet)) as gorsel:
+            gorsel.load()
+            for varyant in eksikler:
+                kenar, bicim, ayarlar = self._bicim(varyant)
+                cikti = gorsel.convert("RGB")
+                if kenar is not None:
+                    cikti.thumbnail((kenar, kenar), PIL.Image.Resampling.LANCZOS)
+                hedef = self.yol(ozet, varyant)
+                fd, gecici = tempfile.mkstemp(dir=os.path.dirname(hedef), prefix=".yaziliyor_")
+                try:
+                    with os.fdopen(fd, "wb") as f:
+                        cikti.save(f, format=bicim, **ayarlar)
+                    os.replace(gecici, hedef)
+                except BaseException:
+                    if os.path.exists(gecici):
+                        os.remove(gecici)
+                    raise
+
+    def bul(self, ozet: str, varyant: Optional[str] = None) -> Optional[str]:
+        """
+        Görselin (veya varyantının) yolunu döndürür; görsel depoda yoksa None.
+
+        Varyant silinmişse yeniden üretilir.
+        """
+        if not self.var_mi(ozet):
+            return None
+        try:
+            os.utime(self.yol(ozet))  # LRU için son erişim
+        except OSError:
+            return None
+        if varyant is None:
+            return self.yol(ozet)
+        yol = self.yol(ozet, varyant)
+        if not os.path.exists(yol):
+            self.varyantlari_olustur(ozet)
+        return yol
+
+    def _girdiler(self) -> Dict[str, Tuple[float, int, List[str]]]:
+        """Özet -> (PNG'nin son erişimi, PNG + varyantların toplam boyutu, dosyalar)"""
+        girdiler: Dict[str, Tuple[float, int, List[str]]] = {}
+        try:
+            alt_klasorler = [e.path for e in os.scandir(self.klasor) if e.is_dir()]
+        except OSError:
+            return girdiler
+        for alt in alt_klasorler:
+            try:
+                dosyalar = list(os.scandir(alt))
+            except OSError:
+                continue
+            for e in dosyalar:
+                ozet = self.ozet_bul(e.name)
+                if ozet is None or e.name.startswith("."):
+                    continue
+                try:
+                    st = e.stat()
+                except OSError:
+                    continue
+                mtime, boyut, yollar = girdiler.get(ozet, (0.0, 0, []))
+                if e.name == ozet + ".png":
+                    mtime = st.st_mtime
+                girdiler[ozet] = (mtime, boyut + st.st_size, yollar + [e.path])
+        return girdiler
+
+    def toplam_bayt(self) -> int:
+        return sum(boyut for _, boyut, _ in self._girdiler().values())
+
+    def sil(self, ozet: str) -> None:
+        """Görseli ve tüm varyantlarını depodan siler"""
+        klasor = os.path.dirname(self.yol(ozet))
+        try:
+            dosyalar = [e.path for e in os.scandir(klasor) if e.name.split(".", 1)[0] == ozet]
+        except OSError:
+            return
+        # Önce PNG: var_mi yarım silinmiş girdiyi görmesin
+        for yol in sorted(dosyalar, key=lambda y: not y.endswith(".png")):
+            try:
+                os.remove(yol)
+            except OSError:
+                pass
+
+    def temizle(self, koru: Optional[str] = None) -> None:
+        """Depo ``max_bayt``'ı aşıyorsa referansı olmayan en eski erişilen görselleri siler (``koru`` hariç)"""
+        if self.max_bayt is None:
+            return
+        with self._lock:
+            girdiler = self._girdiler()
+            toplam = sum(boyut for _, boyut, _ in girdiler.values())
+            if toplam <= self.max_bayt:
+                return
+            referanslilar = self._referanslilar()
+            # En eski erişilen önce
+            for mtime, boyut, ozet in sorted((m, b, o) for o, (m, b, _) in girdiler.items()):
+                if toplam <= self.max_bayt:
+                    break
+                if ozet == koru or ozet in referanslilar:
+                    continue
+                self.sil(ozet)
+                toplam -= boyut
+
+    def varyant(self, yol: str, varyant: str) -> str:
+        """Bir görsel yolunun varyantını döndürür; depo dışındaki yollar olduğu gibi döner"""
+        ozet = self.ozet_bul(yol)
+        if ozet is None:
+            return yol
+        return self.bul(ozet, varyant) or yol
@@ -0,0 +1,238 @@
+"""
+Kayıt -> transkript -> görsel işleri için kalıcı iş kuyruğu.
+
+İşler SQLite'ta tutulur; Streamlit sayfası yeniden çalışsa, kullanıcı başka
+sayfaya geçse veya uygulama yeniden başlasa da iş durumu ve sonucu kaybolmaz.
+Arka plandaki çalışan thread'ler sıradaki işleri alıp GorselPipeline ile
+yürütür; arayüz ``durum`` / ``listele`` ile durumu sorgular.
+
+Aynı ses içeriği ve ayarlarla henüz bitmemiş bir iş varsa yeni iş açılmaz,
+mevcut işin numarası döner.
+
+Veritabanı birden fazla süreç / kuyruk nesnesi arasında paylaşılabilir. İş
+koşullu bir UPDATE ile atomik olarak üstlenilir; çalışan iş sürdükçe
+``guncelleme`` zamanını yeniler. Yalnızca ``KIRA_SURESI`` boyunca
+yenilenmemiş (sahibi çökmüş) işler yeniden sıraya alınır.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future, wait
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+import painter
+from cache import anahtar_olustur, dosya_ozeti
+from kayit_indeksi import indeks as kayit_indeksi
+from openai_istemci import anahtar_ozeti
+
+# İş durumları
+SIRADA = "sirada"
+TRANSKRIPT = "transkript"
+GORSEL = "gorsel"
+TAMAM = "tamam"
+HATA = "hata"
+
+BITMEMIS = (SIRADA, TRANSKRIPT, GORSEL)
+
+# Süren bir işin guncelleme zamanı bu süre yenilenmezse iş sahipsiz sayılır (saniye)
+KIRA_SURESI = 300.0
+
+_SEMA = """
+CREATE TABLE IF NOT EXISTS isler (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    ses_yolu TEXT NOT NULL,
+    tekrar_anahtari TEXT NOT NULL,
+    anahtar_ozeti TEXT NOT NULL,
+    secenekler TEXT NOT NULL,
+    durum TEXT NOT NULL,
+    transkript TEXT,
+    gorsel TEXT,
+    hata TEXT,
+    olusturma REAL NOT NULL,
+    guncelleme REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS isler_durum ON isler (anahtar_ozeti, durum, id);
+CREATE INDEX IF NOT EXISTS isler_tekrar ON isler (tekrar_anahtari, durum);
+"""
+
+
+@dataclass
+class Is:
+    """Kuyruktaki bir işin anlık durumu"""
+    id: int
+    ses_yolu: str
+    durum: str
+    secenekler: dict
+    transkript: Optional[str]
+    gorsel: Optional[str]
+    hata: Optional[str]
+    olusturma: float
+    guncelleme: float
+
+    @property
+    def bitti(self) -> bool:
+        return self.durum not in BITMEMIS
+
+
+class IsKuyrugu:
+    """
+    Kalıcı iş kuyruğu ve çalışanları.
+
+    Her API anahtarı için bir kuyruk nesnesi oluşturulur; çalışanlar yalnızca
+    o anahtarla eklenmiş işleri alır. Kirası dolmuş (sahibi çökmüş) işler
+    yeniden sıraya alınır; başka bir nesnenin sürdürdüğü işlere dokunulmaz.
+    """
+
+    def __init__(self, pipeline, api_key: str, db_yolu: str = ".cache/isler.db", calisan_sayisi: int = 2,
+                 kira_suresi: float = KIRA_SURESI):
+        self.pipeline = pipeline
+        self.kira_suresi = kira_suresi
+        self.db_yolu = db_yolu
+        self._anahtar = anahtar_ozeti(api_key)
+        self._lock = threading.RLock()
+        self._yeni_is = threading.Event()
+        self._durdur = threading.Event()
+        # Yalnızca bu süreçte geçerli, kalıcı olmayan hazır transkript kaynakları (ör. canlı transkript)
+        self._transkript_kaynaklari: Dict[int, Callable[[], Optional[str]]] = {}
+
+        os.makedirs(os.path.dirname(db_yolu) or ".", exist_ok=True)
+        self._db = sqlite3.connect(db_yolu, check_same_thread=False, timeout=10)
+        self._db.row_factory = sqlite3.Row
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SEMA)
+        with self._lock, self._db:
+            self._sahipsizleri_geri_al()
+
+        self._calisanlar = [threading.Thread(target=self._calis, daemon=True, name=f"is_kuyrugu_{i}")
+                            for i in range(calisan_sayisi)]
+        for calisan in self._calisanlar:
+            calisan.start()
+
+    def ekle(self, ses_yolu: str, transkript_kaynagi: Optional[Callable[[], Optional[str]]] = None,
+             **secenekler) -> int:
+        """
+        İşi sıraya ekler ve numarasını döndürür.
+
+        ``secenekler`` GorselPipeline.gonder'e aynen geçer (use_cache,
+        preprocess, trim_silence). ``transkript_kaynagi`` verilirse çalışan
+        thread'de çağrılır; metin dönerse transkripsiyon atlanır.
+        """
+        secenekler_json = json.dumps(secenekler, sort_keys=True)
+        tekrar_anahtari = anahtar_olustur(dosya_ozeti(ses_yolu), secenekler_json, self._anahtar)
+        simdi = time.time()
+        with self._lock, self._db:
+            onceki = self._db.execute(
+                f"SELECT id FROM isler WHERE tekrar_anahtari = ? AND durum IN ({','.join('?' * len(BITMEMIS))})",
+                (tekrar_anahtari, *BITMEMIS)).fetchone()
+            if onceki is not None:
+                return onceki["id"]
+            is_id = self._db.execute(
+                """INSERT INTO isler (ses_yolu, tekrar_anahtari, anahtar_ozeti, secenekler, durum, olusturma, guncelleme)
+                   VALUES (?, ?, ?, ?, ?, ?, ?)""",
+                (ses_yolu, tekrar_anahtari, self._anahtar, secenekler_json, SIRADA, simdi, simdi)).lastrowid
+            if transkript_kaynagi is not None:
+                self._transkript_kaynaklari[is_id] = transkript_kaynagi
+        self._yeni_is.set()
+        return is_id
+
+    def _is(self, satir: sqlite3.Row) -> Is:
+        return Is(id=satir["id"], ses_yolu=satir["ses_yolu"], durum=satir["durum"],
+                  secenekler=json.loads(satir["secenekler"]), transkript=satir["transkript"],
+                  gorsel=satir["gorsel"], hata=satir["hata"],
+                  olusturma=satir["olusturma"], guncelleme=satir["guncelleme"])
+
+    def durum(self, is_id: int) -> Optional[Is]:
+        with self._lock:
+            satir = self._db.execute("SELECT * FROM isler WHERE id = ?", (is_id,)).fetchone()
+        return self._is(satir) if satir else None
+
+    def listele(self, limit: int = 20) -> List[Is]:
+        """Bu anahtarın en yeni işleri"""
+        with self._lock:
+            satirlar = self._db.execute("SELECT * FROM isler WHERE anahtar_ozeti = ? ORDER BY id DESC LIMIT ?",
+                                        (self._anahtar, limit)).fetchall()
+        return [self._is(satir) for satir in satirlar]
+
+    def _guncelle(self, is_id: int, **alanlar) -> None:
+        alanlar["guncelleme"] = time.time()
+        with self._lock, self._db:
+            self._db.execute(f"UPDATE isler SET {', '.join(f'{ad} = ?' for ad in alanlar)} WHERE id = ?",
+                             (*alanlar.values(), is_id))
+
+    def _sahipsizleri_geri_al(self) -> int:
+        """Kirası dolmuş süren işleri sıraya geri koyar (kilit ve işlem içinde çağrılır)"""
+        simdi = time.time()
+        return self._db.execute(
+            "UPDATE isler SET durum = ?, guncelleme = ? WHERE anahtar_ozeti = ? AND durum IN (?, ?) AND guncelleme < ?",
+            (SIRADA, simdi, self._anahtar, TRANSKRIPT, GORSEL, simdi - self.kira_suresi)).rowcount
+
+    def _al(self) -> Optional[Is]:
+        """
+        Sıradaki ilk işi üstlenir.
+
+        Üstlenme, durum hâlâ SIRADA ise yapılan koşullu bir UPDATE'tir; aynı
+        veritabanını kullanan başka bir süreç işi önce aldıysa sıradakine geçilir.
+        """
+        with self._lock, self._db:
+            self._sahipsizleri_geri_al()
+            while True:
+                satir = self._db.execute(
+                    "SELECT * FROM isler WHERE anahtar_ozeti = ? AND durum = ? ORDER BY id LIMIT 1",
+                    (self._anahtar, SIRADA)).fetchone()
+                if satir is None:
+                    return None
+                if self._db.execute("UPDATE isler SET durum = ?, guncelleme = ? WHERE id = ? AND durum = ?",
+                                    (TRANSKRIPT, time.time(), satir["id"], SIRADA)).rowcount:
+                    return self._is(satir)
+
+    def _bekle(self, is_id: int, future: Future):
+        """Future'ın sonucunu beklerken işin kirasını yeniler"""
+        while not wait([future], timeout=self.kira_suresi / 3).done:
+            self._guncelle(is_id)
+        return future.result()
+
+    def _calis(self) -> None:
+        while not self._durdur.is_set():
+            is_ = self._al()
+            if is_ is None:
+                self._yeni_is.wait(1.0)
+                self._yeni_is.clear()
+                continue
+            self._isle(is_)
+
+    def _isle(self, is_: Is) -> None:
+        try:
+            transkript = None
+            kaynak = self._transkript_kaynaklari.pop(is_.id, None)
+            if kaynak is not None:
+                try:
+                    transkript = kaynak() or None
+                except Exception:
+                    transkript = None  # Kaynak başarısızsa dosyadan transkript edilir
+
+            gorsel_isi = self.pipeline.gonder(is_.ses_yolu, transkript=transkript, **is_.secenekler)
+            transkript = self._bekle(is_.id, gorsel_isi.transkript)
+            self._guncelle(is_.id, durum=GORSEL, transkript=transkript)
+            gorsel = self._bekle(is_.id, gorsel_isi.gorsel)
+            # Tamamlanan iş ve arşiv satırı görsele işaret ettikçe görsel depodan silinmez
+            painter.sabitle(gorsel, f"is:{is_.id}", "kayit:" + os.path.basename(is_.ses_yolu))
+            self._guncelle(is_.id, durum=TAMAM, gorsel=gorsel)
+        except Exception as e:
+            self._guncelle(is_.id, durum=HATA, hata=f"{type(e).__name__}: {e}")
+            return
+
+        try:
+            kayit_indeksi.sonuc_yaz(is_.ses_yolu, transkript=transkript, gorsel=gorsel)
+        except Exception:
+            pass  # İndeks yalnızca arşiv görünümü içindir, iş sonucu kuyrukta kayıtlı
+
+    def kapat(self) -> None:
+        """Çalışanları durdurur (süren işler bitene kadar bekler)"""
+        self._durdur.set()
+        self._yeni_is.set()
+        for calisan in self._calisanlar:
+            calisan.join()
+        self._db.close()
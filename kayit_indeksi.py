@@ -0,0 +1,252 @@
+"""
+kayitlar/ arşivinin SQLite tabanlı meta veri indeksi.
+
+Her kayıt için dosya boyutu / değiştirilme zamanı, ses özellikleri
+(süre, örnekleme hızı, kanal), transkript ve üretilen görseller tutulur.
+Klasör yalnızca değiştiğinde taranır ve yalnızca yeni eklenen dosyaların
+başlığı okunur; listeleme, sıralama ve filtreleme tek
+bir indeksli sorgudur.
+"""
+import os
+import sqlite3
+import struct
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from audio_preprocess import wav_bilgisi
+
+VARSAYILAN_DB = ".kayitlar.db"
+
+# Dışarıdan gelen sıralama adı -> SQL sütunu (SQL enjeksiyonunu önler)
+SIRALAMALAR = {"tarih": "mtime", "ad": "ad", "boyut": "boyut", "sure": "sure"}
+
+_SEMA = """
+CREATE TABLE IF NOT EXISTS kayitlar (
+    ad TEXT PRIMARY KEY,
+    boyut INTEGER NOT NULL,
+    mtime REAL NOT NULL,
+    sure REAL,
+    sample_rate INTEGER,
+    channels INTEGER,
+    ornek_genisligi INTEGER,
+    transkript TEXT,
+    guncelleme REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS kayitlar_mtime ON kayitlar (mtime);
+CREATE INDEX IF NOT EXISTS kayitlar_sure ON kayitlar (sure);
+CREATE INDEX IF NOT EXISTS kayitlar_boyut ON kayitlar (boyut);
+CREATE TABLE IF NOT EXISTS gorseller (
+    kayit TEXT NOT NULL REFERENCES kayitlar (ad) ON DELETE CASCADE,
+    yol TEXT NOT NULL,
+    zaman REAL NOT NULL,
+    PRIMARY KEY (kayit, yol)
+);
+CREATE TABLE IF NOT EXISTS meta (
+    anahtar TEXT PRIMARY KEY,
+    deger TEXT
+);
+"""
+
+
+def _kayit_dosyasi_mi(ad: str) -> bool:
+    """Kaydedilmiş .wav dosyası mı (geçici / gizli dosyalar hariç)"""
+    return ad.endswith(".wav") and not ad.startswith(".")
+
+
+class KayitIndeksi:
+    """
+    Kayıt klasörünün meta veri indeksi.
+
+    Veritabanı klasörün içinde gizli bir dosyada tutulur ve ilk kullanımda
+    açılır. Bağlantı thread'ler arasında paylaşılır (Streamlit her yeniden
+    çalıştırmayı farklı thread'de yapabilir); erişim bir kilitle sıralanır.
+    """
+
+    def __init__(self, klasor: str = "kayitlar", db_yolu: Optional[str] = None):
+        self.klasor = klasor
+        self.db_yolu = db_yolu or os.path.join(klasor, VARSAYILAN_DB)
+        self._lock = threading.RLock()
+        self._baglanti: Optional[sqlite3.Connection] = None
+
+    def _db(self) -> sqlite3.Connection:
+        if self._baglanti is None:
+            os.makedirs(os.path.dirname(self.db_yolu) or ".", exist_ok=True)
+            baglanti = sqlite3.connect(self.db_yolu, check_same_thread=False, timeout=10)
+            baglanti.row_factory = sqlite3.Row
+            # batch.py gibi ayrı süreçler aynı indeksi okurken yazabilsin
+            baglanti.execute("PRAGMA journal_mode=WAL")
+            baglanti.execute("PRAGMA foreign_keys=ON")
+            baglanti.executescript(_SEMA)
+            self._baglanti = baglanti
+        return self._baglanti
+
+    def _meta(self, anahtar: str) -> Optional[str]:
+        satir = self._db().execute("SELECT deger FROM meta WHERE anahtar = ?", (anahtar,)).fetchone()
+        return satir[0] if satir else None
+
+    def _ses_ozellikleri(self, yol: str) -> Dict[str, Any]:
+        try:
+            bilgi = wav_bilgisi(yol)
+        except (OSError, ValueError, struct.error):
+            # Okunamayan / bozuk dosyalar da listelenir, yalnızca ses bilgisi boş kalır
+            return {"sure": None, "sample_rate": None, "channels": None, "ornek_genisligi": None}
+        return {"sure": bilgi.sure, "sample_rate": bilgi.sample_rate,
+                "channels": bilgi.channels, "ornek_genisligi": bilgi.ornek_genisligi}
+
+    def _yaz(self, ad: str, boyut: int, mtime: float) -> None:
+        """Dosyanın ses özelliklerini okuyup satırı ekler / günceller (transkript ve görseller korunur)"""
+        ozellikler = self._ses_ozellikleri(os.path.join(self.klasor, ad))
+        self._db().execute(
+            """INSERT INTO kayitlar (ad, boyut, mtime, sure, sample_rate, channels, ornek_genisligi, guncelleme)
+               VALUES (:ad, :boyut, :mtime, :sure, :sample_rate, :channels, :ornek_genisligi, :guncelleme)
+               ON CONFLICT (ad) DO UPDATE SET
+                   boyut = excluded.boyut, mtime = excluded.mtime, sure = excluded.sure,
+                   sample_rate = excluded.sample_rate, channels = excluded.channels,
+                   ornek_genisligi = excluded.ornek_genisligi, guncelleme = excluded.guncelleme""",
+            dict(ozellikler, ad=ad, boyut=boyut, mtime=mtime, guncelleme=time.time())
+        )
+
+    def senkronize(self, zorla: bool = False) -> int:
+        """
+        İndeksi klasörle eşitler, değişen kayıt sayısını döndürür.
+
+        Klasörün mtime'ı son taramadan beri değişmediyse (dosya eklenmemiş,
+        silinmemiş veya yeniden adlandırılmamışsa) tarama atlanır. Değiştiyse
+        yalnızca dosya adları okunur: klasördeki veritabanı / WAL dosyaları,
+        yazılmakta olan ``.part`` kayıtları gibi gizli dosyalar mtime'ı
+        değiştirse de kayıt adları aynıysa hiçbir dosyaya stat yapılmaz.
+        Yerinde değiştirilen dosyalar için ``zorla=True`` kullanılabilir.
+        """
+        with self._lock:
+            try:
+                klasor_mtime = repr(os.stat(self.klasor).st_mtime_ns)
+            except FileNotFoundError:
+                return 0
+            db = self._db()
+            if not zorla and self._meta("klasor_mtime") == klasor_mtime:
+                return 0
+
+            mevcut = {satir["ad"]: (satir["boyut"], satir["mtime"])
+                      for satir in db.execute("SELECT ad, boyut, mtime FROM kayitlar")}
+            degisen = 0
+            with db:
+                for girdi in os.scandir(self.klasor):
+                    if not _kayit_dosyasi_mi(girdi.name) or not girdi.is_file():
+                        continue
+                    onceki = mevcut.pop(girdi.name, None)
+                    if onceki is not None and not zorla:
+                        continue  # Bilinen kayıt; boyut / mtime yalnızca zorla=True ile denetlenir
+                    try:
+                        st = girdi.stat()
+                    except OSError:
+                        continue
+                    if onceki != (st.st_size, st.st_mtime):
+                        self._yaz(girdi.name, st.st_size, st.st_mtime)
+                        degisen += 1
+                # Klasörde artık olmayanlar
+                if mevcut:
+                    db.executemany("DELETE FROM kayitlar WHERE ad = ?", [(ad,) for ad in mevcut])
+                    degisen += len(mevcut)
+                db.execute("INSERT OR REPLACE INTO meta (anahtar, deger) VALUES ('klasor_mtime', ?)",
+                           (klasor_mtime,))
+            return degisen
+
+    def ekle(self, yol: str) -> None:
+        """Yeni kaydedilen dosyayı tarama beklemeden indekse ekler"""
+        ad = os.path.basename(yol)
+        st = os.stat(yol)
+        with self._lock:
+            with self._db():
+                self._yaz(ad, st.st_size, st.st_mtime)
+
+    def sonuc_yaz(self, yol: str, transkript: Optional[str] = None, gorsel: Optional[str] = None) -> None:
+        """Kaydın transkriptini ve / veya üretilen görsel yolunu kaydeder"""
+        if os.path.abspath(os.path.dirname(yol)) != os.path.abspath(self.klasor):
+            return  # Arşiv dışındaki dosyalar indekslenmez
+        ad = os.path.basename(yol)
+        with self._lock:
+            db = self._db()
+            if db.execute("SELECT 1 FROM kayitlar WHERE ad = ?", (ad,)).fetchone() is None:
+                if not os.path.exists(yol):
+                    return
+                self.ekle(yol)
+            with db:
+                if transkript is not None:
+                    db.execute("UPDATE kayitlar SET transkript = ? WHERE ad = ?", (transkript, ad))
+                if gorsel is not None:
+                    db.execute("INSERT OR REPLACE INTO gorseller (kayit, yol, zaman) VALUES (?, ?, ?)",
+                               (ad, gorsel, time.time()))
+
+    def _filtre(self, arama: Optional[str], min_sure: Optional[float],
+                max_sure: Optional[float]) -> Tuple[str, list]:
+        kosullar, parametreler = [], []
+        if arama:
+            kosullar.append("(ad LIKE ? ESCAPE '\\' OR transkript LIKE ? ESCAPE '\\')")
+            desen = "%" + arama.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+            parametreler += [desen, desen]
+        if min_sure is not None:
+            kosullar.append("sure >= ?")
+            parametreler.append(min_sure)
+        if max_sure is not None:
+            kosullar.append("sure <= ?")
+            parametreler.append(max_sure)
+        return (" WHERE " + " AND ".join(kosullar)) if kosullar else "", parametreler
+
+    def listele(self,
+                siralama: str = "tarih",
+                azalan: bool = True,
+                arama: Optional[str] = None,
+                min_sure: Optional[float] = None,
+                max_sure: Optional[float] = None,
+                limit: Optional[int] = None,
+                offset: int = 0) -> List[Dict[str, Any]]:
+        """
+        Kayıtları tek sorguda filtreleyip sıralar.
+
+        ``arama`` dosya adında ve transkriptte geçen metni arar. Her satır
+        ad, yol, boyut, tarih, süre / ses bilgisi, transkript ve görsel
+        yollarını (en yeni önce) içeren bir sözlüktür.
+        """
+        sutun = SIRALAMALAR.get(siralama)
+        if sutun is None:
+            raise ValueError(f"Geçersiz sıralama: {siralama} ({', '.join(SIRALAMALAR)})")
+        where, parametreler = self._filtre(arama, min_sure, max_sure)
+        sorgu = (f"SELECT k.*, (SELECT group_concat(yol, char(10)) FROM "
+                 f"(SELECT yol FROM gorseller g WHERE g.kayit = k.ad ORDER BY zaman DESC)) AS gorseller "
+                 f"FROM kayitlar k{where} ORDER BY {sutun} {'DESC' if azalan else 'ASC'}, ad")
+        if limit is not None:
+            sorgu += " LIMIT ? OFFSET ?"
+            parametreler += [limit, offset]
+
+        with self._lock:
+            satirlar = self._db().execute(sorgu, parametreler).fetchall()
+        return [{
+            "ad": satir["ad"],
+            "yol": os.path.join(self.klasor, satir["ad"]),
+            "boyut": satir["boyut"],
+            "tarih": datetime.fromtimestamp(satir["mtime"]),
+            "sure": satir["sure"],
+            "sample_rate": satir["sample_rate"],
+            "channels": satir["channels"],
+            "transkript": satir["transkript"],
+            "gorseller": satir["gorseller"].split("\n") if satir["gorseller"] else [],
+        } for satir in satirlar]
+
+    def sayi(self, arama: Optional[str] = None, min_sure: Optional[float] = None,
+             max_sure: Optional[float] = None) -> int:
+        """Filtreye uyan kayıt sayısı"""
+        where, parametreler = self._filtre(arama, min_sure, max_sure)
+        with self._lock:
+            return self._db().execute(f"SELECT COUNT(*) FROM kayitlar{where}", parametreler).fetchone()[0]
+
+    def kapat(self) -> None:
+        with self._lock:
+            if self._baglanti is not None:
+                self._baglanti.close()
+                self._baglanti = None
+
+
+# Uygulama genelinde paylaşılan arşiv indeksi
+indeks = KayitIndeksi("kayitlar")
@@ -0,0 +1,139 @@
+import io
+import threading
+import time
+import wave
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import List, Optional
+
+import numpy as np
+
+import audio_preprocess
+import transcriptor
+from recorder import OrnekDeposu, SesSegmenti
+
+
+def segment_wav(segment: SesSegmenti, preprocess: bool = True) -> bytes:
+    """Ses bölümünü bellekte WAV dosyasına çevirir (isteğe bağlı 16 kHz mono)"""
+    veri, kanal, genislik, sample_rate = segment.veri, segment.channels, segment.ornek_genisligi, segment.sample_rate
+    if preprocess and genislik in OrnekDeposu.VERI_TIPLERI:
+        ornekler = np.frombuffer(veri, dtype=OrnekDeposu.VERI_TIPLERI[genislik]).reshape(-1, kanal)
+        ornekler = audio_preprocess.float_yap(ornekler, genislik)
+        cikis_hz = audio_preprocess.cikis_hizi(sample_rate)
+        sinyal = audio_preprocess.yeniden_ornekle(audio_preprocess.mono_yap(ornekler), sample_rate, cikis_hz)
+        veri, kanal, genislik, sample_rate = audio_preprocess.pcm16(sinyal), 1, 2, cikis_hz
+
+    tampon = io.BytesIO()
+    with wave.open(tampon, 'wb') as wf:
+        wf.setnchannels(kanal)
+        wf.setsampwidth(genislik)
+        wf.setframerate(sample_rate)
+        wf.writeframes(veri)
+    return tampon.getvalue()
+
+
+class CanliTranskriptci:
+    """
+    Kayıt sürerken gelen ses bölümlerini arka planda transkript eder.
+
+    ``SesKaydedici.segment_dinleyici`` olarak ``segment_ekle`` verilir; her
+    bölüm bir thread havuzunda API'ye gönderilir ve kayıt devam ederken
+    ``metin()`` o ana kadar sırayla tamamlanmış bölümlerin metnini döndürür.
+    Kayıt bittiğinde ``bitir()`` yalnızca son bölümlerin bitmesini bekler.
+    """
+
+    def __init__(self, client, languages: str = "tr", model: str = "gpt-4o-mini-transcribe",
+                 preprocess: bool = True, max_workers: int = 2):
+        self.client = client
+        self.languages = languages
+        self.model = model
+        self.preprocess = preprocess
+        self._havuz = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="canli_transkript")
+        self._lock = threading.Lock()
+        self._bolumler: List[Future] = []
+        self._son_geldi = threading.Event()
+        self.gonderilen_bayt = 0
+        self.api_suresi = 0.0
+
+    def segment_ekle(self, segment: SesSegmenti) -> None:
+        """Kayıt thread'inden çağrılır; bölümü kuyruğa ekleyip hemen döner"""
+        if segment.konusma_var and segment.veri:
+            future = self._havuz.submit(self._transkript_et, segment)
+        else:
+            # Sessiz bölümler API'ye gönderilmez, sıra korunur
+            future = Future()
+            future.set_result("")
+        with self._lock:
+            self._bolumler.append(future)
+        if segment.son:
+            self._son_geldi.set()
+
+    def _transkript_et(self, segment: SesSegmenti) -> str:
+        veri = segment_wav(segment, self.preprocess)
+        baslangic = time.perf_counter()
+        try:
+            sonuc = self.client.audio.transcriptions.create(
+                model=self.model,
+                file=(f"bolum_{segment.sira}.wav", veri),
+                language=self.languages
+            )
+        finally:
+            with self._lock:
+                self.gonderilen_bayt += len(veri)
+                self.api_suresi += time.perf_counter() - baslangic
+        return sonuc.text
+
+    def metin(self) -> str:
+        """Baştan itibaren kesintisiz tamamlanmış bölümlerin birleşik metni"""
+        with self._lock:
+            bolumler = list(self._bolumler)
+        metinler = []
+        for future in bolumler:
+            if not future.done():
+                break
+            if future.exception() is None:
+                metinler.append(future.result())
+        return transcriptor._stitch(metinler)
+
+    @property
+    def bekleyen(self) -> int:
+        with self._lock:
+            return sum(1 for future in self._bolumler if not future.done())
+
+    def bitir(self, timeout: Optional[float] = None, dosya_yolu: Optional[str] = None,
+              **onbellek_secenekleri) -> str:
+        """
+        Son bölüm dahil tüm bölümleri bekleyip tam metni döndürür.
+
+        ``timeout`` tüm bekleme için tek bir süre sınırıdır; dolarsa eksik metin
+        döndürmek yerine TimeoutError yükseltilir. Bölüm hatası da yükseltilir.
+        ``dosya_yolu`` verilirse metin o kaydın transkript önbelleğine
+        ``onbellek_secenekleri`` ile (bkz. ``cache_yaz``) yazılır.
+        """
+        son_an = None if timeout is None else time.monotonic() + timeout
+
+        def kalan() -> Optional[float]:
+            return None if son_an is None else max(0.0, son_an - time.monotonic())
+
+        if not self._son_geldi.wait(kalan()):
+            raise TimeoutError("Canlı transkriptin son bölümü süresinde gelmedi")
+        with self._lock:
+            bolumler = list(self._bolumler)
+        try:
+            metin = transcriptor._stitch([future.result(kalan()) for future in bolumler])
+        finally:
+            self._havuz.shutdown(wait=False)
+        if dosya_yolu is not None:
+            self.cache_yaz(dosya_yolu, metin, **onbellek_secenekleri)
+        return metin
+
+    def cache_yaz(self, dosya_yolu: str, metin: str, **secenekler) -> None:
+        """
+        Kaydedilen dosya için metni transkript önbelleğine yazar.
+
+        ``secenekler`` dosyanın sonradan transkript edileceği ayarlardır
+        (ör. ``GorselPipeline.transkript_secenekleri()``); anahtar bunlarla
+        transcriptor'daki ortak yardımcıyla kurulur.
+        """
+        secenekler.setdefault("languages", self.languages)
+        secenekler.setdefault("preprocess", self.preprocess)
+        transcriptor.onbellege_yaz(dosya_yolu, metin, model=self.model, **secenekler)
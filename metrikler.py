@@ -0,0 +1,304 @@
+"""
+Ses -> transkript -> görsel hattının aşama bazında süre ve boyut metrikleri.
+
+transcriptor, painter ve recorder her aşamayı (önbellek araması, ön işleme,
+transkripsiyon isteği, görsel üretimi, görsel indirme / çözme, depoya yazma,
+kayıt başlatma / kaydetme, ...) ``olc`` ile sarar; openai_istemci her isteğin
+hız sınırı ve yeniden deneme beklemesini ayrıca kaydeder. Süreç içinde aşama
+başına şunlar tutulur:
+
+    vocasso_asama_toplam          sayaç (asama, sonuc)
+    vocasso_asama_sure_saniye     histogram (asama, sonuc)
+    vocasso_asama_bayt            histogram (asama), işlenen yük boyutu
+    vocasso_olay_toplam           sayaç (olay), ör. kaybedilen ses chunk'ları
+
+``sonuc`` "tamam" veya "hata"dır; önbellek aşamaları "isabet" / "iska" yazar.
+
+Dışa aktarma:
+    - ``prometheus()`` Prometheus metin biçimini döndürür; ``sunucu_baslat``
+      bunu ``/metrics`` adresinde sunar (``/metrics.json``: ``ozet()``).
+    - ``VOCASSO_METRIK_JSONL`` ortam değişkeni (veya ``jsonl_ac``) bir dosya
+      yolu verirse her ölçüm o dosyaya bir JSON satırı olarak eklenir.
+    - ``python metrikler.py olcumler.jsonl`` JSON satırlarından aşama başına
+      kesin p50 / p95 / p99 raporu çıkarır.
+"""
+import argparse
+import bisect
+import json
+import math
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# Histogram kova üst sınırları; son kova +Inf
+SURE_KOVALARI = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+BAYT_KOVALARI = tuple(1024 * 4 ** i for i in range(10))  # 1 KB ... 256 MB
+
+
+class Histogram:
+    """Prometheus tarzı sabit kovalı histogram (thread-safe değil, kilidi sahibi tutar)"""
+
+    def __init__(self, sinirlar: Tuple[float, ...]):
+        self.sinirlar = sinirlar
+        self.kovalar = [0] * (len(sinirlar) + 1)
+        self.toplam = 0.0
+        self.adet = 0
+
+    def gozlem(self, deger: float) -> None:
+        self.kovalar[bisect.bisect_left(self.sinirlar, deger)] += 1
+        self.toplam += deger
+        self.adet += 1
+
+    def birlestir(self, diger: "Histogram") -> None:
+        for i, sayi in enumerate(diger.kovalar):
+            self.kovalar[i] += sayi
+        self.toplam += diger.toplam
+        self.adet += diger.adet
+
+    def yuzdelik(self, q: float) -> Optional[float]:
+        """
+        Kovalardan doğrusal ara değerlemeyle q. yüzdelik (Prometheus histogram_quantile gibi).
+
+        Değer +Inf kovasına düşerse en büyük sonlu sınır döner.
+        """
+        if not self.adet:
+            return None
+        hedef = q * self.adet
+        birikimli = 0
+        for i, sayi in enumerate(self.kovalar):
+            if birikimli + sayi >= hedef and sayi:
+                if i == len(self.sinirlar):
+                    return self.sinirlar[-1]
+                alt = self.sinirlar[i - 1] if i else 0.0
+                return alt + (self.sinirlar[i] - alt) * (hedef - birikimli) / sayi
+            birikimli += sayi
+        return self.sinirlar[-1]
+
+
+@dataclass
+class Olcum:
+    """``olc`` bloğunun içinden doldurulabilen ölçüm alanları"""
+    asama: str
+    bayt: Optional[int] = None
+    sonuc: str = "tamam"
+
+
+def _etiket(deger: str) -> str:
+    return deger.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _sayi(deger: float) -> str:
+    return "+Inf" if deger == float("inf") else repr(float(deger))
+
+
+class AsamaMetrikleri:
+    """Aşama sayaçları ve histogramları; isteğe bağlı JSON lines çıktısı"""
+
+    def __init__(self, jsonl_yolu: Optional[str] = None):
+        self._lock = threading.Lock()
+        self._sureler: Dict[Tuple[str, str], Histogram] = {}
+        self._baytlar: Dict[str, Histogram] = {}
+        self._olaylar: Dict[str, float] = {}
+        self._jsonl = None
+        if jsonl_yolu:
+            self.jsonl_ac(jsonl_yolu)
+
+    def jsonl_ac(self, yol: Optional[str]) -> None:
+        """Ölçümleri ``yol`` dosyasına JSON satırları olarak eklemeye başlar (None: kapatır)"""
+        with self._lock:
+            if self._jsonl is not None:
+                self._jsonl.close()
+                self._jsonl = None
+            if yol:
+                os.makedirs(os.path.dirname(yol) or ".", exist_ok=True)
+                self._jsonl = open(yol, "a", encoding="utf-8", buffering=1)
+
+    def _jsonl_yaz(self, kayit: dict) -> None:
+        if self._jsonl is not None:
+            self._jsonl.write(json.dumps(kayit, ensure_ascii=False) + "\n")
+
+    def kaydet(self, asama: str, sure: float, bayt: Optional[int] = None, sonuc: str = "tamam") -> None:
+        """Süresi başka yerde ölçülmüş bir aşamayı kaydeder"""
+        with self._lock:
+            histogram = self._sureler.get((asama, sonuc))
+            if histogram is None:
+                histogram = self._sureler[(asama, sonuc)] = Histogram(SURE_KOVALARI)
+            histogram.gozlem(sure)
+            if bayt is not None:
+                if asama not in self._baytlar:
+                    self._baytlar[asama] = Histogram(BAYT_KOVALARI)
+                self._baytlar[asama].gozlem(bayt)
+            self._jsonl_yaz({"zaman": round(time.time(), 3), "asama": asama, "sure_s": round(sure, 6),
+                             "bayt": bayt, "sonuc": sonuc})
+
+    @contextmanager
+    def olc(self, asama: str, bayt: Optional[int] = None) -> Iterator[Olcum]:
+        """
+        Bloğun süresini ``asama`` olarak kaydeder.
+
+        Blok istisnayla biterse sonuç "hata" olur; blok içinde ``bayt`` veya
+        ``sonuc`` (ör. önbellek isabeti) atanabilir.
+        """
+        olcum = Olcum(asama, bayt)
+        baslangic = time.perf_counter()
+        try:
+            yield olcum
+        except BaseException:
+            olcum.sonuc = "hata"
+            raise
+        finally:
+            self.kaydet(asama, time.perf_counter() - baslangic, olcum.bayt, olcum.sonuc)
+
+    def say(self, olay: str, artis: float = 1) -> None:
+        """Süresi olmayan bir olay sayacını artırır"""
+        if not artis:
+            return
+        with self._lock:
+            self._olaylar[olay] = self._olaylar.get(olay, 0) + artis
+            self._jsonl_yaz({"zaman": round(time.time(), 3), "olay": olay, "artis": artis})
+
+    def ozet(self) -> Dict[str, dict]:
+        """Aşama başına adet, hata sayısı, p50 / p95 süre (kovalardan tahmini) ve ortalama boyut"""
+        with self._lock:
+            asamalar: Dict[str, Histogram] = {}
+            hatalar: Dict[str, int] = {}
+            for (asama, sonuc), histogram in self._sureler.items():
+                asamalar.setdefault(asama, Histogram(SURE_KOVALARI)).birlestir(histogram)
+                if sonuc == "hata":
+                    hatalar[asama] = hatalar.get(asama, 0) + histogram.adet
+            baytlar = {asama: h.toplam / h.adet for asama, h in self._baytlar.items() if h.adet}
+        return {
+            asama: {
+                "adet": h.adet,
+                "hata": hatalar.get(asama, 0),
+                "p50_s": h.yuzdelik(0.5),
+                "p95_s": h.yuzdelik(0.95),
+                "ort_s": h.toplam / h.adet,
+                "ort_bayt": baytlar.get(asama),
+            }
+            for asama, h in sorted(asamalar.items())
+        }
+
+    def prometheus(self) -> str:
+        """Tüm metrikleri Prometheus metin biçiminde (0.0.4) döndürür"""
+        satirlar: List[str] = []
+
+        def histogram_yaz(ad: str, etiketler: str, h: Histogram) -> None:
+            birikimli = 0
+            for sinir, sayi in zip(h.sinirlar + (float("inf"),), h.kovalar):
+                birikimli += sayi
+                satirlar.append(f'{ad}_bucket{{{etiketler},le="{_sayi(sinir)}"}} {birikimli}')
+            satirlar.append(f"{ad}_sum{{{etiketler}}} {_sayi(h.toplam)}")
+            satirlar.append(f"{ad}_count{{{etiketler}}} {h.adet}")
+
+        with self._lock:
+            sureler = sorted(self._sureler.items())
+            satirlar += ["# HELP vocasso_asama_toplam Tamamlanan aşama sayısı",
+                         "# TYPE vocasso_asama_toplam counter"]
+            for (asama, sonuc), h in sureler:
+                satirlar.append(f'vocasso_asama_toplam{{asama="{_etiket(asama)}",sonuc="{_etiket(sonuc)}"}} {h.adet}')
+
+            satirlar += ["# HELP vocasso_asama_sure_saniye Aşama süresi",
+                         "# TYPE vocasso_asama_sure_saniye histogram"]
+            for (asama, sonuc), h in sureler:
+                histogram_yaz("vocasso_asama_sure_saniye", f'asama="{_etiket(asama)}",sonuc="{_etiket(sonuc)}"', h)
+
+            satirlar += ["# HELP vocasso_asama_bayt Aşamada işlenen yük boyutu",
+                         "# TYPE vocasso_asama_bayt histogram"]
+            for asama, h in sorted(self._baytlar.items()):
+                histogram_yaz("vocasso_asama_bayt", f'asama="{_etiket(asama)}"', h)
+
+            satirlar += ["# HELP vocasso_olay_toplam Olay sayacı",
+                         "# TYPE vocasso_olay_toplam counter"]
+            for olay, sayi in sorted(self._olaylar.items()):
+                satirlar.append(f'vocasso_olay_toplam{{olay="{_etiket(olay)}"}} {sayi}')
+        return "\n".join(satirlar) + "\n"
+
+
+# Süreç genelindeki varsayılan metrikler
+varsayilan = AsamaMetrikleri(os.environ.get("VOCASSO_METRIK_JSONL"))
+
+olc = varsayilan.olc
+kaydet = varsayilan.kaydet
+say = varsayilan.say
+ozet = varsayilan.ozet
+prometheus = varsayilan.prometheus
+jsonl_ac = varsayilan.jsonl_ac
+
+
+class MetrikHandler(BaseHTTPRequestHandler):
+    metrikler = varsayilan
+
+    def do_GET(self):
+        if self.path == "/metrics":
+            govde = self.metrikler.prometheus().encode("utf-8")
+            tur = "text/plain; version=0.0.4; charset=utf-8"
+        elif self.path == "/metrics.json":
+            govde = json.dumps(self.metrikler.ozet(), ensure_ascii=False).encode("utf-8")
+            tur = "application/json"
+        else:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", tur)
+        self.send_header("Content-Length", str(len(govde)))
+        self.end_headers()
+        self.wfile.write(govde)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def sunucu_baslat(port: int = 0, adres: str = "127.0.0.1") -> ThreadingHTTPServer:
+    """``/metrics`` sunucusunu arka plan thread'inde başlatır; adres server.server_address'tedir"""
+    sunucu = ThreadingHTTPServer((adres, port), MetrikHandler)
+    threading.Thread(target=sunucu.serve_forever, daemon=True, name="metrik_sunucusu").start()
+    return sunucu
+
+
+def _yuzdelik(sirali: List[float], q: float) -> float:
+    """En yakın sıra yöntemiyle kesin yüzdelik"""
+    return sirali[max(0, math.ceil(q * len(sirali)) - 1)]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="JSON lines metrik dosyasından aşama başına yüzdelik raporu")
+    parser.add_argument("dosya", help="VOCASSO_METRIK_JSONL ile yazılmış dosya")
+    parser.add_argument("--asama", default="", help="Yalnızca bu önekle başlayan aşamalar")
+    args = parser.parse_args(argv)
+
+    sureler: Dict[str, List[float]] = {}
+    baytlar: Dict[str, List[int]] = {}
+    hatalar: Dict[str, int] = {}
+    with open(args.dosya, encoding="utf-8") as f:
+        for satir in f:
+            try:
+                kayit = json.loads(satir)
+            except ValueError:
+                continue  # Yarım yazılmış son satır
+            asama = kayit.get("asama")
+            if not asama or not asama.startswith(args.asama):
+                continue
+            sureler.setdefault(asama, []).append(kayit["sure_s"])
+            if kayit.get("bayt") is not None:
+                baytlar.setdefault(asama, []).append(kayit["bayt"])
+            if kayit.get("sonuc") == "hata":
+                hatalar[asama] = hatalar.get(asama, 0) + 1
+
+    print(f"{'aşama':<30}{'adet':>7}{'hata':>6}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'ort KB':>10}")
+    for asama in sorted(sureler):
+        sirali = sorted(sureler[asama])
+        ort_kb = f"{sum(baytlar[asama]) / len(baytlar[asama]) / 1024:.1f}" if asama in baytlar else "-"
+        print(f"{asama:<30}{len(sirali):>7}{hatalar.get(asama, 0):>6}"
+              f"{_yuzdelik(sirali, 0.5) * 1000:>10.1f}{_yuzdelik(sirali, 0.95) * 1000:>10.1f}"
+              f"{_yuzdelik(sirali, 0.99) * 1000:>10.1f}{ort_kb:>10}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
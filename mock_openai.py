@@ -0,0 +1,129 @@
+"""
+Yerel test için OpenAI API taklidi (transkripsiyon ve görsel üretimi).
+
+Gerçek API'ye istek atmadan batch / pipeline akışlarını denemek içindir:
+
+    python mock_openai.py --port 8765 --gecikme 0.5
+    python batch.py --base-url http://127.0.0.1:8765/v1 --api-key test
+"""
+import argparse
+import base64
+import json
+import struct
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def _png(genislik: int = 8, yukseklik: int = 8) -> bytes:
+    """Tek renkli küçük bir PNG üretir (Pillow gerektirmez)"""
+    def parca(tur: bytes, veri: bytes) -> bytes:
+        return (struct.pack(">I", len(veri)) + tur + veri +
+                struct.pack(">I", zlib.crc32(tur + veri) & 0xffffffff))
+
+    satir = b"\x00" + b"\x80\x40\xc0" * genislik
+    return (b"\x89PNG\r\n\x1a\n" +
+            parca(b"IHDR", struct.pack(">IIBBBBB", genislik, yukseklik, 8, 2, 0, 0, 0)) +
+            parca(b"IDAT", zlib.compress(satir * yukseklik)) +
+            parca(b"IEND", b""))
+
+
+class MockAyarlari:
+    gecikme = 0.0          # Her isteğe eklenen yanıt süresi (saniye)
+    hiz_siniri_orani = 0.0  # İsteklerin bu oranı 429 ile reddedilir
+    retry_after = 1.0      # 429 yanıtlarındaki Retry-After (saniye)
+    png = _png()
+
+
+class MockOpenAIHandler(BaseHTTPRequestHandler):
+    sayaclar = {}
+    _lock = threading.Lock()
+    _istek_no = 0
+
+    def log_message(self, format, *args):
+        pass
+
+    def _json(self, kod: int, govde: dict, basliklar: dict = None) -> None:
+        veri = json.dumps(govde).encode("utf-8")
+        self.send_response(kod)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(veri)))
+        for ad, deger in (basliklar or {}).items():
+            self.send_header(ad, deger)
+        self.end_headers()
+        self.wfile.write(veri)
+
+    def do_POST(self):
+        uzunluk = int(self.headers.get("Content-Length", 0))
+        govde = self.rfile.read(uzunluk)
+
+        with self._lock:
+            MockOpenAIHandler._istek_no += 1
+            istek_no = MockOpenAIHandler._istek_no
+            self.sayaclar[self.path] = self.sayaclar.get(self.path, 0) + 1
+
+        if MockAyarlari.gecikme:
+            time.sleep(MockAyarlari.gecikme)
+
+        # Deterministik 429 enjeksiyonu: her 1/oran istekten biri reddedilir
+        oran = MockAyarlari.hiz_siniri_orani
+        if oran > 0 and istek_no % max(1, round(1 / oran)) == 0:
+            self._json(429, {"error": {"message": "Rate limit exceeded", "type": "requests",
+                                       "code": "rate_limit_exceeded"}},
+                       {"Retry-After": str(MockAyarlari.retry_after)})
+            return
+
+        if self.path.endswith("/audio/transcriptions"):
+            self._json(200, {"text": f"mock transkript ({len(govde)} bayt)"})
+        elif self.path.endswith("/images/generations"):
+            istek = json.loads(govde or b"{}")
+            veri = {"revised_prompt": istek.get("prompt")}
+            if istek.get("response_format") == "url":
+                veri["url"] = f"http://{self.headers['Host']}/mock/image.png"
+            else:
+                veri["b64_json"] = base64.b64encode(MockAyarlari.png).decode("ascii")
+            self._json(200, {"created": int(time.time()), "data": [veri]})
+        else:
+            self._json(404, {"error": {"message": f"Bilinmeyen uç nokta: {self.path}"}})
+
+    def do_GET(self):
+        if self.path == "/mock/image.png":
+            self.send_response(200)
+            self.send_header("Content-Type", "image/png")
+            self.send_header("Content-Length", str(len(MockAyarlari.png)))
+            self.end_headers()
+            self.wfile.write(MockAyarlari.png)
+        else:
+            self._json(404, {"error": {"message": f"Bilinmeyen uç nokta: {self.path}"}})
+
+
+def sunucu_baslat(port: int = 0) -> ThreadingHTTPServer:
+    """Mock sunucuyu arka plan thread'inde başlatır; adres server.server_address'tedir"""
+    sunucu = ThreadingHTTPServer(("127.0.0.1", port), MockOpenAIHandler)
+    threading.Thread(target=sunucu.serve_forever, daemon=True).start()
+    return sunucu
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Yerel OpenAI API taklidi")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--gecikme", type=float, default=0.0, help="Yanıt gecikmesi (saniye)")
+    parser.add_argument("--hiz-siniri-orani", type=float, default=0.0, help="429 dönen isteklerin oranı")
+    parser.add_argument("--retry-after", type=float, default=1.0)
+    args = parser.parse_args()
+
+    MockAyarlari.gecikme = args.gecikme
+    MockAyarlari.hiz_siniri_orani = args.hiz_siniri_orani
+    MockAyarlari.retry_after = args.retry_after
+
+    sunucu = ThreadingHTTPServer(("127.0.0.1", args.port), MockOpenAIHandler)
+    print(f"Mock OpenAI: http://127.0.0.1:{args.port}/v1")
+    try:
+        sunucu.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,304 @@
+"""
+Süreç genelinde paylaşılan, hız sınırına duyarlı OpenAI istemcileri.
+
+Aynı API anahtarını kullanan tüm oturumlar, pipeline'lar ve thread'ler tek
+bir sınırlayıcıyı paylaşır. Sınırlayıcı her uç nokta (transkripsiyon, görsel)
+için ayrı bir token bucket ve eşzamanlı istek sınırı tutar. Geçici hata
+yanıtlarında isteği Retry-After'a uyarak, yoksa jitter'lı üstel bekleme ile
+yeniden dener. Transkripsiyon ve görsel üretimi gibi POST istekleri
+idempotent değildir: sunucu isteği işleyip 500 / 502 dönmüş olabilir, yeniden
+denemek iki kez ücretlendirir. Bu yüzden POST'lar yalnızca isteğin
+işlenmediği belli olduğunda (408 / 429 / 503 veya bağlantı kurulamadan
+alınan hata) yeniden denenir. 429 alındığında o uç noktanın tüm istekleri bekleme süresi
+dolana kadar durdurulur, böylece reddedilen istek fırtınası oluşmaz.
+
+Sınırlama httpx transport katmanında yapıldığı için istemciler SDK'nın kendi
+yeniden denemesi kapalı (``max_retries=0``) olarak oluşturulur.
+
+Taklit sunucuyla denemek için:
+
+    python mock_openai.py --hiz-siniri-orani 0.3 --retry-after 0.2
+    python batch.py --base-url http://127.0.0.1:8765/v1 --api-key test --yeniden
+"""
+import asyncio
+import hashlib
+import random
+import threading
+import time
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional, Tuple
+
+import httpx
+from openai import AsyncOpenAI, OpenAI
+
+import metrikler
+
+
+@dataclass
+class UcNoktaLimiti:
+    """Bir uç nokta için saniyedeki istek hızı, ani artış kapasitesi ve eşzamanlı istek sınırı"""
+    hiz: float
+    kapasite: float
+    eszamanli: int
+
+
+# Yol sonekine göre sınırlar; eşleşmeyen uç noktalar "varsayilan"ı kullanır
+LIMITLER: Dict[str, UcNoktaLimiti] = {
+    "/audio/transcriptions": UcNoktaLimiti(hiz=50 / 60, kapasite=10, eszamanli=8),
+    "/images/generations": UcNoktaLimiti(hiz=15 / 60, kapasite=4, eszamanli=4),
+    "varsayilan": UcNoktaLimiti(hiz=1.0, kapasite=10, eszamanli=8),
+}
+
+MAX_DENEME = 5
+TABAN_BEKLEME = 0.5
+MAX_BEKLEME = 30.0
+# Idempotent (GET vb.) isteklerde yeniden denenen durum kodları
+YENIDEN_DENENECEK = {408, 409, 429, 500, 502, 503, 504}
+# İdempotent olmayan isteklerde yalnızca isteğin işlenmediğini bildiren kodlar
+YENIDEN_DENENECEK_POST = {408, 429, 503}
+IDEMPOTENT_YONTEMLER = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+# İstek sunucuya ulaşmadan oluşan bağlantı hataları
+_GONDERILMEDEN = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+# Slot beklerken yoklama aralığı (saniye)
+_YOKLAMA = 0.02
+
+
+class TokenKovasi:
+    """Thread-safe token bucket + eşzamanlı istek sayacı + 429 sonrası ortak bekleme"""
+
+    def __init__(self, limit: UcNoktaLimiti, ad: str = "varsayilan"):
+        self.limit = limit
+        self.ad = ad
+        self._tokenler = float(limit.kapasite)
+        self._son = time.monotonic()
+        self._ucusta = 0
+        self._bekle_until = 0.0
+        self._lock = threading.Lock()
+        self.reddedilen = 0
+
+    def dene(self) -> float:
+        """Slot ve token alınabildiyse 0, yoksa tekrar denemeden önce beklenecek süre"""
+        with self._lock:
+            simdi = time.monotonic()
+            if simdi < self._bekle_until:
+                return self._bekle_until - simdi
+            self._tokenler = min(self.limit.kapasite, self._tokenler + (simdi - self._son) * self.limit.hiz)
+            self._son = simdi
+            if self._ucusta >= self.limit.eszamanli:
+                return _YOKLAMA
+            if self._tokenler < 1.0:
+                return (1.0 - self._tokenler) / self.limit.hiz
+            self._tokenler -= 1.0
+            self._ucusta += 1
+            return 0.0
+
+    def birak(self) -> None:
+        with self._lock:
+            self._ucusta -= 1
+
+    def duraklat(self, sure: float) -> None:
+        """Hız sınırı yanıtından sonra bu uç noktadaki tüm istekleri bekletir"""
+        with self._lock:
+            self.reddedilen += 1
+            self._bekle_until = max(self._bekle_until, time.monotonic() + sure)
+
+    @property
+    def ucusta(self) -> int:
+        return self._ucusta
+
+
+class Sinirlayici:
+    """Bir API anahtarının tüm uç noktalarının kovaları"""
+
+    def __init__(self):
+        self._kovalar: Dict[str, TokenKovasi] = {}
+        self._lock = threading.Lock()
+        self.yeniden_deneme = 0
+
+    def kova(self, yol: str) -> TokenKovasi:
+        ad = next((u for u in LIMITLER if u != "varsayilan" and yol.endswith(u)), "varsayilan")
+        with self._lock:
+            if ad not in self._kovalar:
+                self._kovalar[ad] = TokenKovasi(LIMITLER[ad], ad)
+            return self._kovalar[ad]
+
+    def istatistikler(self) -> Dict[str, dict]:
+        with self._lock:
+            return {ad: {"ucusta": k.ucusta, "reddedilen": k.reddedilen} for ad, k in self._kovalar.items()}
+
+
+def _retry_after(response: httpx.Response) -> Optional[float]:
+    """Retry-After-Ms / Retry-After (saniye veya HTTP tarihi) başlığını saniyeye çevirir"""
+    ms = response.headers.get("retry-after-ms")
+    if ms:
+        try:
+            return float(ms) / 1000.0
+        except ValueError:
+            pass
+    deger = response.headers.get("retry-after")
+    if not deger:
+        return None
+    try:
+        return float(deger)
+    except ValueError:
+        try:
+            return max(0.0, parsedate_to_datetime(deger).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+
+def _bekleme(deneme: int, response: Optional[httpx.Response]) -> float:
+    """Sunucunun istediği süre, yoksa tam jitter'lı üstel bekleme"""
+    if response is not None:
+        sure = _retry_after(response)
+        if sure is not None:
+            return min(sure, MAX_BEKLEME) + random.uniform(0, TABAN_BEKLEME / 2)
+    return random.uniform(0, min(MAX_BEKLEME, TABAN_BEKLEME * (2 ** deneme)))
+
+
+def _yeniden_denenir(request: httpx.Request, response: Optional[httpx.Response] = None,
+                     hata: Optional[httpx.TransportError] = None) -> bool:
+    """Yanıt / hata sonrası isteğin yeniden gönderilmesi güvenli ve anlamlı mı"""
+    idempotent = request.method in IDEMPOTENT_YONTEMLER
+    if hata is not None:
+        return idempotent or isinstance(hata, _GONDERILMEDEN)
+    return response.status_code in (YENIDEN_DENENECEK if idempotent else YENIDEN_DENENECEK_POST)
+
+
+def _asama_adi(uc_nokta: str) -> str:
+    """Uç nokta yolunu metrik adına çevirir: /images/generations -> images.generations"""
+    return uc_nokta.strip("/").replace("/", ".")
+
+
+def _bekleme_kaydet(kova: TokenKovasi, beklenen: float) -> None:
+    """İsteğin sınırlayıcıda ve yeniden deneme aralarında beklediği toplam süre"""
+    metrikler.kaydet(f"limit.{_asama_adi(kova.ad)}", beklenen)
+
+
+class SinirliTransport(httpx.BaseTransport):
+    """Senkron istemci için sınırlama ve yeniden deneme yapan transport"""
+
+    def __init__(self, sinirlayici: Sinirlayici, ic: Optional[httpx.BaseTransport] = None):
+        self.sinirlayici = sinirlayici
+        self.ic = ic or httpx.HTTPTransport(limits=httpx.Limits(max_connections=32, max_keepalive_connections=16))
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        kova = self.sinirlayici.kova(request.url.path)
+        beklenen = 0.0
+        for deneme in range(MAX_DENEME):
+            while (bekle := kova.dene()) > 0:
+                time.sleep(bekle)
+                beklenen += bekle
+            response = None
+            try:
+                response = self.ic.handle_request(request)
+            except httpx.TransportError as e:
+                if deneme == MAX_DENEME - 1 or not _yeniden_denenir(request, hata=e):
+                    raise
+            finally:
+                kova.birak()
+
+            if response is not None and (deneme == MAX_DENEME - 1 or not _yeniden_denenir(request, response)):
+                _bekleme_kaydet(kova, beklenen)
+                return response
+            sure = _bekleme(deneme, response)
+            if response is not None:
+                if response.status_code == 429:
+                    kova.duraklat(sure)
+                response.close()
+            self.sinirlayici.yeniden_deneme += 1
+            metrikler.say(f"yeniden_deneme.{_asama_adi(kova.ad)}")
+            time.sleep(sure)
+            beklenen += sure
+        raise RuntimeError("ulaşılamaz")
+
+    def close(self) -> None:
+        self.ic.close()
+
+
+class AsyncSinirliTransport(httpx.AsyncBaseTransport):
+    """Asenkron istemci için aynı kovaları kullanan transport"""
+
+    def __init__(self, sinirlayici: Sinirlayici, ic: Optional[httpx.AsyncBaseTransport] = None):
+        self.sinirlayici = sinirlayici
+        self.ic = ic or httpx.AsyncHTTPTransport(limits=httpx.Limits(max_connections=32, max_keepalive_connections=16))
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        kova = self.sinirlayici.kova(request.url.path)
+        beklenen = 0.0
+        for deneme in range(MAX_DENEME):
+            while (bekle := kova.dene()) > 0:
+                await asyncio.sleep(bekle)
+                beklenen += bekle
+            response = None
+            try:
+                response = await self.ic.handle_async_request(request)
+            except httpx.TransportError as e:
+                if deneme == MAX_DENEME - 1 or not _yeniden_denenir(request, hata=e):
+                    raise
+            finally:
+                kova.birak()
+
+            if response is not None and (deneme == MAX_DENEME - 1 or not _yeniden_denenir(request, response)):
+                _bekleme_kaydet(kova, beklenen)
+                return response
+            sure = _bekleme(deneme, response)
+            if response is not None:
+                if response.status_code == 429:
+                    kova.duraklat(sure)
+                await response.aclose()
+            self.sinirlayici.yeniden_deneme += 1
+            metrikler.say(f"yeniden_deneme.{_asama_adi(kova.ad)}")
+            await asyncio.sleep(sure)
+            beklenen += sure
+        raise RuntimeError("ulaşılamaz")
+
+    async def aclose(self) -> None:
+        await self.ic.aclose()
+
+
+def anahtar_ozeti(api_key: str) -> str:
+    return hashlib.sha256((api_key or "").encode("utf-8")).hexdigest()[:16]
+
+
+_sinirlayicilar: Dict[str, Sinirlayici] = {}
+_istemciler: Dict[Tuple[str, Optional[str]], OpenAI] = {}
+_lock = threading.Lock()
+
+
+def sinirlayici(api_key: str) -> Sinirlayici:
+    """API anahtarının süreç genelindeki sınırlayıcısı"""
+    ozet = anahtar_ozeti(api_key)
+    with _lock:
+        if ozet not in _sinirlayicilar:
+            _sinirlayicilar[ozet] = Sinirlayici()
+        return _sinirlayicilar[ozet]
+
+
+def istemci(api_key: str, base_url: Optional[str] = None) -> OpenAI:
+    """Anahtar (ve adres) başına tek, bağlantı havuzlu senkron istemci"""
+    anahtar = (anahtar_ozeti(api_key), base_url)
+    with _lock:
+        onceki = _istemciler.get(anahtar)
+    if onceki is not None:
+        return onceki
+    yeni = OpenAI(api_key=api_key, base_url=base_url, max_retries=0,
+                  http_client=httpx.Client(transport=SinirliTransport(sinirlayici(api_key)),
+                                           timeout=httpx.Timeout(600.0, connect=10.0)))
+    with _lock:
+        return _istemciler.setdefault(anahtar, yeni)
+
+
+def async_istemci(api_key: str, base_url: Optional[str] = None) -> AsyncOpenAI:
+    """
+    Aynı anahtarın ortak sınırlayıcısını kullanan asenkron istemci.
+
+    httpx'in asenkron bağlantı havuzu tek bir event loop'a bağlı olduğundan
+    her çağrı yeni bir istemci döndürür; istemciyi kullanacak loop başına
+    (ör. GorselPipeline başına) bir kez oluşturulmalıdır.
+    """
+    return AsyncOpenAI(api_key=api_key, base_url=base_url, max_retries=0,
+                       http_client=httpx.AsyncClient(transport=AsyncSinirliTransport(sinirlayici(api_key)),
+                                                     timeout=httpx.Timeout(600.0, connect=10.0)))
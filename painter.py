@@ -1,35 +1,200 @@
-from openai import OpenAI
+import openai_istemci
+import metrikler
 import PIL.Image,os,requests
-from io import BytesIO
-from datetime import datetime
+import asyncio,base64,logging,time,unicodedata
+from collections import deque
+from requests.adapters import HTTPAdapter
+from cache import DiskCache, anahtar_olustur
+from gorsel_deposu import GorselDeposu
+
+logger = logging.getLogger(__name__)
 
 client=None
 def set_OpenAI_api_key(api_key):
     global client
-    client = OpenAI(api_key=api_key)
+    # Aynı anahtar için süreç genelinde tek, hız sınırına duyarlı istemci
+    client = openai_istemci.istemci(api_key)
     return client
 
-def generate_image(promt,client):
-    result = client.images.generate(
-        model="dall-e-3",
-        prompt=promt,
-        size="1024x1024",
-        response_format="url",
-        n=1,
-        quality="hd"
-    )
+def create_async_client(api_key, base_url=None):
+    return openai_istemci.async_istemci(api_key, base_url)
+
+# Üretilen tüm görseller içerik özetine göre tek kopya olarak saklanır.
+# Bayt sınırı PNG'leri ve varyantlarını birlikte kapsar.
+gorsel_deposu = GorselDeposu("./img/store", max_bayt=500 * 1024 * 1024)
+
+def _ref_silindi(anahtar, yol):
+    """Önbellekten düşen girdinin referansı bırakılır; görselin son referansıysa görsel de silinir"""
+    try:
+        with open(yol, "rb") as f:
+            ozet = f.read().decode("ascii")
+    except (OSError, UnicodeDecodeError):
+        return
+    if gorsel_deposu.ozet_bul(ozet):
+        gorsel_deposu.referans_birak(ozet, "onbellek:" + anahtar)
+
+def sabitle(yol, *sahipler):
+    """Depodaki görseli verilen sahipler (ör. "is:12", "kayit:a.wav") adına referanslar"""
+    ozet = gorsel_deposu.ozet_bul(yol) if yol else None
+    if ozet is not None:
+        for sahip in sahipler:
+            gorsel_deposu.referans_ekle(ozet, sahip)
+
+# Aynı prompt / model / boyut / kalite için görsel tekrar üretilmez.
+# Önbellek yalnızca görselin depodaki içerik özetini tutar.
+gorsel_cache = DiskCache(
+    "./img/cache",
+    uzanti=".ref",
+    max_girdi=2000,
+    silme_dinleyici=_ref_silindi
+)
+
+# URL modunda görsel indirmeleri için paylaşılan, bağlantı havuzlu oturum
+http_session = requests.Session()
+http_session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
+
+# base64 çözme ve indirme blok boyutları (base64 bloğu 4'ün katı olmalı)
+B64_BLOK = 4 * 64 * 1024
+INDIRME_BLOGU = 64 * 1024
+
+# Son görsellerin zamanlama ölçümleri (en yeni sonda)
+olcumler = deque(maxlen=100)
+
+def normalize_prompt(promt):
+    promt = unicodedata.normalize("NFC", promt)
+    return " ".join(promt.split()).casefold()
+
+def cache_anahtari(promt, model, size, quality):
+    return anahtar_olustur(normalize_prompt(promt), model, size, quality)
+
+def _cache_yaz(anahtar, ozet):
+    """Önbelleğe yazmadan önce referans eklenir; girdi hiçbir an referanssız görsele işaret etmez"""
+    sahip = "onbellek:" + anahtar
+    onceki = gorsel_cache.oku(anahtar)
+    gorsel_deposu.referans_ekle(ozet, sahip)
+    gorsel_cache.yaz(anahtar, ozet.encode("ascii"))
+    if onceki and onceki.decode("ascii", "replace") != ozet:
+        gorsel_deposu.referans_birak(onceki.decode("ascii"), sahip)
 
-    image_url = result.data[0].url
+def _cache_bul(anahtar):
+    with metrikler.olc("gorsel.onbellek") as olcum:
+        ozet = gorsel_cache.oku(anahtar)
+        yol = gorsel_deposu.bul(ozet.decode("ascii")) if ozet else None
+        olcum.sonuc = "iska" if yol is None else "isabet"
+    return yol
 
-    response = requests.get(image_url)
-    image_bytes = BytesIO(response.content)
+def generate_image(promt,client,model="dall-e-3",size="1024x1024",quality="hd",use_cache=True,
+                   response_format="b64_json"):
+    anahtar = cache_anahtari(promt, model, size, quality) if use_cache else None
+    if anahtar:
+        onceki = _cache_bul(anahtar)
+        if onceki is not None:
+            return onceki
 
-    timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
-    filename = f"./img/generated_image_{timestamp}.png"
+    baslangic = time.perf_counter()
+    with metrikler.olc("gorsel.api"):
+        result = client.images.generate(
+            model=model,
+            prompt=promt,
+            size=size,
+            response_format=response_format,
+            n=1,
+            quality=quality
+        )
+    api_suresi = time.perf_counter() - baslangic
 
-    if not os.path.exists("./img"):
-        os.makedirs("./img")
-    with open(filename, "wb") as f:
-        f.write(image_bytes.getbuffer())
+    return _store_result(result.data[0], anahtar, response_format, api_suresi)
+
+async def agenerate_image(promt,client,model="dall-e-3",size="1024x1024",quality="hd",use_cache=True,
+                          response_format="b64_json"):
+    """generate_image'in AsyncOpenAI istemcisiyle çalışan karşılığı"""
+    anahtar = cache_anahtari(promt, model, size, quality) if use_cache else None
+    if anahtar:
+        onceki = _cache_bul(anahtar)
+        if onceki is not None:
+            return onceki
+
+    baslangic = time.perf_counter()
+    with metrikler.olc("gorsel.api"):
+        result = await client.images.generate(
+            model=model,
+            prompt=promt,
+            size=size,
+            response_format=response_format,
+            n=1,
+            quality=quality
+        )
+    api_suresi = time.perf_counter() - baslangic
+
+    # Çözme / indirme ve disk yazımı event loop'u bloklamasın
+    return await asyncio.to_thread(_store_result, result.data[0], anahtar, response_format, api_suresi)
+
+def _store_result(image, anahtar, response_format, api_suresi):
+    """Görseli içerik adresli depoya yazar, orijinal PNG'nin yolunu döndürür"""
+    fd, filename = gorsel_deposu.gecici_dosya()
+    baslangic = time.perf_counter()
+    try:
+        # b64_json yanıtı çözülür, url yanıtı indirilir; ikisi de dosyaya yazarak
+        with metrikler.olc("gorsel.cozme" if image.b64_json is not None else "gorsel.indirme") as asama, \
+                os.fdopen(fd, "wb") as f:
+            bayt = asama.bayt = save_image_data(image, f)
+        with metrikler.olc("gorsel.depo_yazma", bayt=bayt):
+            ozet = gorsel_deposu.ekle(filename)
+    except BaseException:
+        if os.path.exists(filename):
+            os.remove(filename)
+        raise
+    kaydetme_suresi = time.perf_counter() - baslangic
+
+    if anahtar:
+        _cache_yaz(anahtar, ozet)
+    filename = gorsel_deposu.yol(ozet)
+
+    olcum = {
+        "response_format": response_format,
+        "api_s": api_suresi,
+        "kaydetme_s": kaydetme_suresi,
+        "bayt": bayt
+    }
+    olcumler.append(olcum)
+    logger.info("Görsel kaydedildi: %s (%s)", filename, olcum)
 
     return filename
+
+def save_image_data(image, f):
+    """API'den gelen görseli dosyaya yazar, yazılan bayt sayısını döndürür.
+
+    b64_json yanıtı bloklar halinde çözülerek doğrudan dosyaya yazılır;
+    url yanıtı paylaşılan oturumla parça parça indirilir. Görsel hiçbir
+    zaman bellekte tamamıyla ikinci kez tutulmaz."""
+    bayt = 0
+    if image.b64_json is not None:
+        veri = image.b64_json
+        for i in range(0, len(veri), B64_BLOK):
+            bayt += f.write(base64.b64decode(veri[i:i + B64_BLOK]))
+        return bayt
+
+    with http_session.get(image.url, stream=True, timeout=60) as response:
+        response.raise_for_status()
+        for parca in response.iter_content(INDIRME_BLOGU):
+            bayt += f.write(parca)
+    return bayt
+
+def latency_summary():
+    """Yanıt formatı başına ortalama API, kaydetme ve toplam süre.
+
+    b64_json'da görsel API yanıtının içinde geldiği için api_s biraz uzar
+    ama ayrı indirme yoktur; iki formatın toplam_s farkı görsel başına
+    kazanılan süreyi gösterir."""
+    ozet = {}
+    for olcum in olcumler:
+        ozet.setdefault(olcum["response_format"], []).append(olcum)
+    return {
+        bicim: {
+            "adet": len(liste),
+            "api_s": sum(o["api_s"] for o in liste) / len(liste),
+            "kaydetme_s": sum(o["kaydetme_s"] for o in liste) / len(liste),
+            "toplam_s": sum(o["api_s"] + o["kaydetme_s"] for o in liste) / len(liste)
+        }
+        for bicim, liste in ozet.items()
+    }
@@ -0,0 +1,135 @@
+import asyncio
+import threading
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Optional, Tuple
+
+import painter
+import transcriptor
+
+
+@dataclass
+class GorselIsi:
+    """
+    Tek bir kayıt -> transkript -> görsel işi.
+
+    ``transkript`` ve ``gorsel`` thread-safe Future'lardır; çağıran taraf
+    her aşamanın sonucunu ayrı ayrı bekleyebilir. Hata olursa henüz
+    tamamlanmamış tüm Future'lar aynı hatayla sonuçlanır.
+    """
+    ses_yolu: str
+    transkript: Future = field(default_factory=Future)
+    gorsel: Future = field(default_factory=Future)
+
+    def sonuc(self, timeout: Optional[float] = None) -> Tuple[str, str]:
+        """(transkript, görsel yolu) çiftini döndürür"""
+        return self.transkript.result(timeout), self.gorsel.result(timeout)
+
+    def _hata(self, hata: BaseException) -> None:
+        for future in (self.transkript, self.gorsel):
+            if not future.done():
+                future.set_exception(hata)
+
+
+class GorselPipeline:
+    """
+    Birden fazla kaydı eşzamanlı olarak görsele dönüştüren asenkron pipeline.
+
+    Kendi event loop'unu tek bir arka plan thread'inde çalıştırır; işler
+    istek başına thread açılmadan bu loop'ta yürür. Aynı anda en fazla
+    ``max_eszamanli`` iş API'ye istek gönderir, diğerleri sırada bekler.
+    """
+
+    def __init__(self,
+                 api_key: Optional[str] = None,
+                 base_url: Optional[str] = None,
+                 transcriptor_client=None,
+                 painter_client=None,
+                 max_eszamanli: int = 4,
+                 languages: str = "tr",
+                 use_cache: bool = True,
+                 preprocess: bool = False,
+                 trim_silence: bool = False,
+                 max_segment_s: Optional[float] = None):
+        self.languages = languages
+        self.use_cache = use_cache
+        self.preprocess = preprocess
+        self.trim_silence = trim_silence
+        # Verilirse uzun kayıtlar bu süreden kısa bölümler halinde eşzamanlı transkript edilir
+        self.max_segment_s = max_segment_s
+        self._transcriptor_client = transcriptor_client or transcriptor.create_async_client(api_key, base_url)
+        self._painter_client = painter_client or self._transcriptor_client
+        self._semafor = asyncio.Semaphore(max_eszamanli)
+
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+        self._thread.start()
+
+    def transkript_secenekleri(self, preprocess: Optional[bool] = None,
+                               trim_silence: Optional[bool] = None) -> dict:
+        """``gonder`` ile aynı seçeneklerde kullanılacak transkript önbellek seçenekleri (transcriptor.onbellege_yaz için)"""
+        return {
+            "languages": self.languages,
+            "preprocess": self.preprocess if preprocess is None else preprocess,
+            "trim_silence": self.trim_silence if trim_silence is None else trim_silence,
+            "max_segment_s": self.max_segment_s,
+        }
+
+    def gonder(self, ses_yolu: str, use_cache: Optional[bool] = None,
+               preprocess: Optional[bool] = None, trim_silence: Optional[bool] = None,
+               transkript: Optional[str] = None) -> GorselIsi:
+        """
+        İşi sıraya ekler, sonuçları bekleyebilecek GorselIsi döndürür (herhangi bir thread'den).
+
+        ``transkript`` verilirse (ör. kayıt sırasında canlı çıkarılmışsa)
+        transkripsiyon aşaması atlanır.
+        """
+        is_ = GorselIsi(ses_yolu)
+        if transkript is not None:
+            is_.transkript.set_result(transkript)
+        asyncio.run_coroutine_threadsafe(self._calistir(is_, use_cache, preprocess, trim_silence), self._loop)
+        return is_
+
+    async def isle(self, ses_yolu: str, use_cache: Optional[bool] = None,
+                   preprocess: Optional[bool] = None, trim_silence: Optional[bool] = None) -> Tuple[str, str]:
+        """Pipeline'ın loop'u içinden çağrılabilen asenkron karşılık"""
+        is_ = GorselIsi(ses_yolu)
+        await self._calistir(is_, use_cache, preprocess, trim_silence)
+        return is_.sonuc(0)
+
+    async def _calistir(self, is_: GorselIsi, use_cache: Optional[bool],
+                        preprocess: Optional[bool], trim_silence: Optional[bool]) -> None:
+        use_cache = self.use_cache if use_cache is None else use_cache
+        preprocess = self.preprocess if preprocess is None else preprocess
+        trim_silence = self.trim_silence if trim_silence is None else trim_silence
+        try:
+            async with self._semafor:
+                if is_.transkript.done():
+                    transkript = is_.transkript.result()
+                elif self.max_segment_s:
+                    transkript = await transcriptor.atranscribe_segmented(
+                        is_.ses_yolu, self._transcriptor_client,
+                        languages=self.languages, use_cache=use_cache,
+                        preprocess=preprocess, trim_silence=trim_silence,
+                        max_segment_s=self.max_segment_s
+                    )
+                else:
+                    transkript = await transcriptor.atranscribe(
+                        is_.ses_yolu, self._transcriptor_client,
+                        languages=self.languages, use_cache=use_cache,
+                        preprocess=preprocess, trim_silence=trim_silence
+                    )
+                if not is_.transkript.done():
+                    is_.transkript.set_result(transkript)
+
+                gorsel_yolu = await painter.agenerate_image(
+                    transkript, self._painter_client, use_cache=use_cache
+                )
+                is_.gorsel.set_result(gorsel_yolu)
+        except BaseException as e:
+            is_._hata(e)
+
+    def kapat(self) -> None:
+        """Loop'u durdurur (bekleyen işler iptal edilmez, sonuçlanmadan kalır)"""
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5)
@@ -1,12 +1,17 @@
-import pyaudio
 import wave
 import threading
 import time
 from datetime import datetime
 import os
-from dataclasses import dataclass, field
-from typing import List, Optional, Dict, Any, Tuple
-import glob
+from dataclasses import dataclass, field, replace
+from typing import Callable, List, Optional, Dict, Any, Tuple
+import shutil
+import numpy as np
+
+from audio_source import AudioSource, PyAudioSource, paInt16, paInt32, paUInt8
+from kayit_indeksi import indeks as kayit_indeksi
+import dalga_formu
+import metrikler
 
 folder_path = "kayitlar/"
 @dataclass
@@ -16,6 +21,7 @@ class KayitDurumu:
     frame_sayisi: int = 0
     mesaj: str = ""
     baslangic_zamani: Optional[float] = None
+    kayip_chunk: int = 0
 
     def guncelle_sure(self) -> None:
         """Başlangıç zamanından itibaren geçen süreyi hesaplar"""
@@ -31,6 +37,11 @@ class KayitDosyasi:
     yol: str
     boyut: int
     tarih: datetime
+    sure: Optional[float] = None
+    sample_rate: Optional[int] = None
+    channels: Optional[int] = None
+    transkript: Optional[str] = None
+    gorseller: List[str] = field(default_factory=list)
 
     def boyut_kb(self) -> float:
         """Dosya boyutunu KB cinsinden döndürür"""
@@ -41,13 +52,20 @@ class KayitDosyasi:
         return self.boyut / (1024 * 1024)
 
 
+# Ham baytları doğrudan PCM WAV olarak yazılabilen ve NumPy ile çözülebilen
+# formatlar. paInt24 (3 bayt) ve işaretli paInt8 WAV'a olduğu gibi yazılamaz,
+# paFloat32 ise tam sayı PCM değildir.
+DESTEKLENEN_FORMATLAR = (paUInt8, paInt16, paInt32)
+
+
 @dataclass
 class SesAyarlari:
     """Ses kayıt ayarlarını tutan dataclass"""
     sample_rate: int = 44100
     channels: int = 1
     chunk: int = 1024
-    format: int = field(default_factory=lambda: pyaudio.paInt16)
+    format: int = paInt16
+    diske_akit: bool = True  # Kayıt sırasında PCM'i doğrudan diske yaz
 
     def __post_init__(self):
         """Dataclass oluşturulduktan sonra çağrılır"""
@@ -64,6 +82,440 @@ class SesAyarlari:
         if self.chunk not in [256, 512, 1024, 2048, 4096]:
             raise ValueError(f"Geçersiz chunk: {self.chunk}")
 
+        if self.format not in DESTEKLENEN_FORMATLAR:
+            raise ValueError(f"Desteklenmeyen format: {self.format} "
+                             "(yalnızca paUInt8, paInt16 ve paInt32; 24 bit, işaretli 8 bit ve float desteklenmez)")
+
+
+@dataclass
+class SegmentAyarlari:
+    """Kayıt sürerken ses bölümlerinin hangi koşulda kesileceği"""
+    min_sure: float = 3.0          # Duraklamada kesmek için gereken en kısa bölüm (saniye)
+    max_sure: float = 20.0         # Bu süreye ulaşan bölüm duraklama beklenmeden kesilir
+    duraklama: float = 0.6         # Kesim için gereken sessizlik süresi (saniye)
+    sessizlik_esigi: float = 0.01  # Bu RMS değerinin (0-1) altı sessizlik sayılır
+
+
+@dataclass
+class SesSegmenti:
+    """Kayıt sürerken tamamlanan bir ses bölümü (ham PCM)"""
+    veri: bytes
+    sira: int
+    sample_rate: int
+    channels: int
+    ornek_genisligi: int
+    konusma_var: bool
+    son: bool = False
+
+    @property
+    def sure(self) -> float:
+        return len(self.veri) / (self.sample_rate * self.channels * self.ornek_genisligi)
+
+
+def pcm_float(veri: bytes, ornek_genisligi: int) -> np.ndarray:
+    """Ham PCM bloğunu -1.0 ile 1.0 arası float32 örneklere çevirir (kanallar iç içe)"""
+    ornekler = np.frombuffer(veri, dtype=OrnekDeposu.VERI_TIPLERI[ornek_genisligi]).astype(np.float32)
+    if ornek_genisligi == 1:
+        ornekler -= 128.0
+        ornekler *= 1.0 / 128.0
+    else:
+        ornekler *= 1.0 / float(1 << (8 * ornek_genisligi - 1))
+    return ornekler
+
+
+def pcm_rms(veri: bytes, ornek_genisligi: int) -> float:
+    """Ham PCM bloğunun RMS değeri (0.0 - 1.0 arası)"""
+    ornekler = pcm_float(veri, ornek_genisligi)
+    if ornekler.size == 0:
+        return 0.0
+    return float(np.sqrt(np.dot(ornekler, ornekler) / ornekler.size))
+
+
+@dataclass
+class SesSeviyesi:
+    """Kayıt sırasındaki seviye ölçümleri ve dalga formu zarfının anlık görüntüsü"""
+    tepe: float                  # Son chunk'ın tepe genliği (0.0 - 1.0)
+    rms: float                   # Son chunk'ın RMS değeri (0.0 - 1.0)
+    en_yuksek_tepe: float        # Kayıt başından beri en yüksek tepe
+    kirpilan_ornek: int          # Tam ölçeğe ulaşan (kırpılmış olabilecek) örnek sayısı
+    zarf_min: np.ndarray         # Dalga formu zarfı: kutu başına en küçük örnek
+    zarf_max: np.ndarray         # Dalga formu zarfı: kutu başına en büyük örnek
+    kutu_suresi: float           # Zarftaki bir kutunun süresi (saniye)
+
+    @staticmethod
+    def dbfs(deger: float) -> float:
+        """Genliği desibel tam ölçeğe çevirir (sessizlik için -120 dB)"""
+        return 20.0 * float(np.log10(max(deger, 1e-6)))
+
+
+class SeviyeOlcer:
+    """
+    Kayıt sürerken tepe / RMS seviyesini ve tüm kaydın min/max dalga formu
+    zarfını tutar.
+
+    Zarf sabit ``kutu_sayisi`` uzunluğundadır: dolduğunda komşu kutular
+    birleştirilip kutu genişliği ikiye katlanır. Böylece bellek ve chunk başına
+    maliyet kaydın uzunluğundan bağımsızdır. Kayıt thread'inden ``ekle`` ile
+    beslenir, arayüz ``anlik`` ile okur.
+    """
+
+    KIRPMA_ESIGI = 0.999
+
+    def __init__(self, ornek_genisligi: int, channels: int, sample_rate: int,
+                 kutu_suresi: float = 0.01, kutu_sayisi: int = 1024):
+        self.ornek_genisligi = ornek_genisligi
+        self.channels = channels
+        self.sample_rate = sample_rate
+        self._kutu = max(1, int(sample_rate * kutu_suresi))  # Kutu başına frame
+        self._zarf_min = np.zeros(kutu_sayisi, dtype=np.float32)
+        self._zarf_max = np.zeros(kutu_sayisi, dtype=np.float32)
+        self._dolu = 0
+        # Yarım kalan kutunun ara değerleri
+        self._kismi_min = np.inf
+        self._kismi_max = -np.inf
+        self._kismi_frame = 0
+        self._tepe = 0.0
+        self._rms = 0.0
+        self._en_yuksek_tepe = 0.0
+        self._kirpilan = 0
+        self._lock = threading.Lock()
+
+    def ekle(self, veri: bytes) -> None:
+        ornekler = pcm_float(veri, self.ornek_genisligi)
+        if ornekler.size == 0:
+            return
+        mutlak = np.abs(ornekler)
+        tepe = float(mutlak.max())
+        rms = float(np.sqrt(np.dot(ornekler, ornekler) / ornekler.size))
+        kirpilan = int(np.count_nonzero(mutlak >= self.KIRPMA_ESIGI))
+
+        # Frame başına (kanallar arası) min / max
+        frameler = ornekler[:ornekler.size - ornekler.size % self.channels].reshape(-1, self.channels)
+        frame_min = frameler.min(axis=1)
+        frame_max = frameler.max(axis=1)
+
+        with self._lock:
+            self._tepe, self._rms = tepe, rms
+            self._en_yuksek_tepe = max(self._en_yuksek_tepe, tepe)
+            self._kirpilan += kirpilan
+            self._zarfa_ekle(frame_min, frame_max)
+
+    def _zarfa_ekle(self, frame_min: np.ndarray, frame_max: np.ndarray) -> None:
+        i = 0
+        # Önce yarım kalan kutuyu tamamla
+        if self._kismi_frame:
+            n = min(self._kutu - self._kismi_frame, len(frame_min))
+            self._kismi_min = min(self._kismi_min, float(frame_min[:n].min()))
+            self._kismi_max = max(self._kismi_max, float(frame_max[:n].max()))
+            self._kismi_frame += n
+            i = n
+            if self._kismi_frame == self._kutu:
+                self._kutu_ekle(np.array([self._kismi_min]), np.array([self._kismi_max]))
+                self._kismi_frame = 0
+
+        # Tam kutular vektörel olarak
+        tam = (len(frame_min) - i) // self._kutu * self._kutu
+        if tam:
+            self._kutu_ekle(frame_min[i:i + tam].reshape(-1, self._kutu).min(axis=1),
+                            frame_max[i:i + tam].reshape(-1, self._kutu).max(axis=1))
+            i += tam
+
+        # Artanı sonraki chunk'a bırak
+        if i < len(frame_min):
+            self._kismi_min = float(frame_min[i:].min())
+            self._kismi_max = float(frame_max[i:].max())
+            self._kismi_frame = len(frame_min) - i
+
+    def _kutu_ekle(self, mins: np.ndarray, maxs: np.ndarray) -> None:
+        while len(mins):
+            if self._dolu == len(self._zarf_min):
+                self._seyrelt()
+                # Kutu genişliği iki katına çıktı: yeni değerleri de çiftler halinde birleştir
+                if len(mins) > 1:
+                    tek = len(mins) & 1
+                    cift_min = mins[:len(mins) - tek].reshape(-1, 2).min(axis=1)
+                    cift_max = maxs[:len(maxs) - tek].reshape(-1, 2).max(axis=1)
+                    if tek:
+                        cift_min = np.append(cift_min, mins[-1])
+                        cift_max = np.append(cift_max, maxs[-1])
+                    mins, maxs = cift_min, cift_max
+            n = min(len(mins), len(self._zarf_min) - self._dolu)
+            self._zarf_min[self._dolu:self._dolu + n] = mins[:n]
+            self._zarf_max[self._dolu:self._dolu + n] = maxs[:n]
+            self._dolu += n
+            mins, maxs = mins[n:], maxs[n:]
+
+    def _seyrelt(self) -> None:
+        """Komşu kutuları birleştirip zarfı yarıya indirir"""
+        yari = self._dolu // 2
+        self._zarf_min[:yari] = self._zarf_min[:2 * yari].reshape(-1, 2).min(axis=1)
+        self._zarf_max[:yari] = self._zarf_max[:2 * yari].reshape(-1, 2).max(axis=1)
+        self._dolu = yari
+        self._kutu *= 2
+
+    def anlik(self) -> SesSeviyesi:
+        with self._lock:
+            return SesSeviyesi(
+                tepe=self._tepe,
+                rms=self._rms,
+                en_yuksek_tepe=self._en_yuksek_tepe,
+                kirpilan_ornek=self._kirpilan,
+                zarf_min=self._zarf_min[:self._dolu].copy(),
+                zarf_max=self._zarf_max[:self._dolu].copy(),
+                kutu_suresi=self._kutu / self.sample_rate
+            )
+
+
+class SegmentAyirici:
+    """
+    Kayıt akışını duraklamalarda (veya en fazla max_sure'de) bölümlere ayırır.
+
+    Yalnızca kayıt thread'inden çağrılır; bellekte en fazla bir bölümlük
+    (max_sure kadar) veri tutar.
+    """
+
+    def __init__(self, ayarlar: SegmentAyarlari, sample_rate: int, channels: int, ornek_genisligi: int):
+        self.ayarlar = ayarlar
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.ornek_genisligi = ornek_genisligi
+        self._saniye_bayt = sample_rate * channels * ornek_genisligi
+        self._tampon = bytearray()
+        self._sira = 0
+        self._sessiz_sure = 0.0
+        self._konusma_var = False
+
+    def ekle(self, veri: bytes) -> Optional[SesSegmenti]:
+        """Veriyi ekler; bir bölüm tamamlandıysa onu döndürür"""
+        self._tampon += veri
+        blok_suresi = len(veri) / self._saniye_bayt
+        if pcm_rms(veri, self.ornek_genisligi) > self.ayarlar.sessizlik_esigi:
+            self._konusma_var = True
+            self._sessiz_sure = 0.0
+        else:
+            self._sessiz_sure += blok_suresi
+
+        sure = len(self._tampon) / self._saniye_bayt
+        if sure >= self.ayarlar.max_sure or (
+                sure >= self.ayarlar.min_sure and self._konusma_var and
+                self._sessiz_sure >= self.ayarlar.duraklama):
+            return self._kes(son=False)
+        return None
+
+    def bitir(self) -> Optional[SesSegmenti]:
+        """Kayıt bittiğinde kalan veriyi son bölüm olarak döndürür"""
+        return self._kes(son=True)
+
+    def _kes(self, son: bool) -> Optional[SesSegmenti]:
+        if not self._tampon and not son:
+            return None
+        segment = SesSegmenti(
+            veri=bytes(self._tampon),
+            sira=self._sira,
+            sample_rate=self.sample_rate,
+            channels=self.channels,
+            ornek_genisligi=self.ornek_genisligi,
+            konusma_var=self._konusma_var,
+            son=son
+        )
+        self._sira += 1
+        self._tampon = bytearray()
+        self._sessiz_sure = 0.0
+        self._konusma_var = False
+        return segment
+
+
+class HalkaTampon:
+    """
+    Tek üretici / tek tüketici (SPSC) için önceden ayrılmış halka tampon.
+
+    Üretici (PyAudio callback'i) yalnızca ``_yazilan`` sayacını, tüketici
+    (kayıt thread'i) yalnızca ``_okunan`` sayacını günceller; bu yüzden
+    kilit gerekmez. Sayaçlar toplam bayt sayısıdır, konum kapasiteye göre
+    mod alınarak bulunur.
+    """
+
+    def __init__(self, kapasite: int):
+        self._kapasite = kapasite
+        self._tampon = bytearray(kapasite)
+        self._gorunum = memoryview(self._tampon)
+        self._yazilan = 0
+        self._okunan = 0
+        self._veri_var = threading.Event()
+
+    @property
+    def dolu(self) -> int:
+        """Okunmayı bekleyen bayt sayısı"""
+        return self._yazilan - self._okunan
+
+    def yaz(self, veri: bytes) -> bool:
+        """Veriyi tampona yazar, yer yoksa hiç yazmadan False döndürür (üretici)"""
+        n = len(veri)
+        if n > self._kapasite - self.dolu:
+            return False
+
+        konum = self._yazilan % self._kapasite
+        ilk = min(n, self._kapasite - konum)
+        kaynak = memoryview(veri)
+        self._gorunum[konum:konum + ilk] = kaynak[:ilk]
+        if ilk < n:
+            self._gorunum[:n - ilk] = kaynak[ilk:]
+
+        self._yazilan += n
+        self._veri_var.set()
+        return True
+
+    def oku(self) -> bytes:
+        """Bekleyen verinin tamamını okur (tüketici)"""
+        n = self.dolu
+        if n == 0:
+            return b''
+
+        konum = self._okunan % self._kapasite
+        ilk = min(n, self._kapasite - konum)
+        if ilk < n:
+            veri = bytes(self._gorunum[konum:]) + bytes(self._gorunum[:n - ilk])
+        else:
+            veri = bytes(self._gorunum[konum:konum + n])
+
+        self._okunan += n
+        return veri
+
+    def bekle(self, zaman_asimi: float) -> None:
+        """Yeni veri gelene kadar (en fazla zaman_asimi saniye) bekler"""
+        self._veri_var.wait(zaman_asimi)
+        self._veri_var.clear()
+
+    def sifirla(self) -> None:
+        """Tamponu boşaltır (yalnızca üretici ve tüketici dururken çağrılmalı)"""
+        self._yazilan = 0
+        self._okunan = 0
+        self._veri_var.clear()
+
+
+class OrnekDeposu:
+    """
+    Kaydı tek bir büyüyebilen bytearray içinde tutan sıkışık örnek deposu.
+
+    Chunk başına ayrı bytes nesnesi tutmak yerine veri önceden ayrılmış tampona
+    kopyalanır; kapasite dolunca iki katına çıkarılır. Süre, tepe ve RMS
+    sorguları ile ``writeframes`` memoryview dilimleri üzerinden kopyasız çalışır.
+    """
+
+    # Örnek genişliği -> NumPy veri tipi (8 bit WAV işaretsizdir)
+    VERI_TIPLERI = {1: np.uint8, 2: np.int16, 4: np.int32}
+
+    # RMS hesabında float'a çevrilen blok boyutu (örnek)
+    BLOK = 1 << 20
+
+    def __init__(self, ornek_genisligi: int = 2, channels: int = 1, kapasite: int = 1 << 20):
+        if ornek_genisligi not in self.VERI_TIPLERI:
+            raise ValueError(f"Desteklenmeyen örnek genişliği: {ornek_genisligi}")
+        self.ornek_genisligi = ornek_genisligi
+        self.channels = channels
+        self._tampon = bytearray(max(kapasite, 1))
+        self._uzunluk = 0
+
+    def __len__(self) -> int:
+        return self._uzunluk
+
+    @property
+    def kapasite(self) -> int:
+        return len(self._tampon)
+
+    def ekle(self, veri: bytes) -> None:
+        """Veriyi deponun sonuna ekler, gerekirse kapasiteyi büyütür"""
+        n = len(veri)
+        gerekli = self._uzunluk + n
+        if gerekli > len(self._tampon):
+            # Dışarıya verilmiş memoryview'lar olabileceği için yerinde
+            # büyütmek yerine yeni tampon ayrılır
+            yeni = bytearray(max(gerekli, 2 * len(self._tampon)))
+            yeni[:self._uzunluk] = memoryview(self._tampon)[:self._uzunluk]
+            self._tampon = yeni
+        self._tampon[self._uzunluk:gerekli] = veri
+        self._uzunluk = gerekli
+
+    def temizle(self) -> None:
+        """Depoyu boşaltır, ayrılmış kapasite korunur"""
+        self._uzunluk = 0
+
+    def gorunum(self, baslangic: int = 0, bitis: Optional[int] = None) -> memoryview:
+        """Kaydedilen verinin bayt aralığı için kopyasız memoryview döndürür"""
+        bitis = self._uzunluk if bitis is None else min(bitis, self._uzunluk)
+        return memoryview(self._tampon)[baslangic:bitis]
+
+    def ornekler(self) -> np.ndarray:
+        """Tüm örnekleri kopyasız NumPy dizisi olarak döndürür"""
+        return np.frombuffer(self.gorunum(), dtype=self.VERI_TIPLERI[self.ornek_genisligi])
+
+    def frame_sayisi(self) -> int:
+        """Kanal başına örnek (WAV frame) sayısı"""
+        return self._uzunluk // (self.ornek_genisligi * self.channels)
+
+    def sure(self, sample_rate: int) -> float:
+        """Kaydın süresini saniye cinsinden döndürür"""
+        return self.frame_sayisi() / sample_rate
+
+    def _normalize(self, ornekler: np.ndarray) -> Tuple[np.ndarray, float]:
+        """8 bit için orta noktayı kaydırır, tam ölçek değerini döndürür"""
+        if self.ornek_genisligi == 1:
+            return ornekler.astype(np.int16) - 128, 128.0
+        return ornekler, float(1 << (8 * self.ornek_genisligi - 1))
+
+    def tepe(self) -> float:
+        """Tepe genliği (0.0 - 1.0 arası)"""
+        if self._uzunluk == 0:
+            return 0.0
+        ornekler, tam_olcek = self._normalize(self.ornekler())
+        return float(max(abs(int(ornekler.max())), abs(int(ornekler.min())))) / tam_olcek
+
+    def rms(self) -> float:
+        """RMS genliği (0.0 - 1.0 arası), bloklar halinde hesaplanır"""
+        ornekler = self.ornekler()
+        if ornekler.size == 0:
+            return 0.0
+        toplam = 0.0
+        tam_olcek = 1.0
+        for i in range(0, ornekler.size, self.BLOK):
+            blok, tam_olcek = self._normalize(ornekler[i:i + self.BLOK])
+            blok = blok.astype(np.float64)
+            toplam += float(np.dot(blok, blok))
+        return (toplam / ornekler.size) ** 0.5 / tam_olcek
+
+    def wav_yaz(self, wf: wave.Wave_write) -> None:
+        """Veriyi açık bir WAV dosyasına kopyalamadan yazar"""
+        wf.writeframes(self.gorunum())
+
+
+class ArtimliWavYazici:
+    """
+    Kayıt sürerken PCM verisini .wav dosyasına ekleyen yazıcı.
+
+    Veri ``writeframesraw`` ile eklenir, başlıktaki uzunluk alanları yalnızca
+    ``kapat()`` sırasında bir kez düzeltilir. Bellek kullanımı kayıt süresinden
+    bağımsızdır.
+    """
+
+    def __init__(self, yol: str, channels: int, ornek_genisligi: int, sample_rate: int):
+        self.yol = yol
+        self.yazilan_bayt = 0
+        self._wf = wave.open(yol, 'wb')
+        self._wf.setnchannels(channels)
+        self._wf.setsampwidth(ornek_genisligi)
+        self._wf.setframerate(sample_rate)
+
+    def ekle(self, veri: bytes) -> None:
+        """PCM verisini dosyanın sonuna ekler"""
+        self._wf.writeframesraw(veri)
+        self.yazilan_bayt += len(veri)
+
+    def kapat(self) -> None:
+        """Başlığı yazılan veri boyutuna göre düzeltir ve dosyayı kapatır"""
+        if self._wf is not None:
+            self._wf.close()
+            self._wf = None
+
 
 @dataclass
 class SesKaydedici:
@@ -73,18 +525,46 @@ class SesKaydedici:
     # Ses ayarları
     ayarlar: SesAyarlari = field(default_factory=SesAyarlari)
 
+    # Ses kaynağı (None ise her kayıtta varsayılan mikrofon için PyAudioSource kullanılır)
+    kaynak: Optional[AudioSource] = None
+
+    # Verilirse kayıt sürerken tamamlanan her ses bölümü bu fonksiyona gönderilir
+    # (kayıt thread'inden çağrılır, hızlı dönmelidir)
+    segment_dinleyici: Optional[Callable[[SesSegmenti], None]] = None
+    segment_ayarlari: SegmentAyarlari = field(default_factory=SegmentAyarlari)
+
     # Private alanlar (post_init'te initialize edilir)
     _durum: KayitDurumu = field(default_factory=KayitDurumu, init=False)
-    _frames: List[bytes] = field(default_factory=list, init=False)
-    _audio: Optional[pyaudio.PyAudio] = field(default=None, init=False)
-    _stream: Optional[pyaudio.Stream] = field(default=None, init=False)
+    _depo: Optional[OrnekDeposu] = field(default=None, init=False)
+    _aktif_kaynak: Optional[AudioSource] = field(default=None, init=False)
     _kayit_thread: Optional[threading.Thread] = field(default=None, init=False)
     _lock: threading.Lock = field(default_factory=threading.Lock, init=False)
+    _halka: Optional[HalkaTampon] = field(default=None, init=False)
+    _chunk_sayisi: int = field(default=0, init=False)
+    _kayip_chunk: int = field(default=0, init=False)
+    _yazici: Optional[ArtimliWavYazici] = field(default=None, init=False)
+    _disk_yolu: Optional[str] = field(default=None, init=False)
+    _disk_kaydedildi: bool = field(default=False, init=False)
+    _segment_ayirici: Optional[SegmentAyirici] = field(default=None, init=False)
+    _seviye: Optional[SeviyeOlcer] = field(default=None, init=False)
+    # Son kaydın kaynakla anlaşılan hızı; cihaz istenen hızı desteklemiyorsa ayarlardakinden farklıdır
+    _aktif_hiz: Optional[int] = field(default=None, init=False)
+
+    # Halka tamponun kaç saniyelik ses tutacağı
+    TAMPON_SURESI = 2.0
+
+    # Bellekte kayıtta örnek deposu için önceden ayrılan süre (saniye)
+    ON_AYIRMA_SURESI = 30.0
 
     def __post_init__(self):
         """Dataclass oluşturulduktan sonra çağrılır"""
         self._durum.mesaj = "Kayıt için hazır"
 
+    @property
+    def _kayit_hizi(self) -> int:
+        """Son (veya süren) kaydın gerçek örnekleme hızı"""
+        return self._aktif_hiz or self.ayarlar.sample_rate
+
     @property
     def kayit_devam_ediyor(self) -> bool:
         """Thread-safe kayıt durumu kontrolü"""
@@ -93,9 +573,13 @@ class SesKaydedici:
 
     @property
     def frame_sayisi(self) -> int:
-        """Thread-safe frame sayısı"""
-        with self._lock:
-            return len(self._frames)
+        """Alınan chunk sayısı (kilitsiz okunur, ses I/O'sunu beklemez)"""
+        return self._chunk_sayisi
+
+    @property
+    def kayip_chunk(self) -> int:
+        """Taşma nedeniyle kaybedilen chunk sayısı"""
+        return self._kayip_chunk
 
     def kayit_baslat(self) -> bool:
         """Kayıt başlatır"""
@@ -104,43 +588,90 @@ class SesKaydedici:
                 self._durum.mesaj = "Kayıt zaten devam ediyor!"
                 return False
 
+            baslangic = time.perf_counter()
             try:
-                # PyAudio'yu başlat
-                self._audio = pyaudio.PyAudio()
-
-                # Mikrofon var mı kontrol et
-                if self._audio.get_device_count() == 0:
-                    self._durum.mesaj = "Mikrofon bulunamadı!"
-                    self._audio.terminate()
-                    return False
-
-                # Stream'i aç
-                self._stream = self._audio.open(
-                    format=self.ayarlar.format,
-                    channels=self.ayarlar.channels,
-                    rate=self.ayarlar.sample_rate,
-                    input=True,
-                    frames_per_buffer=self.ayarlar.chunk,
-                    input_device_index=None  # Varsayılan mikrofon
-                )
-
-                # Kayıt durumunu aktif et
+                self._aktif_kaynak = self.kaynak or PyAudioSource()
+                ornek_genisligi = self._aktif_kaynak.ornek_genisligi(self.ayarlar.format)
+
+                # Cihaz istenen hızı desteklemiyorsa en yakın desteklenen hızla kaydedilir
+                # (ayarlar değişmez; bir sonraki kayıt yine istenen hızı dener)
+                hiz_notu = ""
+                sample_rate = self._aktif_kaynak.desteklenen_hiz(self.ayarlar)
+                if sample_rate != self.ayarlar.sample_rate:
+                    hiz_notu = f" ({self.ayarlar.sample_rate} Hz desteklenmediği için {sample_rate} Hz kullanılıyor)"
+                self._aktif_hiz = sample_rate
+
+                # Halka tamponu hazırla (birkaç saniyelik ses için önceden ayrılır)
+                chunk_bayt = self.ayarlar.chunk * self.ayarlar.channels * ornek_genisligi
+                saniyedeki_chunk = sample_rate / self.ayarlar.chunk
+                kapasite = chunk_bayt * max(4, int(saniyedeki_chunk * self.TAMPON_SURESI))
+                if self._halka is None or self._halka._kapasite != kapasite:
+                    self._halka = HalkaTampon(kapasite)
+                else:
+                    self._halka.sifirla()
+
+                # Kayıt durumunu aktif et (callback stream açılır açılmaz çalışır)
                 self._durum.aktif = True
                 self._durum.baslangic_zamani = time.time()
                 self._durum.frame_sayisi = 0
-                self._frames.clear()
+                self._durum.kayip_chunk = 0
+                self._chunk_sayisi = 0
+                self._kayip_chunk = 0
+                self._depo = None
+                self._gecici_dosyayi_sil()
+
+                # Diske akıtma modunda kayıt doğrudan geçici .wav dosyasına yazılır
+                if self.ayarlar.diske_akit:
+                    kayitlar_klasoru = "kayitlar"
+                    if not os.path.exists(kayitlar_klasoru):
+                        os.makedirs(kayitlar_klasoru)
+                    zaman = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+                    self._disk_yolu = os.path.join(kayitlar_klasoru, f".kayit_{zaman}.wav.part")
+                    self._disk_kaydedildi = False
+                    self._yazici = ArtimliWavYazici(
+                        self._disk_yolu,
+                        self.ayarlar.channels,
+                        ornek_genisligi,
+                        sample_rate
+                    )
+                else:
+                    self._depo = OrnekDeposu(
+                        ornek_genisligi,
+                        self.ayarlar.channels,
+                        int(sample_rate * self.ayarlar.channels *
+                            ornek_genisligi * self.ON_AYIRMA_SURESI)
+                    )
+
+                self._seviye = SeviyeOlcer(ornek_genisligi, self.ayarlar.channels, sample_rate)
+
+                self._segment_ayirici = None
+                if self.segment_dinleyici:
+                    self._segment_ayirici = SegmentAyirici(
+                        self.segment_ayarlari,
+                        sample_rate,
+                        self.ayarlar.channels,
+                        ornek_genisligi
+                    )
+
+                # Kaynağı aç, chunk'lar callback ile halka tampona gelir
+                self._aktif_kaynak.baslat(replace(self.ayarlar, sample_rate=sample_rate), self._ses_callback)
 
                 # Kayıt thread'ini başlat
                 self._kayit_thread = threading.Thread(target=self._kayit_dongusu)
                 self._kayit_thread.daemon = True
                 self._kayit_thread.start()
 
-                self._durum.mesaj = "Kayıt başlatıldı!"
+                self._durum.mesaj = f"Kayıt başlatıldı!{hiz_notu}"
+                metrikler.kaydet("kayit.baslatma", time.perf_counter() - baslangic)
                 return True
 
             except Exception as e:
+                self._durum.aktif = False
                 self._durum.mesaj = f"Kayıt başlatılamadı: {str(e)}"
                 self._temizle()
+                self._yaziciyi_kapat()
+                self._gecici_dosyayi_sil()
+                metrikler.kaydet("kayit.baslatma", time.perf_counter() - baslangic, sonuc="hata")
                 return False
 
     def kayit_durdur(self) -> bool:
@@ -152,45 +683,89 @@ class SesKaydedici:
 
             self._durum.aktif = False
             self._durum.mesaj = "Kayıt durduruluyor..."
+            kaynak = self._aktif_kaynak
+        baslangic = time.perf_counter()
 
-        # Thread'in bitmesini bekle (lock dışında)
+        # Kaynağı durdur; callback'in son çağrısı da bitmiş olur
+        if kaynak:
+            try:
+                kaynak.durdur()
+            except Exception:
+                pass
+
+        # Thread'in kalan veriyi boşaltıp bitmesini bekle (lock dışında)
         if self._kayit_thread and self._kayit_thread.is_alive():
             self._kayit_thread.join(timeout=2)
 
         with self._lock:
             self._temizle()
+            self._yaziciyi_kapat()
             self._durum.mesaj = "Kayıt durduruldu!"
+            metrikler.kaydet("kayit.durdurma", time.perf_counter() - baslangic)
+            metrikler.say("kayit.kayip_chunk", self._kayip_chunk)
             return True
 
+    def _ses_callback(self, in_data: bytes, tasma: bool) -> None:
+        """Kaynak callback'i (kaynağın thread'inde çalışır, kilit almaz)"""
+        if not self._durum.aktif:
+            return
+
+        if tasma:
+            self._kayip_chunk += 1
+
+        if self._halka.yaz(in_data):
+            self._chunk_sayisi += 1
+        else:
+            # Tüketici geride kaldı, chunk sessizce değil sayılarak düşürülür
+            self._kayip_chunk += 1
+
     def _kayit_dongusu(self) -> None:
-        """Kayıt döngüsü (thread içinde çalışır)"""
+        """Halka tamponu boşaltan tüketici döngüsü (thread içinde çalışır)"""
         try:
             while True:
-                with self._lock:
-                    if not self._durum.aktif or not self._stream:
-                        break
-
-                    try:
-                        data = self._stream.read(self.ayarlar.chunk, exception_on_overflow=False)
-                        self._frames.append(data)
-                        self._durum.frame_sayisi = len(self._frames)
-                    except Exception as e:
-                        self._durum.mesaj = f"Kayıt hatası: {str(e)}"
-                        self._durum.aktif = False
-                        break
-
-                # Kısa bir bekleme (CPU kullanımını azaltır)
-                time.sleep(0.001)
+                self._halka.bekle(0.05)
+                data = self._halka.oku()
+                if data:
+                    if self._yazici:
+                        self._yazici.ekle(data)
+                    else:
+                        self._depo.ekle(data)
+                    self._seviye.ekle(data)
+                    if self._segment_ayirici:
+                        self._segment_gonder(self._segment_ayirici.ekle(data))
+                elif not self._durum.aktif:
+                    break
+
+            if self._segment_ayirici:
+                self._segment_gonder(self._segment_ayirici.bitir())
 
         except Exception as e:
             with self._lock:
                 self._durum.mesaj = f"Thread hatası: {str(e)}"
                 self._durum.aktif = False
 
+    def _segment_gonder(self, segment: Optional[SesSegmenti]) -> None:
+        """Tamamlanan bölümü dinleyiciye iletir; dinleyici hatası kaydı durdurmaz"""
+        if segment is None or not self.segment_dinleyici:
+            return
+        try:
+            self.segment_dinleyici(segment)
+        except Exception as e:
+            self._durum.mesaj = f"Segment dinleyici hatası: {str(e)}"
+
     def kaydet(self, dosya_adi: Optional[str] = None) -> Tuple[bool, Optional[str]]:
-        """Kaydedilen veriyi dosyaya yazar"""
+        """
+        Kaydı kayitlar klasörüne adlandırılmış .wav olarak kaydeder.
+
+        Diske akıtılan kayıtlarda dosya zaten yazılmıştır; yalnızca yeniden
+        adlandırılır (aynı kayıt ikinci kez kaydedilirse kopyalanır).
+        """
         with self._lock:
-            if not self._frames:
+            if self._durum.aktif:
+                self._durum.mesaj = "Önce kaydı durdurun!"
+                return False, None
+
+            if not self._depo and not self._disk_yolu:
                 self._durum.mesaj = "Kaydedilecek veri yok!"
                 return False, None
 
@@ -211,30 +786,66 @@ class SesKaydedici:
             dosya_yolu = os.path.join(kayitlar_klasoru, dosya_adi)
 
             try:
-                with wave.open(dosya_yolu, 'wb') as wf:
-                    wf.setnchannels(self.ayarlar.channels)
-                    wf.setsampwidth(self._audio.get_sample_size(self.ayarlar.format) if self._audio else 2)
-                    wf.setframerate(self.ayarlar.sample_rate)
-                    wf.writeframes(b''.join(self._frames))
+                with metrikler.olc("kayit.kaydetme") as olcum:
+                    if self._disk_yolu:
+                        if not self._disk_kaydedildi:
+                            os.replace(self._disk_yolu, dosya_yolu)
+                            self._disk_yolu = dosya_yolu
+                            self._disk_kaydedildi = True
+                        elif os.path.abspath(self._disk_yolu) != os.path.abspath(dosya_yolu):
+                            shutil.copyfile(self._disk_yolu, dosya_yolu)
+                    else:
+                        with wave.open(dosya_yolu, 'wb') as wf:
+                            wf.setnchannels(self.ayarlar.channels)
+                            wf.setsampwidth(self._depo.ornek_genisligi)
+                            wf.setframerate(self._kayit_hizi)
+                            self._depo.wav_yaz(wf)
+                    olcum.bayt = os.path.getsize(dosya_yolu)
 
                 self._durum.mesaj = f"Kayıt kaydedildi: {dosya_yolu}"
+                try:
+                    # Arşiv listesi klasörü yeniden taramadan güncel olsun
+                    with metrikler.olc("kayit.indeks"):
+                        kayit_indeksi.ekle(dosya_yolu)
+                except Exception as e:
+                    self._durum.mesaj += f" (indeks güncellenemedi: {str(e)})"
+                try:
+                    # Arşivdeki dalga formu küçük resmi için
+                    with metrikler.olc("kayit.dalga_formu", bayt=olcum.bayt):
+                        dalga_formu.olustur(dosya_yolu)
+                except Exception as e:
+                    self._durum.mesaj += f" (dalga formu oluşturulamadı: {str(e)})"
                 return True, dosya_yolu
 
             except Exception as e:
                 self._durum.mesaj = f"Dosya kaydetme hatası: {str(e)}"
                 return False, None
 
+    def _yaziciyi_kapat(self) -> None:
+        """Artımlı yazıcıyı kapatır, WAV başlığını düzeltir (lock içinde çağrılmalı)"""
+        if self._yazici:
+            try:
+                self._yazici.kapat()
+            except Exception as e:
+                self._durum.mesaj = f"Dosya kaydetme hatası: {str(e)}"
+            self._yazici = None
+
+    def _gecici_dosyayi_sil(self) -> None:
+        """Kaydedilmemiş geçici kayıt dosyasını siler (lock içinde çağrılmalı)"""
+        if self._disk_yolu and not self._disk_kaydedildi:
+            try:
+                os.remove(self._disk_yolu)
+            except OSError:
+                pass
+        self._disk_yolu = None
+        self._disk_kaydedildi = False
+
     def _temizle(self) -> None:
         """Kaynakları temizler (lock içinde çağrılmalı)"""
         try:
-            if self._stream:
-                self._stream.stop_stream()
-                self._stream.close()
-                self._stream = None
-
-            if self._audio:
-                self._audio.terminate()
-                self._audio = None
+            if self._aktif_kaynak:
+                self._aktif_kaynak.kapat()
+                self._aktif_kaynak = None
         except:
             pass
 
@@ -242,10 +853,13 @@ class SesKaydedici:
         """Kayıt durumunu döndürür"""
         with self._lock:
             # Süreyi güncelle
+            self._durum.frame_sayisi = self._chunk_sayisi
+            self._durum.kayip_chunk = self._kayip_chunk
             if self._durum.aktif:
                 self._durum.guncelle_sure()
-                self._durum.frame_sayisi = len(self._frames)
                 self._durum.mesaj = f"Kayıt devam ediyor - Süre: {self._durum.sure:.1f} saniye"
+                if self._kayit_hizi != self.ayarlar.sample_rate:
+                    self._durum.mesaj += f" ({self._kayit_hizi} Hz kullanılıyor)"
 
             # Durum nesnesinin bir kopyasını döndür
             return KayitDurumu(
@@ -253,37 +867,39 @@ class SesKaydedici:
                 sure=self._durum.sure,
                 frame_sayisi=self._durum.frame_sayisi,
                 mesaj=self._durum.mesaj,
-                baslangic_zamani=self._durum.baslangic_zamani
+                baslangic_zamani=self._durum.baslangic_zamani,
+                kayip_chunk=self._durum.kayip_chunk
             )
 
-    def get_kayit_listesi(self) -> List[KayitDosyasi]:
-        """Kayıtlar klasöründeki dosyaları listeler"""
-        kayitlar_klasoru = "kayitlar"
-        if not os.path.exists(kayitlar_klasoru):
-            return []
+    def get_seviye(self) -> Optional[SesSeviyesi]:
+        """Son (veya süren) kaydın seviye ölçümleri ve dalga formu zarfı; kayıt yapılmadıysa None"""
+        seviye = self._seviye
+        return seviye.anlik() if seviye else None
 
-        dosyalar = []
-        for dosya in os.listdir(kayitlar_klasoru):
-            if dosya.endswith('.wav'):
-                dosya_yolu = os.path.join(kayitlar_klasoru, dosya)
-                try:
-                    dosya_boyutu = os.path.getsize(dosya_yolu)
-                    dosya_tarihi = datetime.fromtimestamp(os.path.getmtime(dosya_yolu))
-
-                    kayit_dosyasi = KayitDosyasi(
-                        ad=dosya,
-                        yol=dosya_yolu,
-                        boyut=dosya_boyutu,
-                        tarih=dosya_tarihi
-                    )
-                    dosyalar.append(kayit_dosyasi)
-                except OSError:
-                    # Dosya erişim hatası, atla
-                    continue
+    def get_ornek_istatistikleri(self) -> Optional[Dict[str, float]]:
+        """Bellekteki kaydın süre, tepe ve RMS değerlerini döndürür (diske akıtmada None)"""
+        depo = self._depo
+        if depo is None or self._durum.aktif:
+            return None
+        return {
+            'sure': depo.sure(self._kayit_hizi),
+            'tepe': depo.tepe(),
+            'rms': depo.rms()
+        }
+
+    def get_kayit_listesi(self,
+                          siralama: str = "tarih",
+                          azalan: bool = True,
+                          arama: Optional[str] = None,
+                          limit: Optional[int] = None,
+                          offset: int = 0) -> List[KayitDosyasi]:
+        """
+        Kayıtları meta veri indeksinden listeler (varsayılan: en yeni önce).
 
-        # Tarihe göre sırala (en yeni önce)
-        dosyalar.sort(key=lambda x: x.tarih, reverse=True)
-        return dosyalar
+        Yalnızca sorgudur; klasörle eşitlemek için önce ``kayit_indeksi.senkronize()`` çağrılır.
+        """
+        return [KayitDosyasi(**satir) for satir in
+                kayit_indeksi.listele(siralama, azalan, arama=arama, limit=limit, offset=offset)]
 
     def ayarlari_guncelle(self,
                           sample_rate: Optional[int] = None,
@@ -300,7 +916,8 @@ class SesKaydedici:
                 yeni_ayarlar = SesAyarlari(
                     sample_rate=sample_rate or self.ayarlar.sample_rate,
                     channels=channels or self.ayarlar.channels,
-                    chunk=chunk or self.ayarlar.chunk
+                    chunk=chunk or self.ayarlar.chunk,
+                    diske_akit=self.ayarlar.diske_akit
                 )
 
                 self.ayarlar = yeni_ayarlar
@@ -318,7 +935,8 @@ class SesKaydedici:
             'channels': self.ayarlar.channels,
             'chunk': self.ayarlar.chunk,
             'format': self.ayarlar.format,
-            'channels_str': 'Mono' if self.ayarlar.channels == 1 else 'Stereo'
+            'channels_str': 'Mono' if self.ayarlar.channels == 1 else 'Stereo',
+            'diske_akit': self.ayarlar.diske_akit
         }
 
     def __del__(self):
@@ -328,6 +946,7 @@ class SesKaydedici:
         if hasattr(self, '_lock'):
             with self._lock:
                 self._temizle()
+                self._yaziciyi_kapat()
 
 
 # Test fonksiyonu
@@ -365,6 +984,7 @@ if __name__ == "__main__":
 
             # Kayıt listesini göster
             print("\n📁 Kayıt listesi:")
+            kayit_indeksi.senkronize()
             for kayit in kaydedici.get_kayit_listesi():
                 print(f"  - {kayit.ad} ({kayit.boyut_kb():.1f} KB, {kayit.tarih})")
         else:
@@ -378,9 +998,5 @@ if __name__ == "__main__":
     print("\n=== Test tamamlandı ===")
 
 def get_files():
-    if os.path.exists(folder_path):
-        file_paths = glob.glob(os.path.join(folder_path, "*"))
-        file_names = [os.path.basename(path) for path in file_paths]
-        return file_names
-    else:
-        return []
\ No newline at end of file
+    kayit_indeksi.senkronize()
+    return [satir["ad"] for satir in kayit_indeksi.listele()]
\ No newline at end of file
@@ -0,0 +1,60 @@
+import wave
+
+import numpy as np
+import pytest
+
+import audio_preprocess
+
+
+def _wav(yol, sample_rate, kanal, sure=5.0):
+    t = np.arange(int(sample_rate * sure)) / sample_rate
+    ton = (0.5 * np.sin(2 * np.pi * 440 * t) * 32767).astype(np.int16)
+    with wave.open(str(yol), 'wb') as wf:
+        wf.setnchannels(kanal)
+        wf.setsampwidth(2)
+        wf.setframerate(sample_rate)
+        wf.writeframes(np.repeat(ton[:, None], kanal, axis=1).tobytes())
+    return str(yol)
+
+
+@pytest.mark.parametrize("kaynak_hz, beklenen_hz", [(8000, 8000), (11025, 11025), (16000, 16000), (48000, 16000)])
+def test_hedefin_altindaki_kayit_yukari_orneklenmez(tmp_path, kaynak_hz, beklenen_hz):
+    sonuc = audio_preprocess.on_isle(_wav(tmp_path / "kayit.wav", kaynak_hz, 2), cikis_klasoru=str(tmp_path))
+    with wave.open(sonuc.yol, 'rb') as wf:
+        assert wf.getframerate() == beklenen_hz
+        assert wf.getnchannels() == 1
+        assert wf.getnframes() == pytest.approx(5.0 * beklenen_hz, abs=1)
+    assert sonuc.sonraki_hz == beklenen_hz
+    assert sonuc.sure_s == pytest.approx(5.0, abs=1e-3)
+
+
+def test_blok_blok_ornekleme_tek_seferlikle_ayni(tmp_path):
+    # Blok sınırlarında örnek kaybı/kayması olmamalı
+    yol = _wav(tmp_path / "kayit.wav", 44100, 2, sure=3 * audio_preprocess.BLOK / 16000)
+    ornekler, bilgi = audio_preprocess.wav_memmap(yol)
+    tumu = audio_preprocess.mono_yap(audio_preprocess.float_yap(np.asarray(ornekler), bilgi.ornek_genisligi))
+    beklenen = audio_preprocess.yeniden_ornekle(tumu, bilgi.sample_rate)
+
+    bloklar, cikis_hz, _ = audio_preprocess.mono_bloklar(yol)
+    parcalar = list(bloklar)
+    assert cikis_hz == 16000
+    assert len(parcalar) > 1
+    np.testing.assert_allclose(np.concatenate(parcalar), beklenen, atol=1e-6)
+
+
+@pytest.mark.parametrize("kaynak_hz", [22050, 44100, 48000, 96000])
+def test_yeniden_ornekleme_dogrudan_fir_ile_ayni(kaynak_hz):
+    # Matris çarpımlı hesap, sıfır eklenmiş girişin filtrelenip seyreltilmesine eşit olmalı
+    x = np.random.default_rng(0).standard_normal(kaynak_hz // 40 + 17).astype(np.float32)
+    ortak = np.gcd(kaynak_hz, 16000)
+    yukari, asagi = 16000 // ortak, kaynak_hz // ortak
+    fazlar = audio_preprocess._polyphase_filtre(yukari, asagi, audio_preprocess.YARI_GENISLIK)
+    h = fazlar.T.ravel().astype(np.float64)
+    z = np.zeros(len(x) * yukari)
+    z[::yukari] = x
+    gecikme = (len(h) - 1) // 2
+    beklenen = np.convolve(z, h)[gecikme::asagi][:-(-len(x) * yukari // asagi)]
+
+    sonuc = audio_preprocess.yeniden_ornekle(x, kaynak_hz)
+    assert len(sonuc) == len(beklenen)
+    np.testing.assert_allclose(sonuc, beklenen, atol=1e-4)
@@ -0,0 +1,94 @@
+import types
+import wave
+
+import pytest
+
+import audio_source
+import recorder
+from audio_source import PyAudioSource, SyntheticSource
+from kayit_indeksi import KayitIndeksi
+from recorder import SesAyarlari, SesKaydedici
+
+
+class _SahteMotor:
+    """Yalnızca ``hizlar`` içindeki örnekleme hızlarını destekleyen ses motoru"""
+
+    def __init__(self, hizlar):
+        self.hizlar = set(hizlar)
+        self.sorgular = []
+
+    def bicim_destekleniyor(self, cihaz_index, sample_rate, channels, format):
+        self.sorgular.append(sample_rate)
+        return sample_rate in self.hizlar
+
+
+@pytest.fixture(autouse=True)
+def _pyaudio_var(monkeypatch):
+    monkeypatch.setattr(audio_source, "pyaudio", types.SimpleNamespace())
+
+
+def test_desteklenen_hiz_aynen_kullanilir():
+    motor = _SahteMotor({44100, 48000})
+    assert PyAudioSource(motor=motor).desteklenen_hiz(SesAyarlari(sample_rate=44100)) == 44100
+    assert motor.sorgular == [44100]
+
+
+def test_desteklenmeyen_hizda_en_yakin_yedek_secilir():
+    motor = _SahteMotor({16000, 48000})
+    assert PyAudioSource(motor=motor).desteklenen_hiz(SesAyarlari(sample_rate=44100)) == 48000
+    assert PyAudioSource(motor=motor).desteklenen_hiz(SesAyarlari(sample_rate=22050)) == 16000
+
+
+def test_hic_desteklenen_hiz_yoksa_istenen_doner():
+    assert PyAudioSource(motor=_SahteMotor(set())).desteklenen_hiz(SesAyarlari(sample_rate=22050)) == 22050
+
+
+class _YalnizcaKaynak(SyntheticSource):
+    """Her ayarda yalnızca ``hiz_hz`` ile açılabilen sentetik kaynak"""
+
+    def __init__(self, hiz_hz, **kwargs):
+        super().__init__(**kwargs)
+        self.hiz_hz = hiz_hz
+        self.acilan_hizlar = []
+
+    def desteklenen_hiz(self, ayarlar) -> int:
+        return self.hiz_hz
+
+    def baslat(self, ayarlar, callback) -> None:
+        self.acilan_hizlar.append(ayarlar.sample_rate)
+        super().baslat(ayarlar, callback)
+
+
+@pytest.mark.parametrize("diske_akit", [True, False])
+def test_yedek_hiz_ayarlari_degistirmez(tmp_path, monkeypatch, diske_akit):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(recorder, "kayit_indeksi", KayitIndeksi(str(tmp_path / "kayitlar")))
+    kaynak = _YalnizcaKaynak(16000, hiz=0, sure=0.5)
+    ayarlar = SesAyarlari(sample_rate=44100, diske_akit=diske_akit)
+    kaydedici = SesKaydedici(ayarlar=ayarlar, kaynak=kaynak)
+
+    assert kaydedici.kayit_baslat()
+    assert "16000 Hz kullanılıyor" in kaydedici.get_durum().mesaj
+    kaynak.bitti.wait(5)
+    kaydedici.kayit_durdur()
+    basarili, yol = kaydedici.kaydet("yedek")
+
+    assert basarili
+    with wave.open(yol, 'rb') as wf:
+        assert wf.getframerate() == 16000
+        assert wf.getnframes() / wf.getframerate() == pytest.approx(0.5, abs=0.1)
+    assert kaynak.acilan_hizlar == [16000]
+    assert ayarlar.sample_rate == 44100
+
+
+@pytest.mark.parametrize("format", [audio_source.paInt24, audio_source.paInt8, audio_source.paFloat32])
+def test_wav_olarak_yazilamayan_format_reddedilir(format):
+    with pytest.raises(ValueError, match="Desteklenmeyen format"):
+        SesAyarlari(format=format)
+
+
+@pytest.mark.parametrize("format", recorder.DESTEKLENEN_FORMATLAR)
+def test_desteklenen_formatlarin_ornek_genisligi_cozulebilir(format):
+    genislik = audio_source.ORNEK_GENISLIKLERI[SesAyarlari(format=format).format]
+    assert genislik in recorder.OrnekDeposu.VERI_TIPLERI
+    assert recorder.pcm_float(bytes(genislik * 4), genislik).shape == (4,)
@@ -0,0 +1,25 @@
+import os
+
+from batch import MANIFEST_ADI, Manifest, kayitlari_bul
+
+
+def test_manifest_yeniden_acilinca_tamamlananlari_atlar(tmp_path):
+    yol = str(tmp_path / MANIFEST_ADI)
+    manifest = Manifest(yol)
+    manifest.guncelle("a.wav", durum="tamam", boyut=10, mtime=1.0)
+    manifest.guncelle("b.wav", durum="hata", boyut=10, mtime=1.0)
+
+    devam = Manifest(yol)
+    assert devam.tamamlandi("a.wav", 10, 1.0)
+    assert not devam.tamamlandi("a.wav", 12, 2.0)  # Sonradan değişmiş kayıt yeniden işlenir
+    assert not devam.tamamlandi("b.wav", 10, 1.0)
+    assert not devam.tamamlandi("c.wav", 10, 1.0)
+    assert [ad for ad in os.listdir(tmp_path)] == [MANIFEST_ADI]  # Geçici dosya kalmaz
+
+
+def test_kayitlari_bul_gizli_ve_gecici_dosyalari_atlar(tmp_path):
+    for ad in ("b.wav", "a.wav", ".kayit.wav.part", ".gizli.wav", "not.txt", MANIFEST_ADI):
+        (tmp_path / ad).write_bytes(b"")
+    (tmp_path / "klasor.wav").mkdir()
+    assert [e.name for e in kayitlari_bul(str(tmp_path))] == ["a.wav", "b.wav"]
+    assert kayitlari_bul(str(tmp_path / "yok")) == []
@@ -0,0 +1,82 @@
+import os
+import time
+
+from cache import BaytOnbellegi, DiskCache
+
+
+def _yaslandir(onbellek, anahtar, saniye):
+    """Girdinin son erişim zamanını (mtime) geçmişe çeker"""
+    t = time.time() - saniye
+    os.utime(onbellek.yol(anahtar), (t, t))
+
+
+def test_bayt_onbellegi_toplam_boyutla_sinirli():
+    onbellek = BaytOnbellegi(max_bayt=250)
+    for i in range(5):
+        onbellek.al(i, lambda: bytes(100))
+    assert onbellek.toplam_bayt <= 250
+
+    okunan = []
+    onbellek.al(4, lambda: okunan.append(4) or bytes(100))
+    onbellek.al(0, lambda: okunan.append(0) or bytes(100))
+    # Son eklenen önbellekten gelir, en eski olan yeniden üretilir
+    assert okunan == [0]
+
+
+def test_bayt_onbellegi_degeri_kopyalamaz():
+    onbellek = BaytOnbellegi(max_bayt=1000)
+    ilk = onbellek.al("a", lambda: bytes(10))
+    assert onbellek.al("a", lambda: bytes(10)) is ilk
+
+
+def test_sinirdan_buyuk_veri_saklanmaz():
+    onbellek = BaytOnbellegi(max_bayt=50)
+    assert len(onbellek.al("buyuk", lambda: bytes(100))) == 100
+    assert onbellek.toplam_bayt == 0
+
+
+def test_disk_cache_en_eski_erisileni_siler(tmp_path):
+    onbellek = DiskCache(str(tmp_path), uzanti=".txt", max_girdi=2)
+    onbellek.yaz("a", b"1")
+    onbellek.yaz("b", b"2")
+    _yaslandir(onbellek, "a", 20)
+    _yaslandir(onbellek, "b", 10)
+    assert onbellek.bul("a") is not None  # Erişim "a"yı en yeni yapar
+
+    onbellek.yaz("c", b"3")
+    assert onbellek.oku("a") == b"1"
+    assert onbellek.oku("b") is None
+    assert onbellek.oku("c") == b"3"
+
+
+def test_disk_cache_bayt_siniri(tmp_path):
+    onbellek = DiskCache(str(tmp_path), max_bayt=250)
+    for i, anahtar in enumerate("abc"):
+        onbellek.yaz(anahtar, bytes(100))
+        _yaslandir(onbellek, anahtar, 30 - i)
+    onbellek.temizle()
+    assert [onbellek.bul(a) is not None for a in "abc"] == [False, True, True]
+
+
+def test_disk_cache_suresi_dolan_girdi_bulunmaz(tmp_path):
+    onbellek = DiskCache(str(tmp_path), max_yas=60)
+    onbellek.yaz("eski", b"x")
+    _yaslandir(onbellek, "eski", 120)
+    assert onbellek.bul("eski") is None
+    assert not os.path.exists(onbellek.yol("eski"))
+
+
+def test_disk_cache_dinleyici_silinmeden_once_cagrilir(tmp_path):
+    bildirilen = []
+
+    def dinleyici(anahtar, yol):
+        with open(yol, "rb") as f:
+            bildirilen.append((anahtar, f.read()))
+
+    onbellek = DiskCache(str(tmp_path), uzanti=".bin", max_girdi=1, silme_dinleyici=dinleyici)
+    onbellek.yaz("ilk", b"eski veri")
+    _yaslandir(onbellek, "ilk", 10)
+    onbellek.yaz("ikinci", b"yeni veri")
+
+    assert bildirilen == [("ilk", b"eski veri")]
+    assert sorted(os.listdir(tmp_path)) == ["ikinci.bin"]
@@ -0,0 +1,116 @@
+import os
+
+import numpy as np
+import PIL.Image
+
+import painter
+from cache import DiskCache
+from gorsel_deposu import GorselDeposu
+
+
+def _gorsel_ekle(depo, tohum):
+    """Sıkıştırılamayan (gürültü) bir PNG'yi depoya ekler, özetini döndürür"""
+    piksel = np.random.default_rng(tohum).integers(0, 256, (96, 96, 3), dtype=np.uint8)
+    fd, gecici = depo.gecici_dosya()
+    with os.fdopen(fd, "wb") as f:
+        PIL.Image.fromarray(piksel).save(f, format="PNG")
+    return depo.ekle(gecici)
+
+
+def test_depo_bayt_sinirinda_kalir(tmp_path):
+    olcu = GorselDeposu(str(tmp_path / "olcu"))
+    _gorsel_ekle(olcu, 0)
+    tek_girdi = olcu.toplam_bayt()
+
+    depo = GorselDeposu(str(tmp_path / "store"), max_bayt=int(tek_girdi * 3.5))
+    ozetler = []
+    for tohum in range(10):
+        ozetler.append(_gorsel_ekle(depo, tohum))
+        assert depo.toplam_bayt() <= depo.max_bayt
+
+    # En son eklenenler varyantlarıyla birlikte durur, en eskiler tamamen silinir
+    assert depo.bul(ozetler[-1], "kucuk") is not None
+    assert not depo.var_mi(ozetler[0])
+    assert not [e for e in os.scandir(os.path.dirname(depo.yol(ozetler[0])))
+                if e.name.startswith(ozetler[0])]
+
+
+def test_erisilen_gorsel_once_silinmez(tmp_path):
+    olcu = GorselDeposu(str(tmp_path / "olcu"))
+    _gorsel_ekle(olcu, 0)
+    depo = GorselDeposu(str(tmp_path / "store"), max_bayt=int(olcu.toplam_bayt() * 2.5))
+
+    ilk = _gorsel_ekle(depo, 1)
+    ikinci = _gorsel_ekle(depo, 2)
+    os.utime(depo.yol(ilk), (1, 1))
+    os.utime(depo.yol(ikinci), (2, 2))
+    depo.bul(ilk)  # ilk yeniden erişildi, en eski artık ikinci
+    _gorsel_ekle(depo, 3)
+
+    assert depo.var_mi(ilk)
+    assert not depo.var_mi(ikinci)
+
+
+def test_son_referansi_dusen_gorsel_silinir(tmp_path, monkeypatch):
+    depo = GorselDeposu(str(tmp_path / "store"))
+    cache = DiskCache(str(tmp_path / "cache"), uzanti=".ref", max_girdi=2,
+                      silme_dinleyici=painter._ref_silindi)
+    monkeypatch.setattr(painter, "gorsel_deposu", depo)
+    monkeypatch.setattr(painter, "gorsel_cache", cache)
+
+    ortak, tekil = _gorsel_ekle(depo, 0), _gorsel_ekle(depo, 1)
+    painter._cache_yaz("a", ortak)
+    os.utime(cache.yol("a"), (1, 1))
+    painter._cache_yaz("b", ortak)
+    os.utime(cache.yol("b"), (2, 2))
+    painter._cache_yaz("c", tekil)
+
+    # "a" düştü ama "b" aynı görsele işaret ediyor
+    assert not os.path.exists(cache.yol("a"))
+    assert depo.var_mi(ortak)
+
+    os.utime(cache.yol("b"), (3, 3))
+    painter._cache_yaz("d", tekil)
+    assert not os.path.exists(cache.yol("b"))
+    assert not depo.var_mi(ortak)
+    assert depo.var_mi(tekil)
+
+
+def test_referansli_gorsel_bayt_siniriyla_silinmez(tmp_path):
+    olcu = GorselDeposu(str(tmp_path / "olcu"))
+    _gorsel_ekle(olcu, 0)
+    depo = GorselDeposu(str(tmp_path / "store"), max_bayt=int(olcu.toplam_bayt() * 2.5))
+
+    arsivdeki = _gorsel_ekle(depo, 1)
+    depo.referans_ekle(arsivdeki, "kayit:a.wav")
+    os.utime(depo.yol(arsivdeki), (1, 1))
+    for tohum in range(2, 6):
+        _gorsel_ekle(depo, tohum)
+
+    assert depo.var_mi(arsivdeki)
+    assert depo.toplam_bayt() <= depo.max_bayt
+
+
+def test_onbellek_temizligi_okumayi_kilit_disinda_yapar(tmp_path, monkeypatch):
+    depo = GorselDeposu(str(tmp_path / "store"))
+    okunan_ref = []
+
+    def dinleyici(anahtar, yol):
+        assert not cache._lock.locked()
+        okunan_ref.append(anahtar)
+        painter._ref_silindi(anahtar, yol)
+
+    cache = DiskCache(str(tmp_path / "cache"), uzanti=".ref", max_girdi=100, silme_dinleyici=dinleyici)
+    monkeypatch.setattr(painter, "gorsel_deposu", depo)
+    monkeypatch.setattr(painter, "gorsel_cache", cache)
+
+    ozet = _gorsel_ekle(depo, 0)
+    for i in range(120):
+        painter._cache_yaz(f"k{i:03d}", ozet)
+        os.utime(cache.yol(f"k{i:03d}"), (i + 1, i + 1))
+    cache.temizle()
+
+    # Düşen her girdi için yalnızca kendisi okunur; görsel son referansa kadar durur
+    assert sorted(okunan_ref) == [f"k{i:03d}" for i in range(20)]
+    assert depo.referans_sayisi(ozet) == 100
+    assert depo.var_mi(ozet)
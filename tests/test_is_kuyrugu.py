@@ -0,0 +1,114 @@
+import threading
+import time
+from concurrent.futures import Future
+
+import pytest
+
+import is_kuyrugu
+from is_kuyrugu import GORSEL, SIRADA, TAMAM, TRANSKRIPT, IsKuyrugu
+
+
+class _SahtePipeline:
+    """gonder() çağrılarını sayan, sonuçları ``serbest`` olayına kadar bekleten pipeline"""
+
+    def __init__(self):
+        self.gonderilenler = []
+        self.serbest = threading.Event()
+        self.serbest.set()
+
+    def gonder(self, ses_yolu, transkript=None, **secenekler):
+        self.gonderilenler.append(ses_yolu)
+        transkript_f, gorsel_f = Future(), Future()
+
+        def bitir():
+            self.serbest.wait(5)
+            transkript_f.set_result(transkript or "metin")
+            gorsel_f.set_result(ses_yolu + ".png")
+
+        threading.Thread(target=bitir, daemon=True).start()
+        return type("GorselIsi", (), {"transkript": transkript_f, "gorsel": gorsel_f})()
+
+
+@pytest.fixture
+def kayit(tmp_path):
+    yol = tmp_path / "a.wav"
+    yol.write_bytes(b"ses")
+    return str(yol)
+
+
+def _bitene_kadar(kuyruk, is_id, sure=5.0):
+    son = time.monotonic() + sure
+    while time.monotonic() < son:
+        is_ = kuyruk.durum(is_id)
+        if is_.bitti:
+            return is_
+        time.sleep(0.02)
+    raise AssertionError("iş bitmedi")
+
+
+def test_ayni_kayit_ve_ayarlar_tek_is(tmp_path, kayit):
+    kuyruk = IsKuyrugu(_SahtePipeline(), "anahtar", db_yolu=str(tmp_path / "isler.db"), calisan_sayisi=0)
+    ilk = kuyruk.ekle(kayit, preprocess=True)
+    assert kuyruk.ekle(kayit, preprocess=True) == ilk
+    assert kuyruk.ekle(kayit, preprocess=False) != ilk
+    kuyruk.kapat()
+
+
+def test_is_tamamlanir(tmp_path, kayit):
+    pipeline = _SahtePipeline()
+    kuyruk = IsKuyrugu(pipeline, "anahtar", db_yolu=str(tmp_path / "isler.db"), calisan_sayisi=1)
+    is_ = _bitene_kadar(kuyruk, kuyruk.ekle(kayit))
+    kuyruk.kapat()
+    assert (is_.durum, is_.transkript, is_.gorsel) == (TAMAM, "metin", kayit + ".png")
+
+
+def test_yeni_nesne_suren_isi_yeniden_siraya_almaz(tmp_path, kayit):
+    db = str(tmp_path / "isler.db")
+    pipeline = _SahtePipeline()
+    pipeline.serbest.clear()
+    birinci = IsKuyrugu(pipeline, "anahtar", db_yolu=db, calisan_sayisi=1)
+    is_id = birinci.ekle(kayit)
+    while birinci.durum(is_id).durum == SIRADA:
+        time.sleep(0.01)
+
+    # Aynı veritabanını açan ikinci nesne (ör. başka bir Streamlit oturumu / batch süreci)
+    ikinci_pipeline = _SahtePipeline()
+    ikinci = IsKuyrugu(ikinci_pipeline, "anahtar", db_yolu=db, calisan_sayisi=1)
+    time.sleep(0.2)
+    assert birinci.durum(is_id).durum in (TRANSKRIPT, GORSEL)
+
+    pipeline.serbest.set()
+    assert _bitene_kadar(birinci, is_id).durum == TAMAM
+    ikinci.kapat()
+    birinci.kapat()
+    assert pipeline.gonderilenler == [kayit]
+    assert ikinci_pipeline.gonderilenler == []
+
+
+def test_kirasi_dolan_is_yeniden_siraya_alinir(tmp_path, kayit):
+    db = str(tmp_path / "isler.db")
+    eski = IsKuyrugu(_SahtePipeline(), "anahtar", db_yolu=db, calisan_sayisi=0)
+    is_id = eski.ekle(kayit)
+    # Önceki süreç işi almış ve kira süresinden uzun süre önce çökmüş
+    eski._guncelle(is_id, durum=TRANSKRIPT)
+    eski._db.execute("UPDATE isler SET guncelleme = ? WHERE id = ?", (time.time() - 2 * is_kuyrugu.KIRA_SURESI, is_id))
+    eski._db.commit()
+    eski.kapat()
+
+    pipeline = _SahtePipeline()
+    kuyruk = IsKuyrugu(pipeline, "anahtar", db_yolu=db, calisan_sayisi=1)
+    assert _bitene_kadar(kuyruk, is_id).durum == TAMAM
+    kuyruk.kapat()
+    assert pipeline.gonderilenler == [kayit]
+
+
+def test_uzun_is_kirasini_yeniler(tmp_path, kayit):
+    pipeline = _SahtePipeline()
+    pipeline.serbest.clear()
+    kuyruk = IsKuyrugu(pipeline, "anahtar", db_yolu=str(tmp_path / "isler.db"), calisan_sayisi=1, kira_suresi=0.3)
+    is_id = kuyruk.ekle(kayit)
+    time.sleep(1.0)  # Kira süresinin birkaç katı; çalışan kirayı yenilediği için iş yeniden alınmaz
+    pipeline.serbest.set()
+    assert _bitene_kadar(kuyruk, is_id).durum == TAMAM
+    kuyruk.kapat()
+    assert pipeline.gonderilenler == [kayit]
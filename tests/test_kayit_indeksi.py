@@ -0,0 +1,74 @@
+import os
+import wave
+
+import pytest
+
+from kayit_indeksi import KayitIndeksi
+
+
+def _kayit(klasor, ad, sure=1.0, sample_rate=8000):
+    yol = os.path.join(klasor, ad)
+    with wave.open(yol, 'wb') as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(sample_rate)
+        wf.writeframes(bytes(2 * int(sure * sample_rate)))
+    return yol
+
+
+@pytest.fixture
+def indeks(tmp_path):
+    indeks = KayitIndeksi(str(tmp_path))
+    yield indeks
+    indeks.kapat()
+
+
+@pytest.fixture
+def okunanlar(indeks, monkeypatch):
+    """Başlığı okunan (stat + wav_bilgisi) dosya adları"""
+    adlar = []
+    yaz = indeks._yaz
+    monkeypatch.setattr(indeks, "_yaz", lambda ad, boyut, mtime: (adlar.append(ad), yaz(ad, boyut, mtime)))
+    return adlar
+
+
+def test_yeni_ve_silinen_kayitlar_eslenir(indeks, tmp_path):
+    _kayit(str(tmp_path), "a.wav", sure=1.0)
+    _kayit(str(tmp_path), "b.wav", sure=2.0)
+    assert indeks.senkronize() == 2
+    assert [k["ad"] for k in indeks.listele(siralama="sure")] == ["b.wav", "a.wav"]
+
+    os.remove(tmp_path / "a.wav")
+    assert indeks.senkronize() == 1
+    assert [k["ad"] for k in indeks.listele()] == ["b.wav"]
+
+
+def test_degismeyen_klasor_taranmaz(indeks, tmp_path, okunanlar):
+    _kayit(str(tmp_path), "a.wav")
+    indeks.senkronize()
+    assert indeks.senkronize() == 0
+    assert okunanlar == ["a.wav"]
+
+
+def test_gizli_dosyalar_bilinen_kayitlari_yeniden_okutmaz(indeks, tmp_path, okunanlar):
+    for i in range(3):
+        _kayit(str(tmp_path), f"k{i}.wav")
+    indeks.senkronize()
+    okunanlar.clear()
+
+    # Kayıt sürerken yazılan .part dosyası ve veritabanının WAL dosyaları klasör mtime'ını değiştirir
+    (tmp_path / ".kayit_1.wav.part").write_bytes(b"RIFF")
+    os.utime(tmp_path / "k0.wav", (1, 1))  # Bilinen kayıtlara stat yapılmadığını gösterir
+    assert indeks.senkronize() == 0
+    os.replace(_kayit(str(tmp_path), ".kayit_2.wav.part"), tmp_path / "yeni.wav")
+    assert indeks.senkronize() == 1
+    assert okunanlar == ["yeni.wav"]
+
+
+def test_yerinde_degisen_dosya_zorla_ile_guncellenir(indeks, tmp_path):
+    yol = _kayit(str(tmp_path), "a.wav", sure=1.0)
+    indeks.senkronize()
+    _kayit(str(tmp_path), "a.wav", sure=3.0)
+    os.utime(yol, (1, 1))
+    assert indeks.senkronize(zorla=True) == 1
+    assert indeks.listele()[0]["sure"] == pytest.approx(3.0)
@@ -0,0 +1,82 @@
+import time
+import types
+import wave
+
+import numpy as np
+import pytest
+
+import transcriptor
+from cache import DiskCache
+from live_transcription import CanliTranskriptci
+from pipeline import GorselPipeline
+from recorder import SesSegmenti
+
+
+class _SahteIstemci:
+    """audio.transcriptions.create çağrısını ``gecikme`` kadar bekletip bölüm sırasını döndürür"""
+
+    def __init__(self, gecikme=0.0):
+        self.gecikme = gecikme
+        self.audio = types.SimpleNamespace(transcriptions=self)
+
+    def create(self, model, file, language):
+        time.sleep(self.gecikme)
+        return types.SimpleNamespace(text=file[0].split("_")[1].split(".")[0])
+
+
+def _segment(sira, son=False):
+    veri = np.full(1600, 1000, dtype=np.int16).tobytes()
+    return SesSegmenti(veri=veri, sira=sira, sample_rate=16000, channels=1, ornek_genisligi=2,
+                       konusma_var=True, son=son)
+
+
+def test_son_bolum_gelmezse_zaman_asimi():
+    canli = CanliTranskriptci(_SahteIstemci())
+    canli.segment_ekle(_segment(0))
+    with pytest.raises(TimeoutError):
+        canli.bitir(timeout=0.2)
+
+
+def test_zaman_asimi_tum_bekleme_icin_tek_sinir():
+    # Her bölüm ayrı ayrı sınırın altında sürse de toplam süre aşılırsa eksik metin dönmez
+    canli = CanliTranskriptci(_SahteIstemci(gecikme=0.3), max_workers=1)
+    for sira in range(3):
+        canli.segment_ekle(_segment(sira, son=sira == 2))
+    baslangic = time.monotonic()
+    with pytest.raises(TimeoutError):
+        canli.bitir(timeout=0.5)
+    assert time.monotonic() - baslangic < 0.8
+
+
+def test_bitince_transkript_onbellege_yazilir(tmp_path, monkeypatch):
+    monkeypatch.setattr(transcriptor, "transkript_cache", DiskCache(str(tmp_path / "cache"), uzanti=".txt"))
+    kayit = str(tmp_path / "kayit.wav")
+    with wave.open(kayit, 'wb') as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(16000)
+        wf.writeframes(_segment(0).veri)
+
+    canli = CanliTranskriptci(_SahteIstemci())
+    canli.segment_ekle(_segment(0))
+    canli.segment_ekle(_segment(1, son=True))
+    # Uygulamanın varsayılanı: ön işleme + sessizlik kırpma, uzun kayıtlar bölümlenerek
+    secenekler = dict(preprocess=True, trim_silence=True, max_segment_s=transcriptor.MAX_SEGMENT_S)
+    metin = canli.bitir(timeout=5, dosya_yolu=kayit, **secenekler)
+
+    # Aynı seçeneklerle yapılan çağrı API'ye gitmeden önbellekten döner
+    assert transcriptor.transcribe_segmented(kayit, None, **secenekler) == metin
+
+
+def test_pipeline_secenekleri_ile_yazilan_transkript_bulunur(tmp_path, monkeypatch):
+    monkeypatch.setattr(transcriptor, "transkript_cache", DiskCache(str(tmp_path / "cache"), uzanti=".txt"))
+    kayit = str(tmp_path / "kayit.wav")
+    with open(kayit, "wb") as f:
+        f.write(b"ses")
+    pipeline = types.SimpleNamespace(languages="tr", preprocess=False, trim_silence=False,
+                                     max_segment_s=transcriptor.MAX_SEGMENT_S)
+    secenekler = GorselPipeline.transkript_secenekleri(pipeline, preprocess=True, trim_silence=True)
+
+    CanliTranskriptci(_SahteIstemci()).cache_yaz(kayit, "canlı metin", **secenekler)
+    assert transcriptor.transcribe_segmented(kayit, None, preprocess=True, trim_silence=True,
+                                             max_segment_s=transcriptor.MAX_SEGMENT_S) == "canlı metin"
@@ -0,0 +1,49 @@
+import json
+
+import pytest
+
+from metrikler import SURE_KOVALARI, AsamaMetrikleri, Histogram
+
+
+def test_histogram_yuzdeligi_kova_icinde_ara_degerler():
+    h = Histogram((1.0, 2.0, 4.0))
+    for deger in (0.5, 1.5, 1.5, 3.0):
+        h.gozlem(deger)
+    assert h.kovalar == [1, 2, 1, 0]
+    assert h.yuzdelik(0.5) == pytest.approx(1.5)  # 2. gözlem, (1, 2] kovasının ortası
+    assert h.yuzdelik(1.0) == pytest.approx(4.0)
+    assert Histogram((1.0,)).yuzdelik(0.5) is None
+
+
+def test_olc_hatayi_ayri_sonucla_kaydeder(tmp_path):
+    yol = tmp_path / "metrik.jsonl"
+    metrikler = AsamaMetrikleri(str(yol))
+    with metrikler.olc("transkripsiyon", bayt=2048):
+        pass
+    with pytest.raises(RuntimeError):
+        with metrikler.olc("transkripsiyon"):
+            raise RuntimeError("api")
+    with metrikler.olc("transkripsiyon") as olcum:
+        olcum.sonuc = "onbellek"
+    metrikler.say("yeniden_deneme.gorsel", 2)
+    metrikler.jsonl_ac(None)
+
+    ozet = metrikler.ozet()["transkripsiyon"]
+    assert (ozet["adet"], ozet["hata"], ozet["ort_bayt"]) == (3, 1, 2048)
+    kayitlar = [json.loads(satir) for satir in yol.read_text(encoding="utf-8").splitlines()]
+    assert [k.get("sonuc") for k in kayitlar] == ["tamam", "hata", "onbellek", None]
+    assert kayitlar[-1]["olay"] == "yeniden_deneme.gorsel"
+
+
+def test_prometheus_histogram_birikimli_ve_etiketler_kacisli():
+    metrikler = AsamaMetrikleri()
+    metrikler.kaydet('gorsel "dall-e"', 0.3)
+    metrikler.kaydet('gorsel "dall-e"', 100.0)
+    metin = metrikler.prometheus()
+
+    etiket = 'asama="gorsel \\"dall-e\\"",sonuc="tamam"'
+    assert f'vocasso_asama_toplam{{{etiket}}} 2' in metin
+    assert f'vocasso_asama_sure_saniye_bucket{{{etiket},le="0.5"}} 1' in metin
+    assert f'vocasso_asama_sure_saniye_bucket{{{etiket},le="+Inf"}} 2' in metin
+    kova_satirlari = [s for s in metin.splitlines() if s.startswith("vocasso_asama_sure_saniye_bucket")]
+    assert len(kova_satirlari) == len(SURE_KOVALARI) + 1
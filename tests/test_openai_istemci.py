@@ -0,0 +1,91 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+import openai_istemci
+from openai_istemci import AsyncSinirliTransport, Sinirlayici, SinirliTransport
+
+
+def _sayan(yanitlar):
+    """Sırayla verilen yanıtları (veya hataları) döndüren, istekleri sayan sahte transport"""
+    istekler = []
+
+    def isle(request):
+        istekler.append(time.monotonic())
+        yanit = yanitlar[min(len(istekler), len(yanitlar)) - 1]
+        if isinstance(yanit, Exception):
+            raise yanit
+        return yanit
+
+    return istekler, isle
+
+
+def _istemci(isle, sinirlayici=None):
+    return httpx.Client(transport=SinirliTransport(sinirlayici or Sinirlayici(), httpx.MockTransport(isle)),
+                        base_url="http://api")
+
+
+@pytest.fixture(autouse=True)
+def _kisa_bekleme(monkeypatch):
+    monkeypatch.setattr(openai_istemci, "TABAN_BEKLEME", 0.01)
+
+
+def test_429_retry_after_kadar_bekleyip_yeniden_dener():
+    istekler, isle = _sayan([httpx.Response(429, headers={"retry-after": "0.3"}), httpx.Response(200)])
+    sinirlayici = Sinirlayici()
+    yanit = _istemci(isle, sinirlayici).post("/v1/images/generations")
+
+    assert yanit.status_code == 200
+    assert len(istekler) == 2
+    assert istekler[1] - istekler[0] >= 0.3
+    assert sinirlayici.istatistikler()["/images/generations"]["reddedilen"] == 1
+
+
+def test_retry_after_ms_saniyeden_once_gelir():
+    yanit = httpx.Response(429, headers={"retry-after-ms": "150", "retry-after": "9"})
+    assert openai_istemci._retry_after(yanit) == pytest.approx(0.15)
+
+
+@pytest.mark.parametrize("durum", [409, 500, 502, 504])
+def test_post_sunucu_hatasinda_yeniden_gonderilmez(durum):
+    istekler, isle = _sayan([httpx.Response(durum), httpx.Response(200)])
+    assert _istemci(isle).post("/v1/audio/transcriptions").status_code == durum
+    assert len(istekler) == 1
+
+
+@pytest.mark.parametrize("durum", [408, 429, 503])
+def test_post_islenmedigi_belli_hatada_yeniden_denenir(durum):
+    istekler, isle = _sayan([httpx.Response(durum), httpx.Response(200)])
+    assert _istemci(isle).post("/v1/audio/transcriptions").status_code == 200
+    assert len(istekler) == 2
+
+
+def test_get_sunucu_hatasinda_yeniden_denenir():
+    istekler, isle = _sayan([httpx.Response(502), httpx.Response(200)])
+    assert _istemci(isle).get("/v1/models").status_code == 200
+    assert len(istekler) == 2
+
+
+def test_post_yalnizca_baglanti_kurulamadiysa_yeniden_denenir():
+    istekler, isle = _sayan([httpx.ConnectError("bağlanamadı"), httpx.Response(200)])
+    assert _istemci(isle).post("/v1/images/generations").status_code == 200
+    assert len(istekler) == 2
+
+    istekler, isle = _sayan([httpx.ReadTimeout("yanıt gelmedi"), httpx.Response(200)])
+    with pytest.raises(httpx.ReadTimeout):
+        _istemci(isle).post("/v1/images/generations")
+    assert len(istekler) == 1
+
+
+def test_asenkron_transport_ayni_kurallari_uygular():
+    istekler, isle = _sayan([httpx.Response(500), httpx.Response(200)])
+
+    async def gonder():
+        async with httpx.AsyncClient(transport=AsyncSinirliTransport(Sinirlayici(), httpx.MockTransport(isle)),
+                                     base_url="http://api") as istemci:
+            return (await istemci.post("/v1/images/generations")).status_code
+
+    assert asyncio.run(gonder()) == 500
+    assert len(istekler) == 1
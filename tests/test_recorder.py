@@ -0,0 +1,63 @@
+import os
+import wave
+
+import pytest
+
+from recorder import ArtimliWavYazici, HalkaTampon
+
+
+def test_halka_tampon_sinirdan_sarilarak_sirayi_korur():
+    halka = HalkaTampon(10)
+    assert halka.yaz(b"abcdef")
+    assert halka.oku() == b"abcdef"
+
+    # Yazma konumu 6'da: 7 bayt sona 4, başa 3 bayt olarak bölünür
+    assert halka.yaz(b"0123456")
+    assert halka.dolu == 7
+    assert halka.oku() == b"0123456"
+    assert halka.dolu == 0
+    assert halka.oku() == b""
+
+
+def test_halka_tampon_dolunca_yazmayi_reddeder():
+    halka = HalkaTampon(8)
+    assert halka.yaz(b"12345")
+    assert not halka.yaz(b"6789")  # Kısmen bile yazılmaz
+    assert halka.yaz(b"678")
+    assert halka.oku() == b"12345678"
+
+
+def test_halka_tampon_uzun_akista_veri_kaybetmez():
+    halka = HalkaTampon(64)
+    yazilan, okunan = bytearray(), bytearray()
+    for i in range(500):
+        parca = os.urandom(1 + i % 23)
+        if not halka.yaz(parca):
+            okunan += halka.oku()
+            assert halka.yaz(parca)
+        yazilan += parca
+    okunan += halka.oku()
+    assert okunan == yazilan
+
+
+@pytest.mark.parametrize("kapasite", [1, 3])
+def test_halka_tampon_kapasite_kadar_veri_alir(kapasite):
+    halka = HalkaTampon(kapasite)
+    assert halka.yaz(bytes(kapasite))
+    assert not halka.yaz(b"x")
+
+
+def test_artimli_wav_yazici_basligi_kapatinca_duzeltir(tmp_path):
+    yol = str(tmp_path / "kayit.wav")
+    yazici = ArtimliWavYazici(yol, channels=2, ornek_genisligi=2, sample_rate=16000)
+    parcalar = [os.urandom(4 * 160) for _ in range(25)]
+    for parca in parcalar:
+        yazici.ekle(parca)
+    assert yazici.yazilan_bayt == 25 * 640
+    yazici.kapat()
+    yazici.kapat()  # İkinci kapatma zararsız
+
+    with wave.open(yol, 'rb') as wf:
+        assert (wf.getnchannels(), wf.getsampwidth(), wf.getframerate()) == (2, 2, 16000)
+        assert wf.getnframes() == 25 * 160
+        assert wf.readframes(wf.getnframes()) == b"".join(parcalar)
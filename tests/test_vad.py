@@ -0,0 +1,52 @@
+import wave
+
+import numpy as np
+import pytest
+
+import vad
+
+HZ = 16000
+KONUSMA_S = 3.0
+BOSLUK_S = 3.0
+
+
+def _gurultulu_kayit(yol, gurultu_dbfs, sure=60.0):
+    """KONUSMA_S konuşma benzeri ton + BOSLUK_S sessizlik döngüsü, tamamına gürültü eklenmiş"""
+    rng = np.random.default_rng(0)
+    t = np.arange(int(sure * HZ)) / HZ
+    ton = 0.25 * (np.sin(2 * np.pi * 220 * t) + 0.5 * np.sin(2 * np.pi * 660 * t))
+    konusma = (t % (KONUSMA_S + BOSLUK_S)) < KONUSMA_S
+    gurultu = rng.standard_normal(len(t)) * 10 ** (gurultu_dbfs / 20)
+    sinyal = np.where(konusma, ton, 0.0) + gurultu
+    with wave.open(str(yol), "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(HZ)
+        wf.writeframes((np.clip(sinyal, -1, 1) * 32767).astype("<i2").tobytes())
+    return str(yol)
+
+
+@pytest.mark.parametrize("gurultu_dbfs", [-61.0, -50.0, -41.0])
+def test_hisirtili_kayitta_sessizlik_kirpilir(tmp_path, gurultu_dbfs):
+    yol = _gurultulu_kayit(tmp_path / "kayit.wav", gurultu_dbfs)
+    sonuc = vad.sessizligi_kirp(yol, cikis_klasoru=str(tmp_path))
+
+    # 30 sn konuşma + 10 duraklamanın her birinden en fazla ~0.8 sn
+    assert sonuc.onceki_sure == pytest.approx(60.0)
+    assert sonuc.sonraki_sure < 45.0
+    assert sonuc.sonraki_sure >= 30.0
+
+
+def test_gurultulu_kayit_sessizliklerden_bolunur(tmp_path):
+    yol = _gurultulu_kayit(tmp_path / "kayit.wav", -50.0)
+    araliklar = vad.bolumlere_ayir(yol, max_sure=10.0)
+
+    assert len(araliklar) > 1
+    donem = KONUSMA_S + BOSLUK_S
+    for bas, son in araliklar:
+        assert (son - bas) / HZ <= 10.0
+        for kesim in (bas, son):
+            if kesim in (0, 60 * HZ):
+                continue
+            # Kesim noktası konuşmanın ortasında değil, sessiz boşlukta olmalı
+            assert KONUSMA_S < (kesim / HZ) % donem < donem
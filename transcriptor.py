@@ -1,18 +1,262 @@
-from openai import OpenAI
+import asyncio,logging,os,time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import openai_istemci
+import metrikler
+from cache import DiskCache, anahtar_olustur, dosya_ozeti
+import audio_preprocess, vad
+
+logger = logging.getLogger(__name__)
 
 client=None
 def set_OpenAI_api_key(api_key):
     global client
-    client = OpenAI(api_key=api_key)
+    # Aynı anahtar için süreç genelinde tek, hız sınırına duyarlı istemci
+    client = openai_istemci.istemci(api_key)
     return client
 
-def transcribe(audio_file,client,languages="tr"):
+def create_async_client(api_key, base_url=None):
+    return openai_istemci.async_istemci(api_key, base_url)
+
+# Aynı ses / model / dil için transkript tekrar istenmez
+transkript_cache = DiskCache(
+    ".cache/transkript",
+    uzanti=".txt",
+    max_girdi=2000,
+    max_bayt=50 * 1024 * 1024,
+    max_yas=30 * 24 * 3600
+)
+
+# Son transkripsiyonların boyut ve süre ölçümleri (en yeni sonda)
+olcumler = deque(maxlen=100)
+
+def cache_anahtari(audio_file, model, languages, secenekler=""):
+    parcalar = [dosya_ozeti(audio_file), model, languages or ""]
+    if secenekler:
+        parcalar.append(secenekler)
+    return anahtar_olustur(*parcalar)
+
+def _onbellekten(audio_file, model, languages, secenekler):
+    """(önbellek anahtarı, varsa önbellekteki transkript); dosya özeti de bu aşamada okunur"""
+    with metrikler.olc("transkript.onbellek") as olcum:
+        anahtar = cache_anahtari(audio_file, model, languages, secenekler)
+        onceki = transkript_cache.oku(anahtar)
+        olcum.sonuc = "iska" if onceki is None else "isabet"
+    return anahtar, None if onceki is None else onceki.decode("utf-8")
+
+def _secenekler(preprocess, compress, trim_silence, vad_ayarlari):
+    secenekler = []
+    if preprocess:
+        secenekler.append(f"{audio_preprocess.HEDEF_HZ}hz-mono-{compress or 'wav'}")
+    if trim_silence:
+        secenekler.append((vad_ayarlari or vad.VadAyarlari()).anahtar())
+    return "|".join(secenekler)
+
+def _prepare_upload(audio_file, preprocess, compress, trim_silence, vad_ayarlari):
+    """Yüklenecek dosyayı hazırlar: (yol, ölçüm, silinecek geçici dosyalar)
+
+    Önce örnekleme hızı düşürülür, sessizlik kırpma daha küçük dosyada yapılır."""
+    boyut = os.path.getsize(audio_file)
+    olcum = {"on_isleme": preprocess, "sessizlik_kirpma": trim_silence,
+             "onceki_bayt": boyut, "yuklenen_bayt": boyut, "on_isleme_s": 0.0}
+    yol, geciciler = audio_file, []
+    try:
+        if preprocess:
+            # Sessizlik kırpılacaksa sıkıştırma en sona bırakılır
+            sonuc = audio_preprocess.on_isle(yol, sikistir=None if trim_silence else compress)
+            yol = sonuc.yol
+            geciciler.append(yol)
+            olcum["on_isleme_s"] += sonuc.islem_s
+        if trim_silence:
+            sonuc = vad.sessizligi_kirp(yol, vad_ayarlari)
+            yol = sonuc.yol
+            geciciler.append(yol)
+            olcum["on_isleme_s"] += sonuc.islem_s
+            olcum["onceki_sure"] = sonuc.onceki_sure
+            olcum["kirpilmis_sure"] = sonuc.sonraki_sure
+            if compress:
+                baslangic = time.perf_counter()
+                kodlanmis = audio_preprocess.kodla(yol, compress)
+                if kodlanmis:
+                    yol = kodlanmis
+                    geciciler.append(yol)
+                olcum["on_isleme_s"] += time.perf_counter() - baslangic
+    except BaseException:
+        _cleanup(geciciler)
+        if preprocess or trim_silence:
+            metrikler.kaydet("transkript.on_isleme", olcum["on_isleme_s"], boyut, sonuc="hata")
+        raise
+    if preprocess or trim_silence:
+        metrikler.kaydet("transkript.on_isleme", olcum["on_isleme_s"], boyut)
+    olcum["yuklenen_bayt"] = os.path.getsize(yol)
+    return yol, olcum, geciciler
+
+def _cleanup(geciciler):
+    for yol in geciciler:
+        try:
+            os.remove(yol)
+        except OSError:
+            pass
+
+def _record(audio_file, olcum, api_suresi, geciciler):
+    _cleanup(geciciler)
+    olcum["api_s"] = api_suresi
+    olcumler.append(olcum)
+    logger.info("Transkript alındı: %s (%s)", audio_file, olcum)
+
+def transcribe(audio_file,client,languages="tr",model="gpt-4o-mini-transcribe",use_cache=True,
+               preprocess=False,compress=None,trim_silence=False,vad_ayarlari=None):
+
+    secenekler = _secenekler(preprocess, compress, trim_silence, vad_ayarlari)
+    anahtar, onceki = _onbellekten(audio_file, model, languages, secenekler) if use_cache else (None, None)
+    if onceki is not None:
+        return onceki
+
+    yuklenecek, olcum, geciciler = _prepare_upload(audio_file, preprocess, compress, trim_silence, vad_ayarlari)
+    baslangic = time.perf_counter()
+    try:
+        with metrikler.olc("transkript.api", bayt=olcum["yuklenen_bayt"]), open(yuklenecek,'rb') as f:
+            AI_generated = client.audio.transcriptions.create(
+                model=model,
+                file=f,
+                language=languages
+            )
+    finally:
+        _record(audio_file, olcum, time.perf_counter() - baslangic, geciciler)
+
+    if anahtar:
+        transkript_cache.yaz(anahtar, AI_generated.text.encode("utf-8"))
+    return AI_generated.text
+
+async def atranscribe(audio_file,client,languages="tr",model="gpt-4o-mini-transcribe",use_cache=True,
+                      preprocess=False,compress=None,trim_silence=False,vad_ayarlari=None):
+    """transcribe'ın AsyncOpenAI istemcisiyle çalışan karşılığı"""
+
+    # Dosya özeti ve ön işleme büyük kayıtlarda uzun sürebilir, event loop'u bloklamasın
+    secenekler = _secenekler(preprocess, compress, trim_silence, vad_ayarlari)
+    anahtar, onceki = (await asyncio.to_thread(_onbellekten, audio_file, model, languages, secenekler)
+                       if use_cache else (None, None))
+    if onceki is not None:
+        return onceki
+
+    yuklenecek, olcum, geciciler = await asyncio.to_thread(_prepare_upload, audio_file, preprocess, compress,
+                                                           trim_silence, vad_ayarlari)
+    baslangic = time.perf_counter()
+    try:
+        with metrikler.olc("transkript.api", bayt=olcum["yuklenen_bayt"]), open(yuklenecek,'rb') as f:
+            AI_generated = await client.audio.transcriptions.create(
+                model=model,
+                file=f,
+                language=languages
+            )
+    finally:
+        _record(audio_file, olcum, time.perf_counter() - baslangic, geciciler)
 
-    audio_file = open(audio_file,'rb')
-    AI_generated = client.audio.transcriptions.create(
-        model="gpt-4o-mini-transcribe",
-        file=audio_file,
-        language=languages
-    )
+    if anahtar:
+        transkript_cache.yaz(anahtar, AI_generated.text.encode("utf-8"))
     return AI_generated.text
 
+# Uzun kayıtlar bu süre / boyut sınırının altındaki bölümlere ayrılarak gönderilir
+MAX_SEGMENT_S = 120.0
+MAX_SEGMENT_BYTES = 24 * 1024 * 1024
+
+def _segment_secenekleri(secenekler, max_segment_s, max_segment_bytes):
+    return f"{secenekler}|seg{max_segment_s:g}/{max_segment_bytes}"
+
+def onbellek_secenekleri(preprocess=False, compress=None, trim_silence=False, vad_ayarlari=None,
+                         max_segment_s=None, max_segment_bytes=MAX_SEGMENT_BYTES):
+    """Önbellek anahtarının seçenek kısmı; max_segment_s verilirse transcribe_segmented'ınki"""
+    secenekler = _secenekler(preprocess, compress, trim_silence, vad_ayarlari)
+    if max_segment_s:
+        secenekler = _segment_secenekleri(secenekler, max_segment_s, max_segment_bytes)
+    return secenekler
+
+def onbellege_yaz(audio_file, metin, languages="tr", model="gpt-4o-mini-transcribe", **secenekler):
+    """Başka yoldan (ör. canlı) elde edilen transkripti, aynı seçeneklerle yapılacak
+    transcribe / transcribe_segmented çağrısının bulacağı anahtara yazar"""
+    anahtar = cache_anahtari(audio_file, model, languages, onbellek_secenekleri(**secenekler))
+    transkript_cache.yaz(anahtar, metin.encode("utf-8"))
+
+def _prepare_segments(audio_file, preprocess, trim_silence, vad_ayarlari, max_segment_s, max_segment_bytes):
+    """Ön işlenmiş kaydı bölümlere ayırır: (bölüm yolları, ölçüm, silinecek geçici dosyalar)"""
+    yol, olcum, geciciler = _prepare_upload(audio_file, preprocess, None, trim_silence, vad_ayarlari)
+    try:
+        baslangic = time.perf_counter()
+        araliklar = vad.bolumlere_ayir(yol, max_segment_s, max_segment_bytes, vad_ayarlari)
+        if len(araliklar) == 1 and araliklar[0][0] == 0:
+            bolumler = [yol]
+        else:
+            bolumler = vad.bolumleri_yaz(yol, araliklar)
+            geciciler.extend(bolumler)
+        bolumleme_suresi = time.perf_counter() - baslangic
+        olcum["on_isleme_s"] += bolumleme_suresi
+        metrikler.kaydet("transkript.bolumleme", bolumleme_suresi)
+    except BaseException:
+        _cleanup(geciciler)
+        raise
+    olcum["bolum_sayisi"] = len(bolumler)
+    olcum["yuklenen_bayt"] = sum(os.path.getsize(yol) for yol in bolumler)
+    return bolumler, olcum, geciciler
+
+def _stitch(metinler):
+    return " ".join(metin.strip() for metin in metinler if metin and metin.strip())
+
+def transcribe_segmented(audio_file,client,languages="tr",model="gpt-4o-mini-transcribe",use_cache=True,
+                         preprocess=False,trim_silence=False,vad_ayarlari=None,
+                         max_segment_s=MAX_SEGMENT_S,max_segment_bytes=MAX_SEGMENT_BYTES,max_workers=4):
+    """Kaydı sessizlik sınırlarından bölüp bölümleri eşzamanlı olarak transkript eder.
+
+    Toplam süre en yavaş bölüme göre belirlenir; metinler kayıt sırasıyla birleştirilir."""
+
+    secenekler = onbellek_secenekleri(preprocess, None, trim_silence, vad_ayarlari, max_segment_s, max_segment_bytes)
+    anahtar, onceki = _onbellekten(audio_file, model, languages, secenekler) if use_cache else (None, None)
+    if onceki is not None:
+        return onceki
+
+    bolumler, olcum, geciciler = _prepare_segments(audio_file, preprocess, trim_silence, vad_ayarlari,
+                                                   max_segment_s, max_segment_bytes)
+
+    def bolum_transkript_et(yol):
+        with metrikler.olc("transkript.api", bayt=os.path.getsize(yol)), open(yol,'rb') as f:
+            return client.audio.transcriptions.create(model=model, file=f, language=languages).text
+
+    baslangic = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(bolumler))) as havuz:
+            metin = _stitch(havuz.map(bolum_transkript_et, bolumler))
+    finally:
+        _record(audio_file, olcum, time.perf_counter() - baslangic, geciciler)
+
+    if anahtar:
+        transkript_cache.yaz(anahtar, metin.encode("utf-8"))
+    return metin
+
+async def atranscribe_segmented(audio_file,client,languages="tr",model="gpt-4o-mini-transcribe",use_cache=True,
+                                preprocess=False,trim_silence=False,vad_ayarlari=None,
+                                max_segment_s=MAX_SEGMENT_S,max_segment_bytes=MAX_SEGMENT_BYTES,max_workers=4):
+    """transcribe_segmented'ın AsyncOpenAI istemcisiyle çalışan karşılığı"""
+
+    secenekler = onbellek_secenekleri(preprocess, None, trim_silence, vad_ayarlari, max_segment_s, max_segment_bytes)
+    anahtar, onceki = (await asyncio.to_thread(_onbellekten, audio_file, model, languages, secenekler)
+                       if use_cache else (None, None))
+    if onceki is not None:
+        return onceki
+
+    bolumler, olcum, geciciler = await asyncio.to_thread(_prepare_segments, audio_file, preprocess, trim_silence,
+                                                         vad_ayarlari, max_segment_s, max_segment_bytes)
+    semafor = asyncio.Semaphore(max_workers)
+
+    async def bolum_transkript_et(yol):
+        async with semafor:
+            with metrikler.olc("transkript.api", bayt=os.path.getsize(yol)), open(yol,'rb') as f:
+                return (await client.audio.transcriptions.create(model=model, file=f, language=languages)).text
+
+    baslangic = time.perf_counter()
+    try:
+        metin = _stitch(await asyncio.gather(*(bolum_transkript_et(yol) for yol in bolumler)))
+    finally:
+        _record(audio_file, olcum, time.perf_counter() - baslangic, geciciler)
+
+    if anahtar:
+        transkript_cache.yaz(anahtar, metin.encode("utf-8"))
+    return metin
@@ -0,0 +1,255 @@
+"""
+Enerji / sıfır geçiş oranı (ZCR) tabanlı ses etkinliği algılama (VAD).
+
+PCM verisi memmap üzerinden, örtüşmeyen çerçevelere bölünmüş NumPy görünümleri
+olarak işlenir; çerçeve başına enerji ve ZCR blok blok vektörel hesaplanır.
+Konuşma olmayan baş ve son kısımlar atılır, uzun duraklamalar kısaltılır.
+"""
+import os
+import tempfile
+import time
+import wave
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from audio_preprocess import wav_memmap
+
+# Enerji ve ZCR'nin tek seferde hesaplandığı çerçeve sayısı
+BLOK = 1 << 14
+
+
+@dataclass
+class VadAyarlari:
+    """VAD eşikleri"""
+    cerceve_ms: float = 20.0
+    esik_db: float = -45.0          # Bu seviyenin üstündeki çerçeveler konuşma sayılır (dBFS)
+    gurultu_payi_db: float = 10.0   # Uyarlamalı eşik: gürültü tabanı + bu pay
+    zcr_esik: float = 0.3           # Düşük enerjili ama yüksek ZCR'li çerçeveler (s, ş, f sesleri)
+    zcr_enerji_payi_db: float = 10.0
+    kenar_ms: float = 150.0         # Konuşmanın önüne / arkasına bırakılan pay
+    max_duraklama_ms: float = 500.0  # Daha uzun duraklamalar bu süreye kısaltılır
+
+    def anahtar(self) -> str:
+        """Önbellek anahtarlarında kullanılacak kısa gösterim"""
+        return (f"vad{self.cerceve_ms:g}/{self.esik_db:g}/{self.gurultu_payi_db:g}/"
+                f"{self.zcr_esik:g}/{self.zcr_enerji_payi_db:g}/{self.kenar_ms:g}/{self.max_duraklama_ms:g}")
+
+
+@dataclass
+class KirpmaSonucu:
+    yol: str
+    onceki_sure: float
+    sonraki_sure: float
+    bolum_sayisi: int
+    islem_s: float
+
+
+def cerceve_ozellikleri(ornekler: np.ndarray, cerceve: int, tam_olcek: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Çerçeve başına enerji (dBFS) ve ZCR (0-1) hesaplar.
+
+    ``ornekler`` (örnek, kanal) biçimindedir; çok kanallı kayıtlarda kanalların
+    ortalaması kullanılır. Son tamamlanmamış çerçeve dikkate alınmaz.
+    """
+    n = ornekler.shape[0] // cerceve
+    kanal = ornekler.shape[1]
+    enerji = np.empty(n, dtype=np.float32)
+    zcr = np.empty(n, dtype=np.float32)
+    cerceveler = ornekler[:n * cerceve].reshape(n, cerceve, kanal)
+
+    for bas in range(0, n, BLOK):
+        blok = cerceveler[bas:bas + BLOK].astype(np.float32)
+        blok = blok[:, :, 0] if kanal == 1 else blok.mean(axis=2)
+        if tam_olcek == 128.0:  # 8 bit işaretsiz
+            blok -= 128.0
+        guc = np.einsum('ij,ij->i', blok, blok) / cerceve
+        enerji[bas:bas + len(blok)] = 10 * np.log10(guc / (tam_olcek * tam_olcek) + 1e-12)
+        isaret = np.signbit(blok)
+        zcr[bas:bas + len(blok)] = np.count_nonzero(isaret[:, 1:] != isaret[:, :-1], axis=1) / (cerceve - 1)
+
+    return enerji, zcr
+
+
+def konusma_maskesi(enerji: np.ndarray, zcr: np.ndarray, ayarlar: VadAyarlari) -> np.ndarray:
+    """Çerçeve başına konuşma / sessizlik kararı"""
+    if enerji.size == 0:
+        return np.zeros(0, dtype=bool)
+
+    # Uyarlamalı eşik: sessiz çerçevelerin (alt %10) seviyesinin biraz üstü
+    gurultu_tabani = float(np.percentile(enerji, 10))
+    esik = max(ayarlar.esik_db, gurultu_tabani + ayarlar.gurultu_payi_db)
+
+    # Yüksek ZCR'li zayıf çerçeveler (sürtünmeli sessizler) de konuşmadır; ancak hışırtı /
+    # geniş bantlı gürültünün ZCR'si de yüksektir (~0.5), bu yüzden bu dalın alt sınırı
+    # gürültü tabanının belirgin biçimde üstünde tutulur
+    zcr_esigi = max(esik - ayarlar.zcr_enerji_payi_db, gurultu_tabani + ayarlar.zcr_enerji_payi_db)
+    return (enerji > esik) | ((enerji > zcr_esigi) & (zcr > ayarlar.zcr_esik))
+
+
+def _genislet(maske: np.ndarray, pay: int) -> np.ndarray:
+    """Konuşma çerçevelerini her iki yönde ``pay`` çerçeve genişletir"""
+    if pay <= 0 or not maske.any():
+        return maske
+    toplam = np.concatenate([[0], np.cumsum(maske, dtype=np.int64)])
+    n = maske.size
+    i = np.arange(n)
+    bas = np.clip(i - pay, 0, n)
+    son = np.clip(i + pay + 1, 0, n)
+    return (toplam[son] - toplam[bas]) > 0
+
+
+def bolumler(maske: np.ndarray) -> List[Tuple[int, int]]:
+    """Maskedeki ardışık True bölgelerini [başlangıç, bitiş) çerçeve aralıkları olarak döndürür"""
+    kenarlar = np.diff(np.concatenate([[0], maske.astype(np.int8), [0]]))
+    baslar = np.flatnonzero(kenarlar == 1)
+    sonlar = np.flatnonzero(kenarlar == -1)
+    return list(zip(baslar.tolist(), sonlar.tolist()))
+
+
+def tutulacak_araliklar(yol: str, ayarlar: Optional[VadAyarlari] = None) -> Tuple[List[Tuple[int, int]], int, int]:
+    """
+    Kayıtta tutulacak örnek aralıklarını hesaplar.
+
+    Baştaki ve sondaki sessizlik atılır; ``max_duraklama_ms``'den uzun
+    duraklamalardan yalnızca o kadarı bırakılır. Dönüş:
+    ([(başlangıç, bitiş) örnek aralıkları], toplam frame, sample_rate)
+    """
+    ayarlar = ayarlar or VadAyarlari()
+    ornekler, bilgi = wav_memmap(yol)
+    cerceve = max(2, int(bilgi.sample_rate * ayarlar.cerceve_ms / 1000))
+    tam_olcek = 128.0 if bilgi.ornek_genisligi == 1 else float(1 << (8 * bilgi.ornek_genisligi - 1))
+
+    enerji, zcr = cerceve_ozellikleri(ornekler, cerceve, tam_olcek)
+    maske = _genislet(konusma_maskesi(enerji, zcr, ayarlar), int(ayarlar.kenar_ms / ayarlar.cerceve_ms))
+    max_duraklama = int(ayarlar.max_duraklama_ms / ayarlar.cerceve_ms)
+
+    araliklar: List[Tuple[int, int]] = []
+    for bas, son in bolumler(maske):
+        if araliklar and bas - araliklar[-1][1] <= max_duraklama:
+            # Kısa duraklama olduğu gibi korunur
+            araliklar[-1] = (araliklar[-1][0], son)
+            continue
+        if araliklar:
+            # Uzun duraklamanın yalnızca başı bırakılır
+            onceki_bas, onceki_son = araliklar[-1]
+            araliklar[-1] = (onceki_bas, onceki_son + max_duraklama)
+        araliklar.append((bas, son))
+
+    toplam = ornekler.shape[0]
+    return [(bas * cerceve, min(son * cerceve, toplam)) for bas, son in araliklar], toplam, bilgi.sample_rate
+
+
+def sessizligi_kirp(yol: str,
+                    ayarlar: Optional[VadAyarlari] = None,
+                    cikis_klasoru: Optional[str] = None) -> KirpmaSonucu:
+    """
+    Sessizliği kırpılmış kaydı geçici bir WAV dosyasına yazar.
+
+    Hiç konuşma bulunamazsa kayıt olduğu gibi kopyalanır (transkripsiyon
+    servisinin boş dosya yüzünden hata vermemesi için). Çıktı dosyasını
+    silmek çağıranın sorumluluğundadır.
+    """
+    baslangic = time.perf_counter()
+    araliklar, toplam, sample_rate = tutulacak_araliklar(yol, ayarlar)
+    ornekler, bilgi = wav_memmap(yol)
+    if not araliklar:
+        araliklar = [(0, toplam)]
+
+    fd, cikis = tempfile.mkstemp(suffix=".wav", prefix="vad_", dir=cikis_klasoru)
+    os.close(fd)
+    try:
+        with wave.open(cikis, 'wb') as wf:
+            wf.setnchannels(bilgi.channels)
+            wf.setsampwidth(bilgi.ornek_genisligi)
+            wf.setframerate(sample_rate)
+            for bas, son in araliklar:
+                wf.writeframesraw(np.ascontiguousarray(ornekler[bas:son]).tobytes())
+    except BaseException:
+        os.remove(cikis)
+        raise
+
+    return KirpmaSonucu(
+        yol=cikis,
+        onceki_sure=toplam / sample_rate,
+        sonraki_sure=sum(son - bas for bas, son in araliklar) / sample_rate,
+        bolum_sayisi=len(araliklar),
+        islem_s=time.perf_counter() - baslangic
+    )
+
+
+def bolumlere_ayir(yol: str,
+                   max_sure: float,
+                   max_bayt: Optional[int] = None,
+                   ayarlar: Optional[VadAyarlari] = None,
+                   min_sessizlik_ms: float = 200.0) -> List[Tuple[int, int]]:
+    """
+    Kaydı sessizlik sınırlarından, her biri süre / boyut sınırının altında
+    kalan [başlangıç, bitiş) örnek aralıklarına böler.
+
+    Her bölüm, sınıra sığan en son sessizliğin ortasından kesilir; sınır
+    içinde yeterince uzun sessizlik yoksa tam sınırdan kesilir. Hiç konuşma
+    içermeyen bölümler atlanır.
+    """
+    ayarlar = ayarlar or VadAyarlari()
+    ornekler, bilgi = wav_memmap(yol)
+    toplam = ornekler.shape[0]
+    cerceve = max(2, int(bilgi.sample_rate * ayarlar.cerceve_ms / 1000))
+
+    max_ornek = int(max_sure * bilgi.sample_rate)
+    if max_bayt is not None:
+        # 44 baytlık WAV başlığı için pay bırakılır
+        max_ornek = min(max_ornek, (max_bayt - 44) // (bilgi.channels * bilgi.ornek_genisligi))
+    max_cerceve = max(1, max_ornek // cerceve)
+
+    if toplam <= max_ornek:
+        return [(0, toplam)]
+
+    tam_olcek = 128.0 if bilgi.ornek_genisligi == 1 else float(1 << (8 * bilgi.ornek_genisligi - 1))
+    enerji, zcr = cerceve_ozellikleri(ornekler, cerceve, tam_olcek)
+    sessizlik = ~konusma_maskesi(enerji, zcr, ayarlar)
+
+    # Aday kesim noktaları: yeterince uzun sessizliklerin ortası (çerçeve)
+    min_sessizlik = max(1, int(min_sessizlik_ms / ayarlar.cerceve_ms))
+    adaylar = np.array([(bas + son) // 2 for bas, son in bolumler(sessizlik) if son - bas >= min_sessizlik],
+                       dtype=np.int64)
+
+    toplam_cerceve = -(-toplam // cerceve)
+    kesimler = []
+    bas = 0
+    while toplam_cerceve - bas > max_cerceve:
+        sinir = bas + max_cerceve
+        i = np.searchsorted(adaylar, sinir, side='right') - 1
+        kesim = int(adaylar[i]) if i >= 0 and adaylar[i] > bas else sinir
+        kesimler.append(kesim)
+        bas = kesim
+
+    # Tamamen sessiz bölümler gönderilmez (boşuna istek ve uydurma metin riski)
+    sinirlar = [0] + kesimler + [toplam_cerceve]
+    araliklar = [(sinirlar[i] * cerceve, min(sinirlar[i + 1] * cerceve, toplam))
+                 for i in range(len(sinirlar) - 1)
+                 if not sessizlik[sinirlar[i]:sinirlar[i + 1]].all()]
+    return araliklar or [(0, toplam)]
+
+
+def bolumleri_yaz(yol: str, araliklar: List[Tuple[int, int]],
+                  cikis_klasoru: Optional[str] = None) -> List[str]:
+    """Her aralığı ayrı geçici WAV dosyasına yazar (silmek çağıranın sorumluluğundadır)"""
+    ornekler, bilgi = wav_memmap(yol)
+    yollar = []
+    try:
+        for bas, son in araliklar:
+            fd, cikis = tempfile.mkstemp(suffix=".wav", prefix="bolum_", dir=cikis_klasoru)
+            os.close(fd)
+            yollar.append(cikis)
+            with wave.open(cikis, 'wb') as wf:
+                wf.setnchannels(bilgi.channels)
+                wf.setsampwidth(bilgi.ornek_genisligi)
+                wf.setframerate(bilgi.sample_rate)
+                wf.writeframes(np.ascontiguousarray(ornekler[bas:son]).tobytes())
+    except BaseException:
+        for cikis in yollar:
+            os.remove(cikis)
+        raise
+    return yollar